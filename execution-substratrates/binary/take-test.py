@@ -29,7 +29,7 @@ from enum import Enum, auto
 # Add project root to path for shared imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from orchestration.shared import load_rulebook
+from orchestration.shared import load_rulebook, load_json_file
 
 
 # =============================================================================
@@ -355,8 +355,7 @@ def main():
         print(f"ERROR: Test file not found: {test_file}")
         sys.exit(1)
 
-    with open(test_file, "r") as f:
-        data = json.load(f)
+    data = load_json_file(test_file)
     print(f"Loaded {len(data)} records")
 
     # Verify calculated field functions exist
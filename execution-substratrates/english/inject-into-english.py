@@ -657,6 +657,11 @@ Environment Variables:
         action="store_true",
         help="Force regeneration of all LLM content without prompting"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Accepted from substrate-orchestrator.py --force; use --regenerate to rebuild LLM content"
+    )
     parser.add_argument(
         "--no-prompt",
         action="store_true",
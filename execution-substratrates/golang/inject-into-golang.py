@@ -23,7 +23,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from orchestration.shared import load_rulebook, get_candidate_name_from_cwd, handle_clean_arg
 from orchestration.formula_parser import (
-    parse_formula, compile_to_go, get_field_dependencies,
+    parse_formula, compile_go_str, get_field_dependencies,
     to_snake_case, to_pascal_case, ASTNode
 )
 
@@ -146,8 +146,7 @@ def compile_formula_to_go(field: Dict, struct_var: str = 'tc', calc_vars: Dict[s
     """
     formula = field.get('formula', '')
     try:
-        ast = parse_formula(formula)
-        go_expr = compile_to_go(ast, struct_var)
+        go_expr = compile_go_str(formula, struct_var)
 
         # Substitute references to already-computed calculated fields
         # with their local variable names. Order matters - more specific patterns first.
@@ -19,7 +19,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from orchestration.shared import load_rulebook, get_candidate_name_from_cwd, handle_clean_arg
 from orchestration.formula_parser import (
-    parse_formula, compile_to_javascript, get_field_dependencies,
+    parse_formula, compile_javascript_str, get_field_dependencies,
     to_snake_case, ASTNode
 )
 
@@ -180,8 +180,7 @@ def generate_js_function(field):
     func_name = 'calc' + name
 
     try:
-        ast = parse_formula(formula)
-        js_expr = compile_to_javascript(ast, 'candidate')
+        js_expr = compile_javascript_str(formula, 'candidate')
     except Exception as e:
         return f'''/**
  * ERROR: Could not parse formula: {formula}
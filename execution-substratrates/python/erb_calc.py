@@ -16,7 +16,7 @@ from typing import Optional, Any
 
 def calc_family_fued_question(name):
     """Formula: ="Is " & {{Name}} & " a language?" """
-    return ('Is ' + str(name or "") + ' a language?')
+    return ''.join(['Is ', str(name or ""), ' a language?'])
 
 def calc_has_grammar(has_syntax):
     """Formula: ={{HasSyntax}} = TRUE()"""
@@ -61,7 +61,7 @@ def calc_family_feud_mismatch(top_family_feud_answer, chosen_language_candidate,
     """Formula: =IF(NOT({{TopFamilyFeudAnswer}} = {{ChosenLanguageCandidate}}),
   {{Name}} & " " & IF({{TopFamilyFeudAnswer}}, "Is", "Isn't") & " a Family Feud Language, but " & 
   IF({{ChosenLanguageCandidate}}, "Is", "Is Not") & " marked as a 'Language Candidate.'") & IF({{IsOpenClosedWorldConflicted}}, " - Open World vs. Closed World Conflict.")"""
-    return (str(((str(name or "") + ' ' + str(('Is' if top_family_feud_answer else "Isn't") if ('Is' if top_family_feud_answer else "Isn't") is not None else "") + ' a Family Feud Language, but ' + str(('Is' if chosen_language_candidate else 'Is Not') if ('Is' if chosen_language_candidate else 'Is Not') is not None else "") + " marked as a 'Language Candidate.'") if (not (top_family_feud_answer == chosen_language_candidate)) else None) if ((str(name or "") + ' ' + str(('Is' if top_family_feud_answer else "Isn't") if ('Is' if top_family_feud_answer else "Isn't") is not None else "") + ' a Family Feud Language, but ' + str(('Is' if chosen_language_candidate else 'Is Not') if ('Is' if chosen_language_candidate else 'Is Not') is not None else "") + " marked as a 'Language Candidate.'") if (not (top_family_feud_answer == chosen_language_candidate)) else None) is not None else "") + str((' - Open World vs. Closed World Conflict.' if is_open_closed_world_conflicted else None) if (' - Open World vs. Closed World Conflict.' if is_open_closed_world_conflicted else None) is not None else ""))
+    return (str((''.join([str(name or ""), ' ', str(('Is' if top_family_feud_answer else "Isn't") if ('Is' if top_family_feud_answer else "Isn't") is not None else ""), ' a Family Feud Language, but ', str(('Is' if chosen_language_candidate else 'Is Not') if ('Is' if chosen_language_candidate else 'Is Not') is not None else ""), " marked as a 'Language Candidate.'"]) if (not (top_family_feud_answer == chosen_language_candidate)) else None) if (''.join([str(name or ""), ' ', str(('Is' if top_family_feud_answer else "Isn't") if ('Is' if top_family_feud_answer else "Isn't") is not None else ""), ' a Family Feud Language, but ', str(('Is' if chosen_language_candidate else 'Is Not') if ('Is' if chosen_language_candidate else 'Is Not') is not None else ""), " marked as a 'Language Candidate.'"]) if (not (top_family_feud_answer == chosen_language_candidate)) else None) is not None else "") + str((' - Open World vs. Closed World Conflict.' if is_open_closed_world_conflicted else None) if (' - Open World vs. Closed World Conflict.' if is_open_closed_world_conflicted else None) is not None else ""))
 
 
 # =============================================================================
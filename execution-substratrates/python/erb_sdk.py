@@ -11,8 +11,34 @@ DAG Execution Order:
   Level 3: family_feud_mismatch (depends on is_a_family_feud_top_answer)
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import Any, Optional
+
+# Try to import msgspec for typed rulebook decoding (optional)
+try:
+    import msgspec
+    from msgspec.structs import astuple
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# Try to import orjson for faster rulebook parsing (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def format_family_feud_mismatch(name: Optional[str], is_top_answer: bool, chosen: bool) -> str:
+    """The family_feud_mismatch message for a candidate whose flags disagree."""
+    is_word = "Is" if is_top_answer else "Isn't"
+    marked_word = "Is" if chosen else "Is Not"
+    return (
+        f"{name or ''} {is_word} a Family Feud Language, but "
+        f"{marked_word} marked as a 'Language Candidate.'"
+    )
 
 
 @dataclass
@@ -37,12 +63,31 @@ class LanguageCandidate:
 
     # =========================================================================
     # CALCULATED FIELDS - Mirrors PostgreSQL functions exactly
+    # Each is computed once per instance and cached, so a level's dependent
+    # calculations are not redone by the levels above it.
     # =========================================================================
 
+    _CALCULATED_FIELDS = (
+        "category_contains_language",
+        "has_grammar",
+        "relationship_to_concept",
+        "family_fued_question",
+        "is_a_family_feud_top_answer",
+        "family_feud_mismatch",
+    )
+
+    def __setattr__(self, name, value):
+        """Assign a raw field, dropping cached calculations so they follow it."""
+        super().__setattr__(name, value)
+        cache = self.__dict__
+        for calc_name in self._CALCULATED_FIELDS:
+            cache.pop(calc_name, None)
+
     # Level 1: Simple calculations on raw fields only
     # ------------------------------------------------
 
-    def calc_category_contains_language(self) -> bool:
+    @cached_property
+    def category_contains_language(self) -> bool:
         """
         Mirrors: calc_language_candidates_category_contains_language()
         Formula: FIND("language", LOWER(category)) > 0
@@ -51,7 +96,8 @@ class LanguageCandidate:
             return False
         return "language" in self.category.lower()
 
-    def calc_has_grammar(self) -> str:
+    @cached_property
+    def has_grammar(self) -> str:
         """
         Mirrors: calc_language_candidates_has_grammar()
         Formula: CAST(has_syntax AS TEXT)
@@ -60,7 +106,8 @@ class LanguageCandidate:
             return ""
         return "true" if self.has_syntax else ""
 
-    def calc_relationship_to_concept(self) -> str:
+    @cached_property
+    def relationship_to_concept(self) -> str:
         """
         Mirrors: calc_language_candidates_relationship_to_concept()
         Formula: IF(distance_from_concept = 1, "IsMirrorOf", "IsDescriptionOf")
@@ -69,7 +116,8 @@ class LanguageCandidate:
             return "IsMirrorOf"
         return "IsDescriptionOf"
 
-    def calc_family_fued_question(self) -> str:
+    @cached_property
+    def family_fued_question(self) -> str:
         """
         Mirrors: calc_language_candidates_family_fued_question()
         Formula: "Is " & name & " a language?"
@@ -80,7 +128,8 @@ class LanguageCandidate:
     # Level 2: Depends on Level 1 calculations
     # ----------------------------------------
 
-    def calc_is_a_family_feud_top_answer(self) -> bool:
+    @cached_property
+    def is_a_family_feud_top_answer(self) -> bool:
         """
         Mirrors: calc_language_candidates_is_a_family_feud_top_answer()
         Formula: AND(
@@ -94,12 +143,9 @@ class LanguageCandidate:
             distance_from_concept = 2
         )
         """
-        # Depends on Level 1 calc
-        category_contains_language = self.calc_category_contains_language()
-
-        # All conditions must be true
+        # All conditions must be true (Level 1 calc is cached)
         return (
-            category_contains_language
+            self.category_contains_language
             and (self.has_syntax or False)
             and not (self.can_be_held or False)
             and (self.meaning_is_serialized or False)
@@ -112,7 +158,8 @@ class LanguageCandidate:
     # Level 3: Depends on Level 2 calculations
     # ----------------------------------------
 
-    def calc_family_feud_mismatch(self) -> Optional[str]:
+    @cached_property
+    def family_feud_mismatch(self) -> Optional[str]:
         """
         Mirrors: calc_language_candidates_family_feud_mismatch()
         Formula: IF(is_a_family_feud_top_answer != chosen_language_candidate,
@@ -123,17 +170,12 @@ class LanguageCandidate:
             NULL
         )
         """
-        # Depends on Level 2 calc
-        is_top_answer = self.calc_is_a_family_feud_top_answer()
+        # Depends on Level 2 calc (cached)
+        is_top_answer = self.is_a_family_feud_top_answer
         chosen = self.chosen_language_candidate or False
 
         if is_top_answer != chosen:
-            is_word = "Is" if is_top_answer else "Isn't"
-            marked_word = "Is" if chosen else "Is Not"
-            return (
-                f"{self.name or ''} {is_word} a Family Feud Language, but "
-                f"{marked_word} marked as a 'Language Candidate.'"
-            )
+            return format_family_feud_mismatch(self.name, is_top_answer, chosen)
         return None
 
     # =========================================================================
@@ -158,12 +200,12 @@ class LanguageCandidate:
             "has_identity": self.has_identity,
             "distance_from_concept": self.distance_from_concept,
             # Calculated Fields (DAG order)
-            "category_contains_language": self.calc_category_contains_language(),
-            "has_grammar": self.calc_has_grammar(),
-            "relationship_to_concept": self.calc_relationship_to_concept(),
-            "family_fued_question": self.calc_family_fued_question(),
-            "is_a_family_feud_top_answer": self.calc_is_a_family_feud_top_answer(),
-            "family_feud_mismatch": self.calc_family_feud_mismatch(),
+            "category_contains_language": self.category_contains_language,
+            "has_grammar": self.has_grammar,
+            "relationship_to_concept": self.relationship_to_concept,
+            "family_fued_question": self.family_fued_question,
+            "is_a_family_feud_top_answer": self.is_a_family_feud_top_answer,
+            "family_feud_mismatch": self.family_feud_mismatch,
         }
 
 
@@ -225,16 +267,173 @@ def is_language(candidate: LanguageCandidate) -> bool:
     )
 
 
+# =============================================================================
+# BATCH EVALUATION - One list per field (struct of arrays)
+# =============================================================================
+
+def from_records(records: list[dict]) -> dict[str, list]:
+    """Transpose snake_case records (e.g. test-answers.json) into one list per field."""
+    names = [f.name for f in fields(LanguageCandidate)]
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def calc_is_a_family_feud_top_answer_batch(
+    category: list,
+    has_syntax: list,
+    can_be_held: list,
+    meaning_is_serialized: list,
+    requires_parsing: list,
+    is_ongology_descriptor: list,
+    has_identity: list,
+    distance_from_concept: list,
+) -> list[bool]:
+    """
+    Column-wise LanguageCandidate.is_a_family_feud_top_answer.
+
+    Takes one list per field (see from_records) and evaluates the whole
+    AND chain in a single pass over the zipped columns, without building a
+    LanguageCandidate per record.
+    """
+    return [
+        (cat is not None and "language" in cat.lower())
+        and bool(syntax)
+        and not held
+        and bool(serialized)
+        and bool(parsing)
+        and bool(descriptor)
+        and not identity
+        and distance == 2
+        for cat, syntax, held, serialized, parsing, descriptor, identity, distance in zip(
+            category, has_syntax, can_be_held, meaning_is_serialized,
+            requires_parsing, is_ongology_descriptor, has_identity, distance_from_concept,
+        )
+    ]
+
+
+@dataclass
+class CandidateTable:
+    """
+    LanguageCandidates stored column-wise: one list per raw field, where the
+    i-th entry of every list belongs to the i-th candidate.
+
+    Build one with load_table_from_rulebook, from_candidates, or
+    CandidateTable(**from_records(records)).
+    """
+
+    language_candidate_id: list[str]
+    name: list[Optional[str]]
+    category: list[Optional[str]]
+    can_be_held: list[Optional[bool]]
+    meaning_is_serialized: list[Optional[bool]]
+    requires_parsing: list[Optional[bool]]
+    is_ongology_descriptor: list[Optional[bool]]
+    has_syntax: list[Optional[bool]]
+    chosen_language_candidate: list[Optional[bool]]
+    sort_order: list[Optional[int]]
+    has_identity: list[Optional[bool]]
+    distance_from_concept: list[Optional[int]]
+
+    def __len__(self) -> int:
+        return len(self.language_candidate_id)
+
+    @classmethod
+    def from_candidates(cls, candidates: list[LanguageCandidate]) -> "CandidateTable":
+        """Transpose LanguageCandidate objects into columns."""
+        return cls(**{
+            f.name: [getattr(candidate, f.name) for candidate in candidates]
+            for f in fields(cls)
+        })
+
+    def is_language(self) -> list[bool]:
+        """Column-wise is_language() for every candidate."""
+        return [
+            (syntax or False)
+            and (parsing or False)
+            and (serialized or False)
+            and (descriptor or False)
+            for syntax, parsing, serialized, descriptor in zip(
+                self.has_syntax, self.requires_parsing,
+                self.meaning_is_serialized, self.is_ongology_descriptor,
+            )
+        ]
+
+    def is_a_family_feud_top_answer(self) -> list[bool]:
+        """Column-wise LanguageCandidate.is_a_family_feud_top_answer for every candidate."""
+        return calc_is_a_family_feud_top_answer_batch(
+            self.category, self.has_syntax, self.can_be_held,
+            self.meaning_is_serialized, self.requires_parsing,
+            self.is_ongology_descriptor, self.has_identity, self.distance_from_concept,
+        )
+
+
 # =============================================================================
 # LOADER - Load from JSON rulebook
 # =============================================================================
 
+# Rulebook JSON field behind each raw LanguageCandidate field
+_CANDIDATE_SOURCE_FIELDS = {
+    "name": "Name",
+    "category": "Category",
+    "can_be_held": "CanBeHeld",
+    "meaning_is_serialized": "Meaning_Is_Serialized",
+    "requires_parsing": "RequiresParsing",
+    "is_ongology_descriptor": "IsOngologyDescriptor",
+    "has_syntax": "HasSyntax",
+    "chosen_language_candidate": "ChosenLanguageCandidate",
+    "sort_order": "SortOrder",
+    "has_identity": "HasIdentity",
+    "distance_from_concept": "DistanceFromConcept",
+}
+
+
+if MSGSPEC_AVAILABLE:
+    # Row structs decoded straight from the rulebook JSON, with fields in
+    # LanguageCandidate / IsEverythingALanguage order so they convert
+    # positionally. Values stay untyped (Any), as with the dict loader.
+    _CandidateRow = msgspec.defstruct(
+        "_CandidateRow",
+        [(f.name, Any, "" if f.name == "language_candidate_id" else None) for f in fields(LanguageCandidate)],
+        rename={"language_candidate_id": "LanguageCandidateId", **_CANDIDATE_SOURCE_FIELDS},
+    )
+    _ArgumentRow = msgspec.defstruct(
+        "_ArgumentRow",
+        [(f.name, Any, "" if f.name == "is_everything_a_language_id" else None) for f in fields(IsEverythingALanguage)],
+        rename="pascal",
+    )
+
+    class _CandidateSection(msgspec.Struct):
+        data: list[_CandidateRow] = msgspec.field(default_factory=list)
+
+    class _ArgumentSection(msgspec.Struct):
+        data: list[_ArgumentRow] = msgspec.field(default_factory=list)
+
+    class _RulebookRows(msgspec.Struct):
+        LanguageCandidates: _CandidateSection = msgspec.field(default_factory=_CandidateSection)
+        IsEverythingALanguage: _ArgumentSection = msgspec.field(default_factory=_ArgumentSection)
+
+    _RULEBOOK_DECODER = msgspec.json.Decoder(_RulebookRows)
+
+
+def read_rulebook(rulebook_path: str) -> dict:
+    """Parse the rulebook JSON, with orjson when it is installed."""
+    with open(rulebook_path, 'rb') as f:
+        raw = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
+
+
 def load_from_rulebook(rulebook_path: str) -> tuple[list[LanguageCandidate], list[IsEverythingALanguage]]:
     """Load entities from the effortless-rulebook.json file."""
-    import json
+    if MSGSPEC_AVAILABLE:
+        with open(rulebook_path, 'rb') as f:
+            rows = _RULEBOOK_DECODER.decode(f.read())
+        candidates = [LanguageCandidate(*astuple(row)) for row in rows.LanguageCandidates.data]
+        arguments = [IsEverythingALanguage(*astuple(row)) for row in rows.IsEverythingALanguage.data]
+        return candidates, arguments
 
-    with open(rulebook_path, 'r') as f:
-        data = json.load(f)
+    data = read_rulebook(rulebook_path)
 
     candidates = []
     for item in data.get("LanguageCandidates", {}).get("data", []):
@@ -272,6 +471,21 @@ def load_from_rulebook(rulebook_path: str) -> tuple[list[LanguageCandidate], lis
     return candidates, arguments
 
 
+def load_table_from_rulebook(rulebook_path: str) -> CandidateTable:
+    """Load the LanguageCandidates straight into columns, without per-candidate objects."""
+    data = read_rulebook(rulebook_path)
+
+    items = data.get("LanguageCandidates", {}).get("data", [])
+    columns = {
+        name: [item.get(source) for item in items]
+        for name, source in _CANDIDATE_SOURCE_FIELDS.items()
+    }
+    return CandidateTable(
+        language_candidate_id=[item.get("LanguageCandidateId", "") for item in items],
+        **columns,
+    )
+
+
 if __name__ == "__main__":
     # Example usage
     import os
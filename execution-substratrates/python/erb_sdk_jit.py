@@ -0,0 +1,122 @@
+"""
+ERB SDK - Compiled batch scoring
+================================
+Level 2 and Level 3 of the LanguageCandidate DAG (is_a_family_feud_top_answer
+and the family_feud_mismatch condition) for many candidates at once, as one
+kernel over per-field arrays.
+
+The kernel is JIT-compiled with numba when it is installed and runs as plain
+Python otherwise. Strings stay outside the kernel: category_contains_language
+is computed beforehand and mismatch messages are formatted afterwards, only
+for the candidates that need one.
+"""
+
+from typing import Optional
+
+from erb_sdk import CandidateTable, LanguageCandidate, format_family_feud_mismatch
+
+# Try to import numba for JIT compilation (optional)
+try:
+    import numpy as np
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit: leaves the function as plain Python."""
+        return lambda func: func
+
+
+@njit(parallel=True, cache=True)
+def compute_top_answer_and_mismatch(
+    has_syntax,
+    can_be_held,
+    meaning_is_serialized,
+    requires_parsing,
+    is_ongology_descriptor,
+    has_identity,
+    distance_from_concept,
+    category_contains_language,
+    chosen,
+    top_answer_out,
+    mismatch_out,
+):
+    """
+    Mirrors LanguageCandidate.is_a_family_feud_top_answer and the
+    family_feud_mismatch condition, one record per index.
+
+    Boolean inputs must have None already mapped to False, and a missing
+    distance_from_concept to any value other than 2. Results are written to
+    top_answer_out and mismatch_out.
+    """
+    for i in prange(len(has_syntax)):
+        top_answer = (
+            category_contains_language[i]
+            and has_syntax[i]
+            and not can_be_held[i]
+            and meaning_is_serialized[i]
+            and requires_parsing[i]
+            and is_ongology_descriptor[i]
+            and not has_identity[i]
+            and distance_from_concept[i] == 2
+        )
+        top_answer_out[i] = top_answer
+        mismatch_out[i] = top_answer != chosen[i]
+
+
+def _flags(values):
+    """Kernel input for a boolean field (None -> False)."""
+    flags = [bool(value) for value in values]
+    return np.array(flags, dtype=np.bool_) if NUMBA_AVAILABLE else flags
+
+
+def _new_flags(count):
+    """Kernel output buffer for a boolean result."""
+    return np.zeros(count, dtype=np.bool_) if NUMBA_AVAILABLE else [False] * count
+
+
+def score_table(table: CandidateTable) -> tuple[list[bool], list[Optional[str]]]:
+    """
+    Batch is_a_family_feud_top_answer and family_feud_mismatch over a
+    column-wise CandidateTable.
+
+    Returns one top-answer flag and one mismatch message (or None) per
+    candidate, matching the per-instance LanguageCandidate properties.
+    """
+    count = len(table)
+    distances = [
+        float(distance) if isinstance(distance, (int, float)) else -1.0
+        for distance in table.distance_from_concept
+    ]
+    top_answer = _new_flags(count)
+    mismatch = _new_flags(count)
+
+    compute_top_answer_and_mismatch(
+        _flags(table.has_syntax),
+        _flags(table.can_be_held),
+        _flags(table.meaning_is_serialized),
+        _flags(table.requires_parsing),
+        _flags(table.is_ongology_descriptor),
+        _flags(table.has_identity),
+        np.array(distances, dtype=np.float64) if NUMBA_AVAILABLE else distances,
+        _flags(category is not None and "language" in category.lower() for category in table.category),
+        _flags(table.chosen_language_candidate),
+        top_answer,
+        mismatch,
+    )
+
+    top_answers = [bool(flag) for flag in top_answer]
+    messages = [
+        format_family_feud_mismatch(name, top, chosen or False) if is_mismatch else None
+        for name, chosen, top, is_mismatch in zip(
+            table.name, table.chosen_language_candidate, top_answers, mismatch,
+        )
+    ]
+    return top_answers, messages
+
+
+def score_candidates(candidates: list[LanguageCandidate]) -> tuple[list[bool], list[Optional[str]]]:
+    """Batch scoring for LanguageCandidate objects (see score_table)."""
+    return score_table(CandidateTable.from_candidates(candidates))
@@ -17,7 +17,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from orchestration.shared import load_rulebook, get_candidate_name_from_cwd, handle_clean_arg
 from orchestration.formula_parser import (
-    parse_formula, compile_to_python, get_field_dependencies,
+    parse_formula, compile_python_str, get_field_dependencies,
     to_snake_case, ASTNode, FieldRef, FuncCall, Concat, LiteralString
 )
 
@@ -110,7 +110,7 @@ def generate_calc_function(field: Dict) -> str:
     try:
         ast = parse_formula(formula)
         deps = get_field_dependencies(ast)
-        python_expr = compile_to_python(ast)
+        python_expr = compile_python_str(formula)
     except Exception as e:
         return f'''
 def calc_{to_snake_case(name)}():
@@ -16,9 +16,11 @@ This script is 100% domain-agnostic - all field names come from the rulebook.
 import sys
 import re
 import json
+from array import array
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, TextIO, Tuple, Union
 from enum import Enum, auto
 
 # Add project root to path for shared imports
@@ -90,6 +92,8 @@ class TokenType(Enum):
     NUMBER = auto()
     FIELD_REF = auto()
     FUNC_NAME = auto()
+    TRUE = auto()
+    FALSE = auto()
     LPAREN = auto()
     RPAREN = auto()
     COMMA = auto()
@@ -103,16 +107,63 @@ class TokenType(Enum):
     EOF = auto()
 
 
-@dataclass
-class Token:
-    type: TokenType
-    value: Any
-    pos: int
-
-
-def tokenize(formula: str) -> List[Token]:
-    """Tokenize an Excel-dialect formula."""
-    tokens = []
+# Integer token-type codes used in the token stream so the parser's hot
+# comparisons are plain int compares rather than Enum __eq__ calls.
+TOK_STRING = TokenType.STRING.value
+TOK_NUMBER = TokenType.NUMBER.value
+TOK_FIELD_REF = TokenType.FIELD_REF.value
+TOK_FUNC_NAME = TokenType.FUNC_NAME.value
+TOK_TRUE = TokenType.TRUE.value
+TOK_FALSE = TokenType.FALSE.value
+TOK_LPAREN = TokenType.LPAREN.value
+TOK_RPAREN = TokenType.RPAREN.value
+TOK_COMMA = TokenType.COMMA.value
+TOK_AMPERSAND = TokenType.AMPERSAND.value
+TOK_EQUALS = TokenType.EQUALS.value
+TOK_NOT_EQUALS = TokenType.NOT_EQUALS.value
+TOK_LT = TokenType.LT.value
+TOK_LE = TokenType.LE.value
+TOK_GT = TokenType.GT.value
+TOK_GE = TokenType.GE.value
+TOK_EOF = TokenType.EOF.value
+
+_COMPARISON_OPS = {
+    TOK_EQUALS: '=',
+    TOK_NOT_EQUALS: '<>',
+    TOK_LT: '<',
+    TOK_LE: '<=',
+    TOK_GT: '>',
+    TOK_GE: '>=',
+}
+
+
+# Identifiers classified as keywords at lex time instead of in the parser
+_FORMULA_KEYWORDS = {
+    'TRUE': TOK_TRUE,
+    'FALSE': TOK_FALSE,
+}
+
+# Field reference {{Name}}; lazy match so the name ends at the first '}}'
+_FIELD_REF_RE = re.compile(r'\{\{(.*?)\}\}', re.DOTALL)
+
+
+TokenStream = Tuple[array, List[Any], array]
+
+
+def tokenize(formula: str) -> TokenStream:
+    """Tokenize an Excel-dialect formula.
+
+    Returns the token stream as parallel (types, values, positions) arrays
+    rather than one object per token.
+    """
+    types = array('b')
+    values = []
+    positions = array('i')
+
+    def emit(tok_type: int, value: Any, pos: int) -> None:
+        types.append(tok_type)
+        values.append(value)
+        positions.append(pos)
 
     # Remove leading = if present
     if formula.startswith('='):
@@ -138,18 +189,17 @@ def tokenize(formula: str) -> List[Token]:
             if j >= len(formula):
                 raise SyntaxError(f"Unterminated string at position {i}")
             value = formula[i+1:j]
-            tokens.append(Token(TokenType.STRING, value, i))
+            emit(TOK_STRING, value, i)
             i = j + 1
             continue
 
         # Field reference {{Name}}
         if formula[i:i+2] == '{{':
-            j = formula.find('}}', i)
-            if j == -1:
+            m = _FIELD_REF_RE.match(formula, i)
+            if m is None:
                 raise SyntaxError(f"Unterminated field reference at position {i}")
-            field_name = formula[i+2:j]
-            tokens.append(Token(TokenType.FIELD_REF, field_name, i))
-            i = j + 2
+            emit(TOK_FIELD_REF, m.group(1), i)
+            i = m.end()
             continue
 
         # Number
@@ -160,49 +210,49 @@ def tokenize(formula: str) -> List[Token]:
             while j < len(formula) and formula[j].isdigit():
                 j += 1
             value = int(formula[i:j])
-            tokens.append(Token(TokenType.NUMBER, value, i))
+            emit(TOK_NUMBER, value, i)
             i = j
             continue
 
         # Operators
         if formula[i:i+2] == '<>':
-            tokens.append(Token(TokenType.NOT_EQUALS, '<>', i))
+            emit(TOK_NOT_EQUALS, '<>', i)
             i += 2
             continue
         if formula[i:i+2] == '<=':
-            tokens.append(Token(TokenType.LE, '<=', i))
+            emit(TOK_LE, '<=', i)
             i += 2
             continue
         if formula[i:i+2] == '>=':
-            tokens.append(Token(TokenType.GE, '>=', i))
+            emit(TOK_GE, '>=', i)
             i += 2
             continue
         if c == '<':
-            tokens.append(Token(TokenType.LT, '<', i))
+            emit(TOK_LT, '<', i)
             i += 1
             continue
         if c == '>':
-            tokens.append(Token(TokenType.GT, '>', i))
+            emit(TOK_GT, '>', i)
             i += 1
             continue
         if c == '=':
-            tokens.append(Token(TokenType.EQUALS, '=', i))
+            emit(TOK_EQUALS, '=', i)
             i += 1
             continue
         if c == '&':
-            tokens.append(Token(TokenType.AMPERSAND, '&', i))
+            emit(TOK_AMPERSAND, '&', i)
             i += 1
             continue
         if c == '(':
-            tokens.append(Token(TokenType.LPAREN, '(', i))
+            emit(TOK_LPAREN, '(', i)
             i += 1
             continue
         if c == ')':
-            tokens.append(Token(TokenType.RPAREN, ')', i))
+            emit(TOK_RPAREN, ')', i)
             i += 1
             continue
         if c == ',':
-            tokens.append(Token(TokenType.COMMA, ',', i))
+            emit(TOK_COMMA, ',', i)
             i += 1
             continue
 
@@ -212,14 +262,14 @@ def tokenize(formula: str) -> List[Token]:
             while j < len(formula) and (formula[j].isalnum() or formula[j] == '_'):
                 j += 1
             name = formula[i:j].upper()
-            tokens.append(Token(TokenType.FUNC_NAME, name, i))
+            emit(_FORMULA_KEYWORDS.get(name, TOK_FUNC_NAME), name, i)
             i = j
             continue
 
         raise SyntaxError(f"Unexpected character '{c}' at position {i}")
 
-    tokens.append(Token(TokenType.EOF, None, len(formula)))
-    return tokens
+    emit(TOK_EOF, None, len(formula))
+    return types, values, positions
 
 
 # =============================================================================
@@ -229,31 +279,40 @@ def tokenize(formula: str) -> List[Token]:
 class Parser:
     """Recursive descent parser for Excel-dialect formulas."""
 
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: TokenStream):
+        self.types, self.values, self.positions = tokens
         self.pos = 0
 
-    def current(self) -> Token:
-        return self.tokens[self.pos]
+    def current(self) -> int:
+        """Return the type code of the current token."""
+        return self.types[self.pos]
 
-    def consume(self, expected: TokenType = None) -> Token:
-        tok = self.current()
-        if expected and tok.type != expected:
-            raise SyntaxError(f"Expected {expected}, got {tok.type} at position {tok.pos}")
+    def consume(self, expected: int = None) -> Any:
+        """Advance past the current token and return its value."""
+        tok_type = self.types[self.pos]
+        if expected is not None and tok_type != expected:
+            raise SyntaxError(f"Expected {TokenType(expected)}, got {TokenType(tok_type)} at position {self.positions[self.pos]}")
+        value = self.values[self.pos]
         self.pos += 1
-        return tok
+        return value
+
+    def skip_empty_parens(self) -> None:
+        """Consume an optional '()' after TRUE/FALSE."""
+        if self.current() == TOK_LPAREN:
+            self.consume(TOK_LPAREN)
+            self.consume(TOK_RPAREN)
 
     def parse(self) -> ASTNode:
         result = self.parse_concat()
-        if self.current().type != TokenType.EOF:
-            raise SyntaxError(f"Unexpected token {self.current()} after expression")
+        if self.current() != TOK_EOF:
+            raise SyntaxError(f"Unexpected token {TokenType(self.current())} at position {self.positions[self.pos]} after expression")
         return result
 
     def parse_concat(self) -> ASTNode:
         left = self.parse_comparison()
         parts = [left]
-        while self.current().type == TokenType.AMPERSAND:
-            self.consume(TokenType.AMPERSAND)
+        while self.current() == TOK_AMPERSAND:
+            self.consume(TOK_AMPERSAND)
             right = self.parse_comparison()
             parts.append(right)
         if len(parts) == 1:
@@ -262,73 +321,55 @@ class Parser:
 
     def parse_comparison(self) -> ASTNode:
         left = self.parse_primary()
-        op_map = {
-            TokenType.EQUALS: '=',
-            TokenType.NOT_EQUALS: '<>',
-            TokenType.LT: '<',
-            TokenType.LE: '<=',
-            TokenType.GT: '>',
-            TokenType.GE: '>=',
-        }
-        if self.current().type in op_map:
-            op = op_map[self.current().type]
+        tok_type = self.current()
+        if tok_type in _COMPARISON_OPS:
+            op = _COMPARISON_OPS[tok_type]
             self.consume()
             right = self.parse_primary()
             return BinaryOp(op=op, left=left, right=right)
         return left
 
     def parse_primary(self) -> ASTNode:
-        tok = self.current()
+        tok_type = self.current()
 
-        if tok.type == TokenType.STRING:
-            self.consume()
-            return LiteralString(value=tok.value)
+        if tok_type == TOK_STRING:
+            return LiteralString(value=self.consume())
 
-        if tok.type == TokenType.NUMBER:
-            self.consume()
-            return LiteralInt(value=tok.value)
+        if tok_type == TOK_NUMBER:
+            return LiteralInt(value=self.consume())
 
-        if tok.type == TokenType.FIELD_REF:
-            self.consume()
-            return FieldRef(name=tok.value)
+        if tok_type == TOK_FIELD_REF:
+            return FieldRef(name=self.consume())
 
-        if tok.type == TokenType.FUNC_NAME:
-            name = tok.value.upper()
+        if tok_type == TOK_TRUE or tok_type == TOK_FALSE:
             self.consume()
+            self.skip_empty_parens()
+            return LiteralBool(value=tok_type == TOK_TRUE)
 
-            if name == 'TRUE':
-                if self.current().type == TokenType.LPAREN:
-                    self.consume(TokenType.LPAREN)
-                    self.consume(TokenType.RPAREN)
-                return LiteralBool(value=True)
+        if tok_type == TOK_FUNC_NAME:
+            name = self.consume().upper()
 
-            if name == 'FALSE':
-                if self.current().type == TokenType.LPAREN:
-                    self.consume(TokenType.LPAREN)
-                    self.consume(TokenType.RPAREN)
-                return LiteralBool(value=False)
-
-            self.consume(TokenType.LPAREN)
+            self.consume(TOK_LPAREN)
             args = []
-            if self.current().type != TokenType.RPAREN:
+            if self.current() != TOK_RPAREN:
                 args.append(self.parse_concat())
-                while self.current().type == TokenType.COMMA:
-                    self.consume(TokenType.COMMA)
+                while self.current() == TOK_COMMA:
+                    self.consume(TOK_COMMA)
                     args.append(self.parse_concat())
-            self.consume(TokenType.RPAREN)
+            self.consume(TOK_RPAREN)
 
             if name == 'NOT' and len(args) == 1:
                 return UnaryOp(op='NOT', operand=args[0])
 
             return FuncCall(name=name, args=args)
 
-        if tok.type == TokenType.LPAREN:
-            self.consume(TokenType.LPAREN)
+        if tok_type == TOK_LPAREN:
+            self.consume(TOK_LPAREN)
             expr = self.parse_concat()
-            self.consume(TokenType.RPAREN)
+            self.consume(TOK_RPAREN)
             return expr
 
-        raise SyntaxError(f"Unexpected token {tok.type} at position {tok.pos}")
+        raise SyntaxError(f"Unexpected token {TokenType(tok_type)} at position {self.positions[self.pos]}")
 
 
 def parse_formula(formula_text: str) -> ASTNode:
@@ -338,10 +379,84 @@ def parse_formula(formula_text: str) -> ASTNode:
     return parser.parse()
 
 
+# =============================================================================
+# CONSTANT FOLDING
+# =============================================================================
+
+def _is_boolean_node(ast: ASTNode) -> bool:
+    """Check if an AST node always evaluates to a boolean in OCL."""
+    if isinstance(ast, (LiteralBool, BinaryOp, UnaryOp)):
+        return True
+    return isinstance(ast, FuncCall) and ast.name in ('AND', 'OR')
+
+
+def fold_constants(ast: ASTNode) -> ASTNode:
+    """Simplify literal subexpressions so the emitted OCL is shorter.
+
+    Folds adjacent string literals in concatenations, neutral/absorbing
+    literals in AND/OR, double NOT and IF with a literal condition. Rewrites
+    that could turn a boolean result into a raw field value are skipped.
+    """
+    if isinstance(ast, UnaryOp):
+        operand = fold_constants(ast.operand)
+        if ast.op == 'NOT':
+            if isinstance(operand, LiteralBool):
+                return LiteralBool(value=not operand.value)
+            if (isinstance(operand, UnaryOp) and operand.op == 'NOT'
+                    and _is_boolean_node(operand.operand)):
+                return operand.operand
+        return UnaryOp(op=ast.op, operand=operand)
+
+    if isinstance(ast, BinaryOp):
+        return BinaryOp(op=ast.op, left=fold_constants(ast.left),
+                        right=fold_constants(ast.right))
+
+    if isinstance(ast, FuncCall):
+        args = [fold_constants(arg) for arg in ast.args]
+
+        if ast.name in ('AND', 'OR') and args:
+            # AND: TRUE is neutral, FALSE absorbs; OR is the reverse
+            neutral = ast.name == 'AND'
+            if any(isinstance(arg, LiteralBool) and arg.value is not neutral for arg in args):
+                return LiteralBool(value=not neutral)
+            kept = [arg for arg in args if not isinstance(arg, LiteralBool)]
+            if not kept:
+                return LiteralBool(value=neutral)
+            if len(kept) == len(args):
+                return FuncCall(name=ast.name, args=args)
+            if len(kept) == 1 and not _is_boolean_node(kept[0]):
+                # Keep one neutral literal so the result is still coerced to bool
+                kept.insert(0, LiteralBool(value=neutral))
+            return FuncCall(name=ast.name, args=kept)
+
+        if ast.name == 'IF' and len(args) >= 2 and isinstance(args[0], LiteralBool):
+            if args[0].value:
+                return args[1]
+            return args[2] if len(args) > 2 else LiteralString(value='')
+
+        return FuncCall(name=ast.name, args=args)
+
+    if isinstance(ast, Concat):
+        parts = []
+        for part in ast.parts:
+            part = fold_constants(part)
+            if (isinstance(part, LiteralString) and parts
+                    and isinstance(parts[-1], LiteralString)):
+                parts[-1] = LiteralString(value=parts[-1].value + part.value)
+            else:
+                parts.append(part)
+        if len(parts) == 1:
+            return parts[0]
+        return Concat(parts=parts)
+
+    return ast
+
+
 # =============================================================================
 # OCL EXPRESSION COMPILER
 # =============================================================================
 
+@lru_cache(maxsize=256)
 def field_to_ocl_attr(field_name: str) -> str:
     """Convert field name to OCL attribute (camelCase with self. prefix)."""
     if field_name:
@@ -354,6 +469,53 @@ def escape_ocl_string(s: str) -> str:
     return s.replace("'", "\\'")
 
 
+_OCL_BINARY_OPS = {'=': '=', '<>': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+
+def _emit_and(args: List[ASTNode]) -> str:
+    return ''.join(('(', ' and '.join([compile_to_ocl(arg) for arg in args]), ')'))
+
+
+def _emit_or(args: List[ASTNode]) -> str:
+    return ''.join(('(', ' or '.join([compile_to_ocl(arg) for arg in args]), ')'))
+
+
+def _emit_if(args: List[ASTNode]) -> str:
+    if len(args) < 2:
+        raise ValueError("IF requires at least 2 arguments")
+    else_val = compile_to_ocl(args[2]) if len(args) > 2 else "''"
+    return 'if %s then %s else %s endif' % (compile_to_ocl(args[0]), compile_to_ocl(args[1]), else_val)
+
+
+def _emit_not(args: List[ASTNode]) -> str:
+    if len(args) != 1:
+        raise ValueError("NOT requires 1 argument")
+    return 'not (%s)' % compile_to_ocl(args[0])
+
+
+def _emit_lower(args: List[ASTNode]) -> str:
+    if len(args) != 1:
+        raise ValueError("LOWER requires 1 argument")
+    return '%s.toLower()' % compile_to_ocl(args[0])
+
+
+def _emit_find(args: List[ASTNode]) -> str:
+    if len(args) != 2:
+        raise ValueError("FIND requires 2 arguments")
+    return '%s.indexOf(%s)' % (compile_to_ocl(args[1]), compile_to_ocl(args[0]))
+
+
+# OCL emitter per FuncCall name, built once instead of an if-chain per call
+_FN_EMIT = {
+    'AND': _emit_and,
+    'OR': _emit_or,
+    'IF': _emit_if,
+    'NOT': _emit_not,
+    'LOWER': _emit_lower,
+    'FIND': _emit_find,
+}
+
+
 def compile_to_ocl(ast: ASTNode) -> str:
     """Compile an AST node to an OCL expression."""
 
@@ -379,47 +541,14 @@ def compile_to_ocl(ast: ASTNode) -> str:
     if isinstance(ast, BinaryOp):
         left = compile_to_ocl(ast.left)
         right = compile_to_ocl(ast.right)
-        op_map = {'=': '=', '<>': '<>', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
-        ocl_op = op_map.get(ast.op, '=')
-        return f'({left} {ocl_op} {right})'
+        ocl_op = _OCL_BINARY_OPS.get(ast.op, '=')
+        return '(%s %s %s)' % (left, ocl_op, right)
 
     if isinstance(ast, FuncCall):
-        if ast.name == 'AND':
-            parts = [compile_to_ocl(arg) for arg in ast.args]
-            return '(' + ' and '.join(parts) + ')'
-
-        if ast.name == 'OR':
-            parts = [compile_to_ocl(arg) for arg in ast.args]
-            return '(' + ' or '.join(parts) + ')'
-
-        if ast.name == 'IF':
-            if len(ast.args) < 2:
-                raise ValueError("IF requires at least 2 arguments")
-            cond = compile_to_ocl(ast.args[0])
-            then_val = compile_to_ocl(ast.args[1])
-            else_val = compile_to_ocl(ast.args[2]) if len(ast.args) > 2 else "''"
-            return f'if {cond} then {then_val} else {else_val} endif'
-
-        if ast.name == 'NOT':
-            if len(ast.args) != 1:
-                raise ValueError("NOT requires 1 argument")
-            operand = compile_to_ocl(ast.args[0])
-            return f'not ({operand})'
-
-        if ast.name == 'LOWER':
-            if len(ast.args) != 1:
-                raise ValueError("LOWER requires 1 argument")
-            arg = compile_to_ocl(ast.args[0])
-            return f'{arg}.toLower()'
-
-        if ast.name == 'FIND':
-            if len(ast.args) != 2:
-                raise ValueError("FIND requires 2 arguments")
-            needle = compile_to_ocl(ast.args[0])
-            haystack = compile_to_ocl(ast.args[1])
-            return f'{haystack}.indexOf({needle})'
-
-        raise ValueError(f"Unknown function: {ast.name}")
+        emit = _FN_EMIT.get(ast.name)
+        if emit is None:
+            raise ValueError(f"Unknown function: {ast.name}")
+        return emit(ast.args)
 
     if isinstance(ast, Concat):
         parts = [compile_to_ocl(part) for part in ast.parts]
@@ -428,19 +557,34 @@ def compile_to_ocl(ast: ASTNode) -> str:
     raise ValueError(f"Unknown AST node type: {type(ast)}")
 
 
+@lru_cache(maxsize=None)
+def _compile_cached(formula: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse, constant-fold and compile a formula to OCL, memoized by formula text.
+
+    Returns (ocl_expr, None) on success or (None, error_message) when the
+    formula is malformed or uses an unsupported construct.
+    """
+    try:
+        ast = fold_constants(parse_formula(formula))
+        return compile_to_ocl(ast), None
+    except (SyntaxError, ValueError) as e:
+        return None, str(e)
+
+
 # =============================================================================
 # UML/PLANTUML GENERATORS
 # =============================================================================
 
+_DT_MAP = {
+    'boolean': 'Boolean',
+    'integer': 'Integer',
+}
+
+
+@lru_cache(maxsize=64)
 def datatype_to_uml(datatype: str) -> str:
     """Convert rulebook datatype to UML type."""
-    dt = datatype.lower()
-    if dt == 'boolean':
-        return 'Boolean'
-    elif dt == 'integer':
-        return 'Integer'
-    else:
-        return 'String'
+    return _DT_MAP.get(datatype.lower(), 'String')
 
 
 def format_value(value: Any) -> str:
@@ -458,11 +602,11 @@ def format_value(value: Any) -> str:
     return f'"{s}"'
 
 
-def generate_class_diagram(tables: Dict[str, Any]) -> str:
+def generate_class_diagram(table_items: List[Tuple[str, Dict[str, Any]]]) -> str:
     """Generate PlantUML class diagram from rulebook schema."""
     lines = ['@startuml', 'skinparam classAttributeIconSize 0', '']
 
-    for table_name, table_def in sorted(tables.items()):
+    for table_name, table_def in table_items:
         if table_name.startswith('_') or table_name.startswith('$'):
             continue
 
@@ -493,11 +637,11 @@ def generate_class_diagram(tables: Dict[str, Any]) -> str:
     return '\n'.join(lines)
 
 
-def generate_object_diagram(tables: Dict[str, Any]) -> str:
+def generate_object_diagram(table_items: List[Tuple[str, Dict[str, Any]]]) -> str:
     """Generate PlantUML object diagram from rulebook data."""
     lines = ['@startuml', '']
 
-    for table_name, table_def in sorted(tables.items()):
+    for table_name, table_def in table_items:
         if table_name.startswith('_') or table_name.startswith('$'):
             continue
 
@@ -534,14 +678,28 @@ def generate_object_diagram(tables: Dict[str, Any]) -> str:
     return '\n'.join(lines)
 
 
-def generate_model_json(tables: Dict[str, Any]) -> str:
-    """Generate JSON model for OCL evaluation."""
-    model = {
-        "classes": {},
-        "instances": []
-    }
+_MODEL_ENCODER = json.JSONEncoder(indent=2)
+
+
+def _write_json_subtree(out: TextIO, value: Any, depth: int) -> None:
+    """Write a JSON subtree as json.dumps(indent=2) would at the given nesting depth."""
+    pad = '\n' + '  ' * depth
+    for chunk in _MODEL_ENCODER.iterencode(value):
+        # Encoded strings never contain raw newlines, so only layout is re-indented
+        out.write(chunk.replace('\n', pad))
+
+
+def generate_model_json(table_items: List[Tuple[str, Dict[str, Any]]], out: TextIO) -> None:
+    """Stream the JSON model for OCL evaluation to `out`.
 
-    for table_name, table_def in sorted(tables.items()):
+    Classes and instances are encoded one at a time rather than building the
+    whole model dict first; the output matches json.dumps(model, indent=2).
+    """
+    out.write('{\n  "classes": ')
+    first_class = True
+    instance_tables = []
+
+    for table_name, table_def in table_items:
         if table_name.startswith('_') or table_name.startswith('$'):
             continue
 
@@ -552,7 +710,7 @@ def generate_model_json(tables: Dict[str, Any]) -> str:
             continue
 
         # Schema
-        model["classes"][table_name] = {
+        class_def = {
             "attributes": [],
             "derived": []
         }
@@ -564,11 +722,24 @@ def generate_model_json(tables: Dict[str, Any]) -> str:
             }
             if col.get('formula'):
                 attr["formula"] = col.get('formula')
-                model["classes"][table_name]["derived"].append(attr)
+                class_def["derived"].append(attr)
             else:
-                model["classes"][table_name]["attributes"].append(attr)
+                class_def["attributes"].append(attr)
+
+        out.write('{\n    ' if first_class else ',\n    ')
+        first_class = False
+        out.write(json.dumps(table_name))
+        out.write(': ')
+        _write_json_subtree(out, class_def, 2)
+
+        instance_tables.append((table_name, schema, data))
+
+    out.write('{}' if first_class else '\n  }')
+    out.write(',\n  "instances": ')
+    first_instance = True
 
-        # Instances
+    # Instances
+    for table_name, schema, data in instance_tables:
         for i, row in enumerate(data):
             instance = {
                 "class": table_name,
@@ -580,16 +751,19 @@ def generate_model_json(tables: Dict[str, Any]) -> str:
                     col_name = col.get('name', '')
                     instance["values"][col_name] = row.get(col_name)
 
-            model["instances"].append(instance)
+            out.write('[\n    ' if first_instance else ',\n    ')
+            first_instance = False
+            _write_json_subtree(out, instance, 2)
 
-    return json.dumps(model, indent=2)
+    out.write('[]' if first_instance else '\n  ]')
+    out.write('\n}')
 
 
-def generate_ocl_constraints(tables: Dict[str, Any]) -> str:
+def generate_ocl_constraints(table_items: List[Tuple[str, Dict[str, Any]]]) -> str:
     """Compile formulas to OCL derive expressions."""
     lines = ['-- OCL Constraints for ERB', '-- Generated from effortless-rulebook.json', '']
 
-    for table_name, table_def in sorted(tables.items()):
+    for table_name, table_def in table_items:
         if table_name.startswith('_') or table_name.startswith('$'):
             continue
 
@@ -612,16 +786,14 @@ def generate_ocl_constraints(tables: Dict[str, Any]) -> str:
 
             col_name = col.get('name', '')
 
-            try:
-                ast = parse_formula(formula)
-                ocl_expr = compile_to_ocl(ast)
+            ocl_expr, err = _compile_cached(formula)
 
+            if err is None:
                 lines.append(f'-- Formula: {formula.replace(chr(10), " ")}')
                 lines.append(f'derive {col_name}: {ocl_expr}')
                 lines.append('')
-
-            except Exception as e:
-                lines.append(f'-- Formula for {col_name} - parse error: {e}')
+            else:
+                lines.append(f'-- Formula for {col_name} - parse error: {err}')
                 lines.append(f'-- Original: {formula.replace(chr(10), " ")}')
                 lines.append('')
 
@@ -662,46 +834,51 @@ def main():
         print(f"ERROR: {e}")
         sys.exit(1)
 
-    # Filter to just table definitions (exclude metadata keys)
-    tables = {k: v for k, v in rulebook.items()
-              if isinstance(v, dict) and 'schema' in v}
-
-    print(f"Found {len(tables)} tables: {', '.join(tables.keys())}")
-
-    # Count calculated fields
+    # Filter to just table definitions (exclude metadata keys) and count
+    # calculated fields in the same pass
+    tables = {}
     total_calc = 0
-    for table_name, table_def in tables.items():
-        for col in table_def.get('schema', []):
+    for table_name, table_def in rulebook.items():
+        if not (isinstance(table_def, dict) and 'schema' in table_def):
+            continue
+        tables[table_name] = table_def
+        for col in table_def.get('schema', ()):
             if col.get('formula'):
                 total_calc += 1
+
+    print(f"Found {len(tables)} tables: {', '.join(tables.keys())}")
     print(f"Found {total_calc} calculated fields to compile")
 
+    # Sort once so every generator walks the tables in the same order
+    table_items = sorted(tables.items())
+
     print("\n" + "-" * 70)
 
     # Generate class-diagram.puml (PlantUML schema)
     print("\nGenerating class-diagram.puml (PlantUML class diagram)...")
-    class_diagram_content = generate_class_diagram(tables)
+    class_diagram_content = generate_class_diagram(table_items)
     class_diagram_path = script_dir / "class-diagram.puml"
     class_diagram_path.write_text(class_diagram_content, encoding='utf-8')
     print(f"   Wrote: {class_diagram_path} ({len(class_diagram_content)} bytes)")
 
     # Generate objects.puml (PlantUML object diagram)
     print("\nGenerating objects.puml (PlantUML object diagram)...")
-    objects_content = generate_object_diagram(tables)
+    objects_content = generate_object_diagram(table_items)
     objects_path = script_dir / "objects.puml"
     objects_path.write_text(objects_content, encoding='utf-8')
     print(f"   Wrote: {objects_path} ({len(objects_content)} bytes)")
 
     # Generate model.json (structured model for OCL evaluation)
     print("\nGenerating model.json (structured model)...")
-    model_content = generate_model_json(tables)
     model_path = script_dir / "model.json"
-    model_path.write_text(model_content, encoding='utf-8')
-    print(f"   Wrote: {model_path} ({len(model_content)} bytes)")
+    with open(model_path, 'w', encoding='utf-8') as f:
+        generate_model_json(table_items, f)
+        model_size = f.tell()
+    print(f"   Wrote: {model_path} ({model_size} bytes)")
 
     # Generate constraints.ocl (OCL derive expressions)
     print("\nGenerating constraints.ocl (OCL derive expressions)...")
-    ocl_content = generate_ocl_constraints(tables)
+    ocl_content = generate_ocl_constraints(table_items)
     ocl_path = script_dir / "constraints.ocl"
     ocl_path.write_text(ocl_content, encoding='utf-8')
     print(f"   Wrote: {ocl_path} ({len(ocl_content)} bytes)")
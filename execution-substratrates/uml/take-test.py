@@ -7,16 +7,20 @@ Scaffolding that:
 2. Evaluates OCL expressions to compute derived values
 3. Extracts results to test-answers.json
 
-The computation happens in the OCL interpreter, not hardcoded here.
+The computation happens in the OCL evaluator, not hardcoded here.
 This script is 100% domain-agnostic - all field names come from the rulebook.
 """
 
+import heapq
 import json
+import operator
 import re
+from functools import lru_cache
 from pathlib import Path
 import sys
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional, Union
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Callable, FrozenSet, Iterable, List, Dict, Any, Optional, Set, Tuple, Union
 from enum import Enum, auto
 
 # Add project root to path for shared imports
@@ -24,6 +28,13 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from orchestration.shared import load_rulebook
 
+# Try to import orjson for faster result serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # =============================================================================
 # OCL LEXER
@@ -66,142 +77,77 @@ class OCLToken:
     pos: int
 
 
+_OCL_KEYWORDS = {
+    'and': OCLTokenType.AND,
+    'or': OCLTokenType.OR,
+    'not': OCLTokenType.NOT,
+    'if': OCLTokenType.IF,
+    'then': OCLTokenType.THEN,
+    'else': OCLTokenType.ELSE,
+    'endif': OCLTokenType.ENDIF,
+    'true': OCLTokenType.TRUE,
+    'false': OCLTokenType.FALSE,
+}
+
+_OCL_OPERATORS = {
+    '<>': OCLTokenType.NEQ,
+    '<=': OCLTokenType.LE,
+    '>=': OCLTokenType.GE,
+    '<': OCLTokenType.LT,
+    '>': OCLTokenType.GT,
+    '=': OCLTokenType.EQ,
+    '+': OCLTokenType.PLUS,
+    '-': OCLTokenType.MINUS,
+    '*': OCLTokenType.STAR,
+    '/': OCLTokenType.SLASH,
+    '(': OCLTokenType.LPAREN,
+    ')': OCLTokenType.RPAREN,
+    '.': OCLTokenType.DOT,
+    ',': OCLTokenType.COMMA,
+}
+
+# One alternation scanned by the regex engine; order matters: a '-' directly
+# before a digit is part of the number, and two-char operators precede
+# their one-char prefixes.
+_OCL_TOKEN_RE = re.compile(r"""
+    (?P<WS>[ \t\n\r]+)
+  | (?P<STRING>'(?:[^'\\]|\\.)*')
+  | (?P<UNTERMINATED>')
+  | (?P<NUMBER>-?\d+)
+  | (?P<OP><>|<=|>=|[<>=+\-*/().,])
+  | (?P<IDENT>[^\W\d]\w*)
+""", re.VERBOSE | re.DOTALL)
+
+# Unescape inside string literals: \' becomes ', \\ becomes \
+_OCL_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+
+
 def ocl_tokenize(expr: str) -> List[OCLToken]:
     """Tokenize an OCL expression."""
     tokens = []
     i = 0
-
-    keywords = {
-        'and': OCLTokenType.AND,
-        'or': OCLTokenType.OR,
-        'not': OCLTokenType.NOT,
-        'if': OCLTokenType.IF,
-        'then': OCLTokenType.THEN,
-        'else': OCLTokenType.ELSE,
-        'endif': OCLTokenType.ENDIF,
-        'true': OCLTokenType.TRUE,
-        'false': OCLTokenType.FALSE,
-    }
-
-    while i < len(expr):
-        c = expr[i]
-
-        # Skip whitespace
-        if c in ' \t\n\r':
-            i += 1
-            continue
-
-        # String literal (single quotes in OCL)
-        if c == "'":
-            j = i + 1
-            chars = []
-            while j < len(expr) and expr[j] != "'":
-                if expr[j] == '\\' and j + 1 < len(expr):
-                    # Unescape: \' becomes ', \\ becomes \
-                    next_char = expr[j + 1]
-                    if next_char == "'":
-                        chars.append("'")
-                    elif next_char == "\\":
-                        chars.append("\\")
-                    else:
-                        chars.append(next_char)
-                    j += 2
-                else:
-                    chars.append(expr[j])
-                    j += 1
-            if j >= len(expr):
-                raise SyntaxError(f"Unterminated string at position {i}")
-            value = ''.join(chars)
+    n = len(expr)
+
+    while i < n:
+        m = _OCL_TOKEN_RE.match(expr, i)
+        if m is None:
+            raise SyntaxError(f"Unexpected character '{expr[i]}' at position {i}")
+        kind = m.lastgroup
+        text = m.group()
+
+        if kind == 'IDENT':
+            tokens.append(OCLToken(_OCL_KEYWORDS.get(text.lower(), OCLTokenType.IDENTIFIER), text, i))
+        elif kind == 'OP':
+            tokens.append(OCLToken(_OCL_OPERATORS[text], text, i))
+        elif kind == 'NUMBER':
+            tokens.append(OCLToken(OCLTokenType.NUMBER, int(text), i))
+        elif kind == 'STRING':
+            value = _OCL_ESCAPE_RE.sub(r'\1', text[1:-1])
             tokens.append(OCLToken(OCLTokenType.STRING, value, i))
-            i = j + 1
-            continue
+        elif kind == 'UNTERMINATED':
+            raise SyntaxError(f"Unterminated string at position {i}")
 
-        # Number
-        if c.isdigit() or (c == '-' and i + 1 < len(expr) and expr[i+1].isdigit()):
-            j = i
-            if c == '-':
-                j += 1
-            while j < len(expr) and expr[j].isdigit():
-                j += 1
-            value = int(expr[i:j])
-            tokens.append(OCLToken(OCLTokenType.NUMBER, value, i))
-            i = j
-            continue
-
-        # Operators
-        if expr[i:i+2] == '<>':
-            tokens.append(OCLToken(OCLTokenType.NEQ, '<>', i))
-            i += 2
-            continue
-        if expr[i:i+2] == '<=':
-            tokens.append(OCLToken(OCLTokenType.LE, '<=', i))
-            i += 2
-            continue
-        if expr[i:i+2] == '>=':
-            tokens.append(OCLToken(OCLTokenType.GE, '>=', i))
-            i += 2
-            continue
-        if c == '<':
-            tokens.append(OCLToken(OCLTokenType.LT, '<', i))
-            i += 1
-            continue
-        if c == '>':
-            tokens.append(OCLToken(OCLTokenType.GT, '>', i))
-            i += 1
-            continue
-        if c == '=':
-            tokens.append(OCLToken(OCLTokenType.EQ, '=', i))
-            i += 1
-            continue
-        if c == '+':
-            tokens.append(OCLToken(OCLTokenType.PLUS, '+', i))
-            i += 1
-            continue
-        if c == '-':
-            tokens.append(OCLToken(OCLTokenType.MINUS, '-', i))
-            i += 1
-            continue
-        if c == '*':
-            tokens.append(OCLToken(OCLTokenType.STAR, '*', i))
-            i += 1
-            continue
-        if c == '/':
-            tokens.append(OCLToken(OCLTokenType.SLASH, '/', i))
-            i += 1
-            continue
-        if c == '(':
-            tokens.append(OCLToken(OCLTokenType.LPAREN, '(', i))
-            i += 1
-            continue
-        if c == ')':
-            tokens.append(OCLToken(OCLTokenType.RPAREN, ')', i))
-            i += 1
-            continue
-        if c == '.':
-            tokens.append(OCLToken(OCLTokenType.DOT, '.', i))
-            i += 1
-            continue
-        if c == ',':
-            tokens.append(OCLToken(OCLTokenType.COMMA, ',', i))
-            i += 1
-            continue
-
-        # Identifiers and keywords
-        if c.isalpha() or c == '_':
-            j = i
-            while j < len(expr) and (expr[j].isalnum() or expr[j] == '_'):
-                j += 1
-            name = expr[i:j]
-            lower_name = name.lower()
-
-            if lower_name in keywords:
-                tokens.append(OCLToken(keywords[lower_name], name, i))
-            else:
-                tokens.append(OCLToken(OCLTokenType.IDENTIFIER, name, i))
-            i = j
-            continue
-
-        raise SyntaxError(f"Unexpected character '{c}' at position {i}")
+        i = m.end()
 
     tokens.append(OCLToken(OCLTokenType.EOF, None, len(expr)))
     return tokens
@@ -211,74 +157,334 @@ def ocl_tokenize(expr: str) -> List[OCLToken]:
 # OCL AST NODES
 # =============================================================================
 
-@dataclass
 class OCLNode:
-    pass
+    __slots__ = ()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OCLLiteralBool(OCLNode):
     value: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OCLLiteralInt(OCLNode):
     value: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OCLLiteralString(OCLNode):
     value: str
 
 
-@dataclass
+# The nodes built most often while parsing are plain __slots__ classes with
+# positional __init__ rather than dataclasses; equality and a cached hash are
+# written out so the parser can still share equal subtrees.
+
 class OCLSelfAttr(OCLNode):
-    attr: str
+    __slots__ = ('attr', 'attr_key', '_hash')
+
+    def __init__(self, attr: str, /):
+        self.attr = attr
+        # Case-folded lookup key, computed once at parse time
+        self.attr_key = attr.lower()
+        self._hash = hash((OCLSelfAttr, attr))
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is OCLSelfAttr and self.attr == other.attr
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"OCLSelfAttr(attr={self.attr!r})"
 
 
-@dataclass
 class OCLBinaryExpr(OCLNode):
-    op: str
-    left: OCLNode
-    right: OCLNode
+    __slots__ = ('op', 'left', 'right', 'fn', '_hash')
 
+    def __init__(self, op: str, left: OCLNode, right: OCLNode, /):
+        self.op = op
+        self.left = left
+        self.right = right
+        # Operator implementation, resolved from `op` once at parse time
+        self.fn: Optional[Callable[[Any, Any], Any]] = BINARY_OPS.get(op)
+        self._hash = hash((OCLBinaryExpr, op, left, right))
 
-@dataclass
+    def __eq__(self, other: object) -> bool:
+        return (type(other) is OCLBinaryExpr and self.op == other.op
+                and self.left == other.left and self.right == other.right)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"OCLBinaryExpr(op={self.op!r}, left={self.left!r}, right={self.right!r})"
+
+
+@dataclass(slots=True, frozen=True)
 class OCLUnaryExpr(OCLNode):
     op: str
     operand: OCLNode
+    fn: Optional[Callable[[Any], Any]] = field(default=None, repr=False, compare=False)
 
+    def __post_init__(self):
+        object.__setattr__(self, 'fn', UNARY_OPS.get(self.op))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class OCLIfExpr(OCLNode):
     cond: OCLNode
     then_branch: OCLNode
     else_branch: OCLNode
 
 
-@dataclass
 class OCLMethodCall(OCLNode):
-    obj: OCLNode
-    method: str
-    args: List[OCLNode]
+    __slots__ = ('obj', 'method', 'args', 'fn', '_hash')
+
+    def __init__(self, obj: OCLNode, method: str, args: Tuple[OCLNode, ...], /):
+        self.obj = obj
+        self.method = method
+        self.args = args
+        # Called as fn(obj, arg_values); resolved case-insensitively from `method`
+        self.fn: Optional[Callable[..., Any]] = METHODS.get(method.lower())
+        self._hash = hash((OCLMethodCall, obj, method, args))
+
+    def __eq__(self, other: object) -> bool:
+        return (type(other) is OCLMethodCall and self.method == other.method
+                and self.obj == other.obj and self.args == other.args)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"OCLMethodCall(obj={self.obj!r}, method={self.method!r}, args={self.args!r})"
+
+
+# =============================================================================
+# OCL OPERATORS
+# =============================================================================
+# None-coercion rules: arithmetic treats None as 0 (1 for a divisor),
+# ordering comparisons with None are False, '+' concatenates if either
+# side is a string.
+
+def _op_add(left: Any, right: Any) -> Any:
+    # String concatenation with +
+    if isinstance(left, str) or isinstance(right, str):
+        left_str = '' if left is None else str(left)
+        right_str = '' if right is None else str(right)
+        return left_str + right_str
+    left_num = 0 if left is None else left
+    right_num = 0 if right is None else right
+    return left_num + right_num
+
+
+def _op_sub(left: Any, right: Any) -> Any:
+    return (0 if left is None else left) - (0 if right is None else right)
+
+
+def _op_mul(left: Any, right: Any) -> Any:
+    return (0 if left is None else left) * (0 if right is None else right)
+
+
+def _op_div(left: Any, right: Any) -> Any:
+    left_num = 0 if left is None else left
+    right_num = 1 if right is None or right == 0 else right
+    return left_num / right_num
+
+
+def _op_lt(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    return left < right
+
+
+def _op_le(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    return left <= right
+
+
+def _op_gt(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    return left > right
+
+
+def _op_ge(left: Any, right: Any) -> bool:
+    if left is None or right is None:
+        return False
+    return left >= right
+
+
+def _op_and(left: Any, right: Any) -> bool:
+    return bool(left) and bool(right)
+
+
+def _op_or(left: Any, right: Any) -> bool:
+    return bool(left) or bool(right)
+
+
+def _op_not(operand: Any) -> Optional[bool]:
+    return not bool(operand) if operand is not None else None
+
+
+BINARY_OPS = {
+    '+': _op_add,
+    '-': _op_sub,
+    '*': _op_mul,
+    '/': _op_div,
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': _op_lt,
+    '<=': _op_le,
+    '>': _op_gt,
+    '>=': _op_ge,
+    'and': _op_and,
+    'or': _op_or,
+}
+
+UNARY_OPS = {
+    'not': _op_not,
+}
+
+
+def _method_to_lower(obj: Any, args: List[Any]) -> str:
+    return str(obj).lower() if obj is not None else ''
+
+
+def _method_to_upper(obj: Any, args: List[Any]) -> str:
+    return str(obj).upper() if obj is not None else ''
+
+
+def _method_index_of(obj: Any, args: List[Any]) -> int:
+    if not args:
+        raise ValueError("indexOf requires 1 argument")
+    if obj is None:
+        return -1
+    return str(obj).find(str(args[0]))
+
+
+def _method_substring(obj: Any, args: List[Any]) -> str:
+    if len(args) < 2:
+        raise ValueError("substring requires 2 arguments")
+    if obj is None:
+        return ''
+    return str(obj)[args[0]:args[1]]
+
+
+def _method_size(obj: Any, args: List[Any]) -> int:
+    if obj is None:
+        return 0
+    return len(str(obj))
+
+
+# Keyed by lower-cased method name
+METHODS = {
+    'tolower': _method_to_lower,
+    'toupper': _method_to_upper,
+    'indexof': _method_index_of,
+    'substring': _method_substring,
+    'size': _method_size,
+}
+
+
+# =============================================================================
+# CONSTANT FOLDING
+# =============================================================================
+
+_LITERAL_TYPES = (OCLLiteralBool, OCLLiteralInt, OCLLiteralString)
+
+
+def _make_literal(value: Any) -> Optional[OCLNode]:
+    """Wrap a folded value in a literal node, or None if there is no literal form."""
+    if isinstance(value, bool):
+        return OCLLiteralBool(value=value)
+    if isinstance(value, int):
+        return OCLLiteralInt(value=value)
+    if isinstance(value, str):
+        return OCLLiteralString(value=value)
+    return None
+
+
+def fold_constant(node: OCLNode) -> OCLNode:
+    """Collapse an operator or if-expression whose inputs are all literals.
+
+    Called by the parser as each node is built, so constant subexpressions
+    are evaluated once at parse time instead of once per instance. Anything
+    that cannot be folded exactly (no literal form, evaluation error) is
+    returned unchanged and evaluated at runtime as before.
+    """
+    if isinstance(node, OCLBinaryExpr):
+        if (node.fn is not None and isinstance(node.left, _LITERAL_TYPES)
+                and isinstance(node.right, _LITERAL_TYPES)):
+            try:
+                folded = _make_literal(node.fn(node.left.value, node.right.value))
+            except Exception:
+                folded = None
+            if folded is not None:
+                return folded
+        return node
+
+    if isinstance(node, OCLUnaryExpr):
+        if node.fn is not None and isinstance(node.operand, _LITERAL_TYPES):
+            folded = _make_literal(node.fn(node.operand.value))
+            if folded is not None:
+                return folded
+        return node
+
+    if isinstance(node, OCLIfExpr):
+        if isinstance(node.cond, _LITERAL_TYPES):
+            return node.then_branch if node.cond.value else node.else_branch
+        return node
+
+    return node
 
 
 # =============================================================================
 # OCL PARSER
 # =============================================================================
 
+# Binary operators by precedence level (token type -> AST op)
+_OR_OPS = {OCLTokenType.OR: 'or'}
+_AND_OPS = {OCLTokenType.AND: 'and'}
+_COMPARISON_OPS = {
+    OCLTokenType.EQ: '=',
+    OCLTokenType.NEQ: '<>',
+    OCLTokenType.LT: '<',
+    OCLTokenType.LE: '<=',
+    OCLTokenType.GT: '>',
+    OCLTokenType.GE: '>=',
+}
+_ADDITIVE_OPS = {OCLTokenType.PLUS: '+', OCLTokenType.MINUS: '-'}
+_MULTIPLICATIVE_OPS = {OCLTokenType.STAR: '*', OCLTokenType.SLASH: '/'}
+
+
 class OCLParser:
     """Parser for OCL expressions."""
 
     def __init__(self, tokens: List[OCLToken]):
         self.tokens = tokens
+        # Token types as a flat list so lookahead checks index it directly
+        # instead of going through current().type
+        self.types = [tok.type for tok in tokens]
         self.pos = 0
+        # Canonical instance of each distinct subtree seen in this parse
+        self.shared: Dict[OCLNode, OCLNode] = {}
+
+    def share(self, node: OCLNode) -> OCLNode:
+        """Return the canonical instance of a structurally equal subtree.
+
+        Nodes are built bottom-up, so children are already canonical and a
+        repeated subexpression such as `self.name.toLower()` becomes a single
+        shared node, which the codegen evaluates once (see ocl_to_python).
+        """
+        return self.shared.setdefault(node, node)
 
     def current(self) -> OCLToken:
         return self.tokens[self.pos]
 
     def consume(self, expected: OCLTokenType = None) -> OCLToken:
-        tok = self.current()
+        tok = self.tokens[self.pos]
         if expected and tok.type != expected:
             raise SyntaxError(f"Expected {expected}, got {tok.type} at position {tok.pos}")
         self.pos += 1
@@ -294,87 +500,70 @@ class OCLParser:
         # The + operator for string concatenation is handled at additive level
         return self.parse_or()
 
-    def parse_or(self) -> OCLNode:
-        left = self.parse_and()
-        while self.current().type == OCLTokenType.OR:
-            self.consume()
-            right = self.parse_and()
-            left = OCLBinaryExpr(op='or', left=left, right=right)
+    def parse_binary_level(self, ops: Dict[OCLTokenType, str],
+                           parse_operand: Callable[[], OCLNode]) -> OCLNode:
+        """Parse a left-associative chain of the given operators."""
+        types = self.types
+        left = parse_operand()
+        while types[self.pos] in ops:
+            op = ops[types[self.pos]]
+            self.pos += 1
+            right = parse_operand()
+            left = self.share(fold_constant(OCLBinaryExpr(op, left, right)))
         return left
 
+    def parse_or(self) -> OCLNode:
+        return self.parse_binary_level(_OR_OPS, self.parse_and)
+
     def parse_and(self) -> OCLNode:
-        left = self.parse_not()
-        while self.current().type == OCLTokenType.AND:
-            self.consume()
-            right = self.parse_not()
-            left = OCLBinaryExpr(op='and', left=left, right=right)
-        return left
+        return self.parse_binary_level(_AND_OPS, self.parse_not)
 
     def parse_not(self) -> OCLNode:
-        if self.current().type == OCLTokenType.NOT:
+        if self.types[self.pos] == OCLTokenType.NOT:
             self.consume()
             operand = self.parse_not()
-            return OCLUnaryExpr(op='not', operand=operand)
+            return self.share(fold_constant(OCLUnaryExpr(op='not', operand=operand)))
         return self.parse_comparison()
 
     def parse_comparison(self) -> OCLNode:
         left = self.parse_additive()
-        op_types = {
-            OCLTokenType.EQ: '=',
-            OCLTokenType.NEQ: '<>',
-            OCLTokenType.LT: '<',
-            OCLTokenType.LE: '<=',
-            OCLTokenType.GT: '>',
-            OCLTokenType.GE: '>=',
-        }
-        if self.current().type in op_types:
-            op = op_types[self.current().type]
-            self.consume()
+        tok_type = self.types[self.pos]
+        if tok_type in _COMPARISON_OPS:
+            op = _COMPARISON_OPS[tok_type]
+            self.pos += 1
             right = self.parse_additive()
-            return OCLBinaryExpr(op=op, left=left, right=right)
+            return self.share(fold_constant(OCLBinaryExpr(op, left, right)))
         return left
 
     def parse_additive(self) -> OCLNode:
-        left = self.parse_multiplicative()
-        while self.current().type in (OCLTokenType.PLUS, OCLTokenType.MINUS):
-            op = '+' if self.current().type == OCLTokenType.PLUS else '-'
-            self.consume()
-            right = self.parse_multiplicative()
-            left = OCLBinaryExpr(op=op, left=left, right=right)
-        return left
+        return self.parse_binary_level(_ADDITIVE_OPS, self.parse_multiplicative)
 
     def parse_multiplicative(self) -> OCLNode:
-        left = self.parse_postfix()
-        while self.current().type in (OCLTokenType.STAR, OCLTokenType.SLASH):
-            op = '*' if self.current().type == OCLTokenType.STAR else '/'
-            self.consume()
-            right = self.parse_postfix()
-            left = OCLBinaryExpr(op=op, left=left, right=right)
-        return left
+        return self.parse_binary_level(_MULTIPLICATIVE_OPS, self.parse_postfix)
 
     def parse_postfix(self) -> OCLNode:
         node = self.parse_primary()
 
         # Handle dot notation (method calls and attribute access)
-        while self.current().type == OCLTokenType.DOT:
+        while self.types[self.pos] == OCLTokenType.DOT:
             self.consume()
             name_tok = self.consume(OCLTokenType.IDENTIFIER)
             method_name = name_tok.value
 
             # Check for method call with parentheses
-            if self.current().type == OCLTokenType.LPAREN:
+            if self.types[self.pos] == OCLTokenType.LPAREN:
                 self.consume()
                 args = []
-                if self.current().type != OCLTokenType.RPAREN:
+                if self.types[self.pos] != OCLTokenType.RPAREN:
                     args.append(self.parse_or())
-                    while self.current().type == OCLTokenType.COMMA:
+                    while self.types[self.pos] == OCLTokenType.COMMA:
                         self.consume()
                         args.append(self.parse_or())
                 self.consume(OCLTokenType.RPAREN)
-                node = OCLMethodCall(obj=node, method=method_name, args=args)
+                node = self.share(OCLMethodCall(node, method_name, tuple(args)))
             else:
                 # Attribute access - treat as method with no args
-                node = OCLMethodCall(obj=node, method=method_name, args=[])
+                node = self.share(OCLMethodCall(node, method_name, ()))
 
         return node
 
@@ -402,13 +591,13 @@ class OCLParser:
             self.consume()
 
             # Handle self.attribute
-            if name.lower() == 'self' and self.current().type == OCLTokenType.DOT:
+            if name.lower() == 'self' and self.types[self.pos] == OCLTokenType.DOT:
                 self.consume()  # consume dot
                 attr_tok = self.consume(OCLTokenType.IDENTIFIER)
-                return OCLSelfAttr(attr=attr_tok.value)
+                return self.share(OCLSelfAttr(attr_tok.value))
 
             # Just an identifier
-            return OCLSelfAttr(attr=name)
+            return self.share(OCLSelfAttr(name))
 
         if tok.type == OCLTokenType.LPAREN:
             self.consume()
@@ -425,188 +614,222 @@ class OCLParser:
             self.consume(OCLTokenType.ELSE)
             else_branch = self.parse_or()  # Full expression in branches
             self.consume(OCLTokenType.ENDIF)
-            return OCLIfExpr(cond=cond, then_branch=then_branch, else_branch=else_branch)
+            return self.share(fold_constant(OCLIfExpr(cond=cond, then_branch=then_branch, else_branch=else_branch)))
 
         raise SyntaxError(f"Unexpected token {tok.type} at position {tok.pos}")
 
 
+@lru_cache(maxsize=4096)
 def parse_ocl(expr: str) -> OCLNode:
-    """Parse an OCL expression into an AST."""
+    """Parse an OCL expression into an AST.
+
+    Memoized by expression text; AST nodes are never mutated, so
+    the same tree is safely shared across instances.
+    """
     tokens = ocl_tokenize(expr)
     parser = OCLParser(tokens)
     return parser.parse()
 
 
 # =============================================================================
-# OCL INTERPRETER
+# OCL TO PYTHON CODEGEN
 # =============================================================================
 
-class OCLInterpreter:
-    """
-    Minimal OCL interpreter for ERB formula subset.
-
-    Supported operations:
-    - Attribute access: self.name
-    - Arithmetic: +, -, *, /
-    - String concatenation: +
-    - Comparison: =, <>, <, <=, >, >=
-    - Boolean: and, or, not
-    - String methods: toLower(), indexOf()
-    - Conditional: if-then-else-endif
+# Operator/method helpers are called by name from generated code
+_CODEGEN_GLOBALS = {
+    '__builtins__': {'bool': bool},
+    **{fn.__name__: fn for fn in (*BINARY_OPS.values(), *UNARY_OPS.values(), *METHODS.values())},
+}
+
+
+# Operators that, on two ints, need none of the helpers' None-coercion and
+# can be emitted as native Python operators ('/' keeps its zero-divisor rule)
+_NATIVE_NUMERIC_OPS = {'+', '-', '*', '=', '<>', '<', '<=', '>', '>='}
+_PYTHON_OPS = {'=': '==', '<>': '!='}
+
+
+def _is_numeric(node: OCLNode, numeric_attrs: FrozenSet[str]) -> bool:
+    """True if the node is statically known to evaluate to an int."""
+    if isinstance(node, OCLLiteralInt):
+        return True
+    if isinstance(node, OCLSelfAttr):
+        return node.attr_key in numeric_attrs
+    if isinstance(node, OCLBinaryExpr) and node.op in ('+', '-', '*'):
+        return _is_numeric(node.left, numeric_attrs) and _is_numeric(node.right, numeric_attrs)
+    return False
+
+
+def numeric_attr_keys(lookups: List[Dict[str, Any]], exclude: Iterable[str] = ()) -> FrozenSet[str]:
+    """Lookup keys whose value is a (non-bool) int in every instance."""
+    if not lookups:
+        return frozenset()
+    keys = set(lookups[0]) - set(exclude)
+    for attr_lookup in lookups:
+        keys = {key for key in keys if type(attr_lookup.get(key)) is int}
+    return frozenset(keys)
+
+
+def _repeated_method_calls(root: OCLNode) -> Set[OCLNode]:
+    """Method-call subtrees that occur more than once in an expression."""
+    counts: Dict[OCLNode, int] = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, OCLMethodCall):
+            counts[node] = counts.get(node, 0) + 1
+            stack.append(node.obj)
+            stack.extend(node.args)
+        elif isinstance(node, OCLBinaryExpr):
+            stack.extend((node.left, node.right))
+        elif isinstance(node, OCLUnaryExpr):
+            stack.append(node.operand)
+        elif isinstance(node, OCLIfExpr):
+            stack.extend((node.cond, node.then_branch, node.else_branch))
+    return {node for node, count in counts.items() if count > 1}
+
+
+def ocl_to_python(node: OCLNode, numeric_attrs: FrozenSet[str] = frozenset(),
+                  bound_names: Optional[Dict[str, str]] = None) -> str:
+    """Translate an OCL AST into a Python expression over the `_a` attribute dict.
+
+    The generated code calls the operator and method helpers above, which
+    carry OCL's None-coercion rules.
+    Arithmetic and comparisons between operands known to be ints (literals
+    and attributes in numeric_attrs) are emitted as native operators.
+    Attributes in bound_names are read from the given local variable
+    instead of the lookup.
+
+    A method call that occurs more than once (such as a repeated
+    `self.name.toLower()`) is bound to a local with := where it is first
+    evaluated unconditionally, and later occurrences read the local.
+    Occurrences that only run on some paths (if branches, the right side
+    of and/or) before that point are left as calls.
     """
+    bound_names = bound_names or {}
+    repeated = _repeated_method_calls(node)
+    call_names: Dict[OCLNode, str] = {}
 
-    def __init__(self, instance: Dict[str, Any]):
-        self.instance = instance
-        # Build case-insensitive lookup (OCL uses camelCase but model has PascalCase)
-        self.attr_lookup = {}
-        for key, value in instance.items():
-            self.attr_lookup[key.lower()] = value
-
-    def evaluate(self, expr: str) -> Any:
-        """Evaluate an OCL expression against the instance."""
-        ast = parse_ocl(expr)
-        return self.eval_node(ast)
-
-    def eval_node(self, node: OCLNode) -> Any:
-        if isinstance(node, OCLLiteralBool):
-            return node.value
-
-        if isinstance(node, OCLLiteralInt):
-            return node.value
-
-        if isinstance(node, OCLLiteralString):
-            return node.value
+    # Children are emitted in Python's evaluation order, so a call bound
+    # by an earlier emit has always run before a later one reads it.
+    # `always` is False below a point that only runs on some paths.
+    def emit(node: OCLNode, always: bool) -> str:
+        if isinstance(node, (OCLLiteralBool, OCLLiteralInt, OCLLiteralString)):
+            return repr(node.value)
 
         if isinstance(node, OCLSelfAttr):
-            # Use case-insensitive lookup
-            return self.attr_lookup.get(node.attr.lower())
+            if node.attr_key in bound_names:
+                return bound_names[node.attr_key]
+            return f'_a.get({node.attr_key!r})'
 
         if isinstance(node, OCLUnaryExpr):
-            if node.op == 'not':
-                operand = self.eval_node(node.operand)
-                return not bool(operand) if operand is not None else None
-            raise ValueError(f"Unknown unary op: {node.op}")
+            if node.fn is None:
+                raise ValueError(f"Unknown unary op: {node.op}")
+            return f'{node.fn.__name__}({emit(node.operand, always)})'
 
         if isinstance(node, OCLBinaryExpr):
-            left = self.eval_node(node.left)
-            right = self.eval_node(node.right)
-            return self.apply_binary_op(node.op, left, right)
+            if node.fn is None:
+                raise ValueError(f"Unknown binary op: {node.op}")
+            if node.op in ('and', 'or'):
+                # Python's and/or short-circuit; bool() keeps the result a boolean
+                left = emit(node.left, always)
+                return f'(bool({left}) {node.op} bool({emit(node.right, False)}))'
+            left = emit(node.left, always)
+            right = emit(node.right, always)
+            if (node.op in _NATIVE_NUMERIC_OPS and _is_numeric(node.left, numeric_attrs)
+                    and _is_numeric(node.right, numeric_attrs)):
+                return f'({left} {_PYTHON_OPS.get(node.op, node.op)} {right})'
+            return f'{node.fn.__name__}({left}, {right})'
 
         if isinstance(node, OCLIfExpr):
-            cond = self.eval_node(node.cond)
-            if cond:
-                return self.eval_node(node.then_branch)
-            else:
-                return self.eval_node(node.else_branch)
+            # The condition runs first, before either branch
+            cond = emit(node.cond, always)
+            return f'({emit(node.then_branch, False)} if {cond} else {emit(node.else_branch, False)})'
 
         if isinstance(node, OCLMethodCall):
-            obj = self.eval_node(node.obj)
-            return self.apply_method(obj, node.method, node.args)
+            if node.fn is None:
+                raise ValueError(f"Unknown method: {node.method}")
+            if node in call_names:
+                return call_names[node]
+            obj = emit(node.obj, always)
+            args = ', '.join(emit(arg, always) for arg in node.args)
+            call = f'{node.fn.__name__}({obj}, [{args}])'
+            if always and node in repeated:
+                call_names[node] = name = f'_m{len(call_names)}'
+                return f'({name} := {call})'
+            return call
 
         raise ValueError(f"Unknown node type: {type(node)}")
 
-    def apply_binary_op(self, op: str, left: Any, right: Any) -> Any:
-        # String concatenation with +
-        if op == '+':
-            if isinstance(left, str) or isinstance(right, str):
-                left_str = '' if left is None else str(left)
-                right_str = '' if right is None else str(right)
-                return left_str + right_str
-            left_num = 0 if left is None else left
-            right_num = 0 if right is None else right
-            return left_num + right_num
-
-        if op == '-':
-            left_num = 0 if left is None else left
-            right_num = 0 if right is None else right
-            return left_num - right_num
-
-        if op == '*':
-            left_num = 0 if left is None else left
-            right_num = 0 if right is None else right
-            return left_num * right_num
-
-        if op == '/':
-            left_num = 0 if left is None else left
-            right_num = 1 if right is None or right == 0 else right
-            return left_num / right_num
-
-        if op == '=':
-            return left == right
-
-        if op == '<>':
-            return left != right
-
-        if op == '<':
-            if left is None or right is None:
-                return False
-            return left < right
-
-        if op == '<=':
-            if left is None or right is None:
-                return False
-            return left <= right
-
-        if op == '>':
-            if left is None or right is None:
-                return False
-            return left > right
-
-        if op == '>=':
-            if left is None or right is None:
-                return False
-            return left >= right
-
-        if op == 'and':
-            return bool(left) and bool(right)
-
-        if op == 'or':
-            return bool(left) or bool(right)
-
-        raise ValueError(f"Unknown binary op: {op}")
-
-    def apply_method(self, obj: Any, method: str, args: List[OCLNode]) -> Any:
-        method_lower = method.lower()
-
-        if method_lower == 'tolower':
-            return str(obj).lower() if obj is not None else ''
-
-        if method_lower == 'toupper':
-            return str(obj).upper() if obj is not None else ''
-
-        if method_lower == 'indexof':
-            if not args:
-                raise ValueError("indexOf requires 1 argument")
-            needle = self.eval_node(args[0])
-            if obj is None:
-                return -1
-            return str(obj).find(str(needle))
-
-        if method_lower == 'substring':
-            if len(args) < 2:
-                raise ValueError("substring requires 2 arguments")
-            start = self.eval_node(args[0])
-            end = self.eval_node(args[1])
-            if obj is None:
-                return ''
-            return str(obj)[start:end]
-
-        if method_lower == 'size':
-            if obj is None:
-                return 0
-            return len(str(obj))
-
-        raise ValueError(f"Unknown method: {method}")
+    return emit(node, True)
+
+
+@lru_cache(maxsize=4096)
+def compile_ocl(expr: str, numeric_attrs: FrozenSet[str] = frozenset()) -> CodeType:
+    """Parse an OCL expression and compile it to a Python code object."""
+    return compile(ocl_to_python(parse_ocl(expr), numeric_attrs), '<ocl>', 'eval')
+
+
+def compile_class_evaluator(ordered_constraints: List[Tuple[str, str]],
+                            numeric_attrs: FrozenSet[str] = frozenset()
+                            ) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+    """Generate one function that evaluates all of a class's derived attributes.
+
+    ordered_constraints are (attr_name, ocl_expr) pairs in dependency order.
+    The function takes an instance's attribute lookup and returns the derived
+    values in the same order. Each value is held in a local, and later
+    expressions read earlier derived attributes from those locals, so one
+    straight-line call replaces a separate eval() per attribute.
+    """
+    bound_names: Dict[str, str] = {}
+    lines = ['def _evaluate_class(_a):']
+    for index, (attr_name, ocl_expr) in enumerate(ordered_constraints):
+        source = ocl_to_python(parse_ocl(ocl_expr), numeric_attrs, bound_names)
+        local_name = f'_v{index}'
+        lines.append(f'    {local_name} = {source}')
+        bound_names[attr_name.lower()] = local_name
+    lines.append(f"    return ({''.join(f'_v{i}, ' for i in range(len(ordered_constraints)))})")
+    namespace: Dict[str, Any] = {}
+    exec(compile('\n'.join(lines), '<ocl-class>', 'exec'), _CODEGEN_GLOBALS, namespace)
+    return namespace['_evaluate_class']
+
+
+def build_attr_lookup(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the case-insensitive attribute lookup for an instance.
+
+    OCL uses camelCase but the model has PascalCase, so keys are lower-cased.
+    """
+    return {key.lower(): value for key, value in values.items()}
+
+
+def eval_compiled(code: CodeType, attr_lookup: Dict[str, Any]) -> Any:
+    """Evaluate an expression compiled by compile_ocl() against an attribute lookup."""
+    return eval(code, _CODEGEN_GLOBALS, {'_a': attr_lookup})
+
 
 
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+_CAMEL_RE1 = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_RE2 = re.compile('([a-z0-9])([A-Z])')
+
+
+@lru_cache(maxsize=None)
 def camel_to_snake(name: str) -> str:
     """Convert CamelCase to snake_case for output compatibility."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    s1 = _CAMEL_RE1.sub(r'\1_\2', name)
+    return _CAMEL_RE2.sub(r'\1_\2', s1).lower()
+
+
+# One match per line: `context ClassName` or `derive AttrName: expression`;
+# anything else (blank lines, comments) does not match and is skipped
+_OCL_LINE_RE = re.compile(r"""
+    \s*(?:
+        context\ \s*(?P<context>.*\S)
+      | derive\ \s*(?P<attr>[^:]*?)\s*:\s*(?P<expr>.*?)
+    )\s*$
+""", re.VERBOSE)
 
 
 def parse_ocl_file(ocl_text: str) -> Dict[str, Dict[str, str]]:
@@ -615,31 +838,20 @@ def parse_ocl_file(ocl_text: str) -> Dict[str, Dict[str, str]]:
     current_class = None
 
     for line in ocl_text.split('\n'):
-        line = line.strip()
-
-        # Skip empty lines and comments
-        if not line or line.startswith('--'):
+        m = _OCL_LINE_RE.match(line)
+        if m is None:
             continue
 
         # Context declaration
-        if line.startswith('context '):
-            current_class = line[8:].strip()
+        if m.group('context') is not None:
+            current_class = m.group('context')
             if current_class not in constraints:
                 constraints[current_class] = {}
             continue
 
         # Derive expression
-        if line.startswith('derive '):
-            if current_class is None:
-                continue
-            # Parse: derive AttrName: expression
-            rest = line[7:].strip()
-            colon_idx = rest.find(':')
-            if colon_idx == -1:
-                continue
-            attr_name = rest[:colon_idx].strip()
-            ocl_expr = rest[colon_idx + 1:].strip()
-            constraints[current_class][attr_name] = ocl_expr
+        if current_class is not None:
+            constraints[current_class][m.group('attr')] = m.group('expr')
 
     return constraints
 
@@ -652,18 +864,24 @@ def topological_sort_constraints(class_constraints: Dict[str, str]) -> List[tupl
     # Build dependency graph
     # For each attribute, find which other derived attributes it references
     attr_names = set(class_constraints.keys())
+    lower_attr_names = {attr.lower(): attr for attr in attr_names}
     dependencies = {}  # attr -> set of attrs it depends on
 
     for attr_name, ocl_expr in class_constraints.items():
         deps = set()
-        # Look for self.attrName patterns in the expression
-        expr_lower = ocl_expr.lower()
-        for other_attr in attr_names:
-            if other_attr == attr_name:
-                continue
-            # Check if this attribute references the other (case-insensitive)
-            if f'self.{other_attr.lower()}' in expr_lower:
-                deps.add(other_attr)
+        # Look for self.attrName token sequences in the expression (case-insensitive)
+        try:
+            tokens = ocl_tokenize(ocl_expr)
+        except SyntaxError:
+            tokens = []  # Unparseable; evaluation will report the error
+        for i in range(len(tokens) - 2):
+            if (tokens[i].type == OCLTokenType.IDENTIFIER
+                    and tokens[i].value.lower() == 'self'
+                    and tokens[i + 1].type == OCLTokenType.DOT
+                    and tokens[i + 2].type == OCLTokenType.IDENTIFIER):
+                other_attr = lower_attr_names.get(tokens[i + 2].value.lower())
+                if other_attr is not None and other_attr != attr_name:
+                    deps.add(other_attr)
         dependencies[attr_name] = deps
 
     # Kahn's algorithm for topological sort
@@ -674,13 +892,13 @@ def topological_sort_constraints(class_constraints: Dict[str, str]) -> List[tupl
                 in_degree[attr] += 1
 
     # Start with nodes that have no dependencies on other derived attrs
+    # Min-heap by name to ensure deterministic order
     queue = [attr for attr, degree in in_degree.items() if degree == 0]
+    heapq.heapify(queue)
     result = []
 
     while queue:
-        # Sort to ensure deterministic order
-        queue.sort()
-        attr = queue.pop(0)
+        attr = heapq.heappop(queue)
         result.append((attr, class_constraints[attr]))
 
         # Remove this node and update in-degrees
@@ -688,7 +906,7 @@ def topological_sort_constraints(class_constraints: Dict[str, str]) -> List[tupl
             if attr in deps:
                 in_degree[other_attr] -= 1
                 if in_degree[other_attr] == 0:
-                    queue.append(other_attr)
+                    heapq.heappush(queue, other_attr)
 
     # If not all attributes are in result, there's a cycle (shouldn't happen)
     if len(result) != len(attr_names):
@@ -698,6 +916,24 @@ def topological_sort_constraints(class_constraints: Dict[str, str]) -> List[tupl
     return result
 
 
+def compile_class_constraints(ordered_constraints: List[Tuple[str, str]],
+                              numeric_attrs: FrozenSet[str] = frozenset()) -> List[tuple]:
+    """
+    Compile a class's derived attributes, given in evaluation order.
+    Returns list of (attr_name, code, compile_error) tuples in the same order;
+    code is None and compile_error is set when the expression fails to
+    compile. numeric_attrs are lookup keys known to hold ints in every
+    instance.
+    """
+    compiled = []
+    for attr_name, ocl_expr in ordered_constraints:
+        try:
+            compiled.append((attr_name, compile_ocl(ocl_expr, numeric_attrs), None))
+        except Exception as e:
+            compiled.append((attr_name, None, e))
+    return compiled
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -738,58 +974,77 @@ def main():
 
     # Evaluate derived values for each instance
     print("\nEvaluating OCL expressions...")
-    print("   (This is where computation happens - in the OCL interpreter)")
+    print("   (This is where computation happens - in the OCL evaluator)")
 
-    results = []
     target_class = "LanguageCandidates"
+    instances = [inst for inst in model["instances"] if inst["class"] == target_class]
 
-    for instance in model["instances"]:
-        if instance["class"] != target_class:
-            continue
-
-        # Start with raw values, converting keys to snake_case
+    # Start with raw values, converting keys to snake_case
+    results = []
+    lookups = []
+    for instance in instances:
         record = {}
         for key, value in instance["values"].items():
             snake_key = camel_to_snake(key)
             record[snake_key] = value
-
-        # Get class constraints
-        class_name = instance["class"]
-        class_constraints = constraints.get(class_name, {})
-
-        # Create interpreter for this instance
+        results.append(record)
         # Note: OCL uses original field names, so we pass original values
-        interpreter = OCLInterpreter(instance["values"])
-
-        # Topologically sort constraints so dependencies are evaluated first
-        sorted_constraints = topological_sort_constraints(class_constraints)
+        lookups.append(build_attr_lookup(instance["values"]))
+
+    # Sort and compile the class's constraints once so dependencies are
+    # evaluated first. Raw attributes that are ints in every instance (and are
+    # not overwritten by a derivation) get native arithmetic in the codegen.
+    class_constraints = constraints.get(target_class, {})
+    numeric_attrs = numeric_attr_keys(lookups, exclude=(name.lower() for name in class_constraints))
+    ordered_constraints = topological_sort_constraints(class_constraints)
+    sorted_constraints = compile_class_constraints(ordered_constraints, numeric_attrs)
+    snake_keys = [camel_to_snake(attr_name) for attr_name, _ in ordered_constraints]
+
+    # When every expression compiles, evaluate all derived attributes of an
+    # instance with one generated function
+    class_evaluator = None
+    if all(compile_error is None for _, _, compile_error in sorted_constraints):
+        class_evaluator = compile_class_evaluator(ordered_constraints, numeric_attrs)
+
+    for record, attr_lookup in zip(results, lookups):
+        if class_evaluator is not None:
+            try:
+                record.update(zip(snake_keys, class_evaluator(attr_lookup)))
+                continue
+            except Exception:
+                # Re-evaluate attribute by attribute so only the failing
+                # attributes get None and a warning
+                pass
 
         # Evaluate each derived attribute in dependency order
-        # Note: Derived attributes may depend on each other, so update the lookup
-        # after each successful evaluation
-        for attr_name, ocl_expr in sorted_constraints:
-            snake_key = camel_to_snake(attr_name)
+        # Note: Derived attributes may depend on each other, so update the
+        # lookup after each successful evaluation
+        for (attr_name, code, compile_error), snake_key in zip(sorted_constraints, snake_keys):
             try:
-                value = interpreter.evaluate(ocl_expr)
+                if compile_error is not None:
+                    raise compile_error
+                value = eval_compiled(code, attr_lookup)
                 record[snake_key] = value
-                # Update interpreter's lookup so subsequent attributes can reference this
-                interpreter.attr_lookup[attr_name.lower()] = value
+                # Update the lookup so subsequent attributes can reference this
+                attr_lookup[attr_name.lower()] = value
             except Exception as e:
                 print(f"   Warning: Error evaluating {attr_name}: {e}")
                 record[snake_key] = None
 
-        # Post-process: convert empty strings to None for family_feud_mismatch
+    # Post-process: convert empty strings to None for family_feud_mismatch
+    for record in results:
         if record.get("family_feud_mismatch") == "":
             record["family_feud_mismatch"] = None
 
-        results.append(record)
-
     print(f"   Evaluated {len(results)} records")
 
     # Save results
     print(f"\nSaving results to: {test_file}")
-    with open(test_file, "w", encoding='utf-8') as f:
-        json.dump(results, f, indent=2)
+    if ORJSON_AVAILABLE:
+        test_file.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open(test_file, "w", encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
 
     print("\n" + "=" * 70)
     print("Test execution complete!")
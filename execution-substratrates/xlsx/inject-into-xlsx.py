@@ -13,31 +13,51 @@ what's defined and generates the corresponding xlsx.
 
 Smart Update Feature:
 To avoid unnecessary file changes caused by volatile functions like NOW(),
-the script exports the LanguageCandidates sheet to CSV before and after
-regeneration. If the content is identical, the update is rolled back.
+the script computes the LanguageCandidates sheet as CSV for the previous and
+the current rulebook before generating anything. If the content is
+identical, the workbook is not regenerated.
+Generation is skipped up front when rulebook.xlsx is newer than the rulebook
+(and this script); pass --force to regenerate regardless.
 """
 
 import sys
 import re
 import os
 import csv
-import shutil
+import json
+import filecmp
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
 # Add project root to path for shared imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from orchestration.shared import load_rulebook, get_candidate_name_from_cwd, handle_clean_arg
+from orchestration.shared import (
+    load_rulebook, get_rulebook_path, get_candidate_name_from_cwd, handle_clean_arg
+)
 
-# Try to import openpyxl, provide helpful error if missing
-try:
-    from openpyxl import Workbook, load_workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-except ImportError:
-    print("Error: openpyxl is required. Install with: pip install openpyxl")
-    sys.exit(1)
+
+def _import_openpyxl():
+    """Import openpyxl on first use, with a helpful error if it is missing.
+
+    openpyxl is not imported at module load, so --clean and the no-change
+    paths don't pay for it.
+    """
+    try:
+        import openpyxl
+    except ImportError:
+        print("Error: openpyxl is required. Install with: pip install openpyxl")
+        sys.exit(1)
+    return openpyxl
+
+
+# Formula patterns, compiled once at module load
+_FIELD_RE = re.compile(r'\{\{(\w+)\}\}')
+_FIELD_ANCHORED_RE = re.compile(r'^\{\{(\w+)\}\}$')
+_EQ_SPLIT_RE = re.compile(r'\s*=\s*')
+_FN_RE = re.compile(r'([A-Za-z]+)\(')
 
 
 def get_table_names(rulebook):
@@ -46,6 +66,16 @@ def get_table_names(rulebook):
     return [key for key in rulebook.keys() if key not in metadata_keys]
 
 
+@lru_cache(maxsize=None)
+def column_letter(col_idx):
+    """Return the letter for a 1-based column index (1 -> A, 27 -> AA)."""
+    letters = ''
+    while col_idx:
+        col_idx, remainder = divmod(col_idx - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
 def build_column_map(schema):
     """Build a mapping of field names to column letters.
 
@@ -53,7 +83,7 @@ def build_column_map(schema):
     """
     column_map = {}
     for idx, field in enumerate(schema):
-        col_letter = get_column_letter(idx + 1)
+        col_letter = column_letter(idx + 1)
         column_map[field['name']] = col_letter
     return column_map
 
@@ -76,8 +106,6 @@ def convert_formula_to_excel(formula, column_map, row_num):
     result = formula
 
     # Find all {{FieldName}} patterns and replace with cell references
-    pattern = r'\{\{(\w+)\}\}'
-
     def replace_field(match):
         field_name = match.group(1)
         if field_name in column_map:
@@ -87,12 +115,282 @@ def convert_formula_to_excel(formula, column_map, row_num):
             # Keep the placeholder if field not found (might be an error in rulebook)
             return match.group(0)
 
-    result = re.sub(pattern, replace_field, result)
+    result = _FIELD_RE.sub(replace_field, result)
     return result
 
 
-def evaluate_formula(formula, row_data):
-    """Evaluate a rulebook formula using row data.
+def build_formula_template(formula, column_map):
+    """Precompute a calculated field's Excel formula for every row.
+
+    Field references are resolved to column letters once, leaving a
+    str.format template with a {row} placeholder, so that
+    build_formula_template(f, m).format(row=n) equals
+    convert_formula_to_excel(f, m, n).
+    """
+    # Splitting on the capturing pattern alternates text and field names
+    pieces = _FIELD_RE.split(formula)
+    for i, piece in enumerate(pieces):
+        if i % 2 and piece in column_map:
+            pieces[i] = f'${column_map[piece]}{{row}}'
+        else:
+            if i % 2:
+                # Keep the placeholder if field not found (might be an error in rulebook)
+                piece = '{{' + piece + '}}'
+            pieces[i] = piece.replace('{', '{{').replace('}', '}}')
+    return ''.join(pieces)
+
+
+def _extract_parens(s):
+    """Extract content inside parentheses."""
+    s = s.strip()
+    if not s.startswith('('):
+        return s
+    depth = 0
+    for i, c in enumerate(s):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return s[1:i]
+    return s[1:-1] if s.endswith(')') else s
+
+
+@lru_cache(maxsize=None)
+def _separator_re(op):
+    """Pattern matching the only characters that affect splitting on op."""
+    return re.compile(r'["()]|' + re.escape(op))
+
+
+def _split_by_operator(expr, op):
+    """Split by operator, respecting parentheses and quotes.
+
+    Jumps between quotes, parentheses and occurrences of op in a single
+    regex scan and slices the parts out, rather than copying the
+    expression one character at a time.
+    """
+    parts = []
+    start = 0
+    depth = 0
+    in_string = False
+    for match in _separator_re(op).finditer(expr):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth == 0:
+            parts.append(expr[start:match.start()])
+            start = match.end()
+    if start < len(expr):
+        parts.append(expr[start:])
+    return parts
+
+
+def _split_args(s):
+    """Split comma-separated arguments, respecting parens and quotes."""
+    return _split_by_operator(s, ',')
+
+
+# Formula bytecode: a flat list of (opcode, arg) instructions with stack
+# semantics, translated to Python by _bytecode_to_source(). Jump args are
+# instruction indices.
+OP_LOAD_CONST = 0       # push arg
+OP_LOAD_FIELD = 1       # push row_data.get(arg)
+OP_CONCAT = 2           # pop arg values, push their non-None concatenation (or None)
+OP_NOT = 3              # pop v, push not v (None stays None)
+OP_EQ = 4               # pop right, left; push left == right
+OP_AND_TEST = 5         # pop v; if falsy push False and jump to arg
+OP_JUMP_IF_FALSE = 6    # pop v; if falsy jump to arg
+OP_JUMP = 7             # jump to arg
+
+
+def _emit_and(call, code):
+    """Emit AND(...) given the text from its opening parenthesis."""
+    tests = []
+    for arg in _split_args(_extract_parens(call)):
+        _emit_expr(arg, code)
+        tests.append(len(code))
+        code.append((OP_AND_TEST, None))
+    code.append((OP_LOAD_CONST, True))
+    # Any falsy argument short-circuits past the remaining arguments
+    for index in tests:
+        code[index] = (OP_AND_TEST, len(code))
+
+
+def _emit_not(call, code):
+    """Emit NOT(...) given the text from its opening parenthesis."""
+    _emit_expr(_extract_parens(call), code)
+    code.append((OP_NOT, None))
+
+
+def _emit_if(call, code):
+    """Emit IF(...) given the text from its opening parenthesis."""
+    args = _split_args(_extract_parens(call))
+    if len(args) < 2:
+        code.append((OP_LOAD_CONST, None))
+        return
+    _emit_expr(args[0], code)
+    jump_to_else = len(code)
+    code.append((OP_JUMP_IF_FALSE, None))
+    _emit_expr(args[1], code)
+    jump_to_end = len(code)
+    code.append((OP_JUMP, None))
+    code[jump_to_else] = (OP_JUMP_IF_FALSE, len(code))
+    if len(args) > 2:
+        _emit_expr(args[2], code)
+    else:
+        code.append((OP_LOAD_CONST, None))
+    code[jump_to_end] = (OP_JUMP, len(code))
+
+
+# Upper-cased function name -> emitter for the call
+_FUNCTION_EMITTERS = {
+    'AND': _emit_and,
+    'NOT': _emit_not,
+    'IF': _emit_if,
+}
+
+
+def _emit_expr(expr, code):
+    """Recursively compile an expression, appending its bytecode to code.
+
+    All parsing decisions depend only on the expression text, so they are
+    made here once; the bytecode only reads field values.
+    """
+    expr = expr.strip()
+
+    # Handle string concatenation (only if & is at top level)
+    parts = _split_by_operator(expr, ' & ')
+    if len(parts) > 1:
+        for p in parts:
+            _emit_expr(p, code)
+        code.append((OP_CONCAT, len(parts)))
+        return
+
+    # Handle string literals
+    if expr.startswith('"') and expr.endswith('"'):
+        code.append((OP_LOAD_CONST, expr[1:-1]))
+        return
+
+    # Handle TRUE/FALSE
+    upper = expr.upper()
+    if upper in ('TRUE', 'TRUE()'):
+        code.append((OP_LOAD_CONST, True))
+        return
+    if upper in ('FALSE', 'FALSE()'):
+        code.append((OP_LOAD_CONST, False))
+        return
+
+    # Handle field references {{FieldName}}
+    field_match = _FIELD_ANCHORED_RE.match(expr)
+    if field_match:
+        code.append((OP_LOAD_FIELD, field_match.group(1)))
+        return
+
+    # Handle numeric literals
+    try:
+        code.append((OP_LOAD_CONST, float(expr) if '.' in expr else int(expr)))
+        return
+    except ValueError:
+        pass
+
+    # Handle AND(...), NOT(...) and IF(...)
+    fn_match = _FN_RE.match(expr)
+    if fn_match:
+        emit_call = _FUNCTION_EMITTERS.get(fn_match.group(1).upper())
+        if emit_call is not None:
+            emit_call(expr[fn_match.end() - 1:], code)
+            return
+
+    # Handle equality: {{Field}} = value or value = value
+    if ' = ' in expr or '=' in expr:
+        # Split by = but be careful of ==
+        parts = _EQ_SPLIT_RE.split(expr, maxsplit=1)
+        if len(parts) == 2:
+            _emit_expr(parts[0], code)
+            _emit_expr(parts[1], code)
+            code.append((OP_EQ, None))
+            return
+
+    code.append((OP_LOAD_CONST, None))
+
+
+def _formula_not(val):
+    return not val if val is not None else None
+
+
+def _formula_concat(values):
+    result = ''.join(str(val) for val in values if val is not None)
+    return result if result else None
+
+
+# Names available to generated formula functions
+_FORMULA_GLOBALS = {
+    '__builtins__': {'bool': bool},
+    '_formula_not': _formula_not,
+    '_formula_concat': _formula_concat,
+}
+
+
+def _bytecode_to_source(code, start, end):
+    """Translate the bytecode in code[start:end] into one Python expression.
+
+    Runs the instructions symbolically, keeping source text on the stack.
+    Jumps only come from the structured AND/IF emitters, so each one maps
+    back to a Python `and` chain or conditional expression.
+    """
+    stack = []
+    pc = start
+    while pc < end:
+        op, arg = code[pc]
+        if op == OP_LOAD_CONST:
+            stack.append(repr(arg))
+        elif op == OP_LOAD_FIELD:
+            stack.append(f'_get({arg!r})')
+        elif op == OP_NOT:
+            stack.append(f'_formula_not({stack.pop()})')
+        elif op == OP_EQ:
+            right = stack.pop()
+            stack.append(f'({stack.pop()} == {right})')
+        elif op == OP_CONCAT:
+            values = ', '.join(stack[-arg:])
+            del stack[-arg:]
+            stack.append(f'_formula_concat(({values},))')
+        elif op == OP_AND_TEST:
+            # Arguments after the first run up to the next test with the same
+            # target; the final LOAD_CONST True sits just before the target
+            args = [stack.pop()]
+            arg_start = pc + 1
+            while arg_start < arg - 1:
+                arg_end = code.index((OP_AND_TEST, arg), arg_start)
+                args.append(_bytecode_to_source(code, arg_start, arg_end))
+                arg_start = arg_end + 1
+            stack.append('(' + ' and '.join(f'bool({a})' for a in args) + ')')
+            pc = arg
+            continue
+        elif op == OP_JUMP_IF_FALSE:
+            # Layout: cond, JUMP_IF_FALSE else, <then>, JUMP end, <else>
+            condition = stack.pop()
+            if_end = code[arg - 1][1]
+            then_src = _bytecode_to_source(code, pc + 1, arg - 1)
+            else_src = _bytecode_to_source(code, arg, if_end)
+            stack.append(f'({then_src} if {condition} else {else_src})')
+            pc = if_end
+            continue
+        else:
+            raise ValueError(f"Unexpected opcode {op} at {pc}")
+        pc += 1
+    return stack[-1]
+
+
+@lru_cache(maxsize=None)
+def compile_formula_code(formula):
+    """Compile a rulebook formula to bytecode.
 
     Handles these formula patterns:
     - String concatenation: ="Is " & {{Name}} & " a language?"
@@ -103,145 +401,53 @@ def evaluate_formula(formula, row_data):
 
     Args:
         formula: The formula string from the rulebook
-        row_data: Dict of field values for the current row
 
     Returns:
-        The computed value
+        Tuple of (opcode, arg) instructions
     """
     if not formula.startswith('='):
-        return formula
-
-    def get_field(name):
-        """Get field value from row_data."""
-        return row_data.get(name)
-
-    def eval_expr(expr):
-        """Recursively evaluate an expression."""
-        expr = expr.strip()
-
-        # Handle string concatenation (only if & is at top level)
-        parts = split_by_operator(expr, ' & ')
-        if len(parts) > 1:
-            result = ''
-            for p in parts:
-                val = eval_expr(p)
-                if val is not None:
-                    result += str(val)
-            return result if result else None
-
-        # Handle string literals
-        if expr.startswith('"') and expr.endswith('"'):
-            return expr[1:-1]
-
-        # Handle TRUE/FALSE
-        if expr.upper() in ('TRUE', 'TRUE()'):
-            return True
-        if expr.upper() in ('FALSE', 'FALSE()'):
-            return False
+        return ((OP_LOAD_CONST, formula),)
+    code = []
+    _emit_expr(formula[1:], code)
+    return tuple(code)
 
-        # Handle field references {{FieldName}}
-        field_match = re.match(r'^\{\{(\w+)\}\}$', expr)
-        if field_match:
-            return get_field(field_match.group(1))
-
-        # Handle numeric literals
-        try:
-            if '.' in expr:
-                return float(expr)
-            return int(expr)
-        except ValueError:
-            pass
-
-        # Handle AND(...)
-        if expr.upper().startswith('AND('):
-            inner = extract_parens(expr[3:])
-            args = split_args(inner)
-            for arg in args:
-                val = eval_expr(arg)
-                if not val:
-                    return False
-            return True
-
-        # Handle NOT(...)
-        if expr.upper().startswith('NOT('):
-            inner = extract_parens(expr[3:])
-            val = eval_expr(inner)
-            return not val if val is not None else None
-
-        # Handle IF(...)
-        if expr.upper().startswith('IF('):
-            inner = extract_parens(expr[2:])
-            args = split_args(inner)
-            if len(args) < 2:
-                return None
-            condition = eval_expr(args[0])
-            true_val = eval_expr(args[1]) if len(args) > 1 else None
-            false_val = eval_expr(args[2]) if len(args) > 2 else None
-            return true_val if condition else false_val
-
-        # Handle equality: {{Field}} = value or value = value
-        if ' = ' in expr or '=' in expr:
-            # Split by = but be careful of ==
-            parts = re.split(r'\s*=\s*', expr, maxsplit=1)
-            if len(parts) == 2:
-                left = eval_expr(parts[0])
-                right = eval_expr(parts[1])
-                return left == right
 
-        return None
+@lru_cache(maxsize=None)
+def compile_formula(formula):
+    """Compile a rulebook formula into a function of the row data.
 
-    def extract_parens(s):
-        """Extract content inside parentheses."""
-        s = s.strip()
-        if not s.startswith('('):
-            return s
-        depth = 0
-        for i, c in enumerate(s):
-            if c == '(':
-                depth += 1
-            elif c == ')':
-                depth -= 1
-                if depth == 0:
-                    return s[1:i]
-        return s[1:-1] if s.endswith(')') else s
-
-    def split_by_operator(expr, op):
-        """Split by operator, respecting parentheses and quotes."""
-        parts = []
-        current = ''
-        depth = 0
-        in_string = False
-        i = 0
-        while i < len(expr):
-            c = expr[i]
-            if c == '"':
-                in_string = not in_string
-                current += c
-            elif not in_string:
-                if c == '(':
-                    depth += 1
-                    current += c
-                elif c == ')':
-                    depth -= 1
-                    current += c
-                elif depth == 0 and expr[i:i+len(op)] == op:
-                    parts.append(current)
-                    current = ''
-                    i += len(op) - 1
-                else:
-                    current += c
-            else:
-                current += c
-            i += 1
-        if current:
-            parts.append(current)
-        return parts
+    The formula's bytecode is translated to the source of a single Python
+    function and exec'd once (cached by formula string), so evaluating a
+    row runs straight-line CPython code rather than an interpreter loop.
 
-    def split_args(s):
-        """Split comma-separated arguments, respecting parens and quotes."""
-        return split_by_operator(s, ',')
+    Args:
+        formula: The formula string from the rulebook
+
+    Returns:
+        A callable taking a dict of field values and returning the computed value
+    """
+    code = compile_formula_code(formula)
+    source = (
+        'def _formula(row_data):\n'
+        '    _get = row_data.get\n'
+        f'    return {_bytecode_to_source(code, 0, len(code))}\n'
+    )
+    namespace = {}
+    exec(source, _FORMULA_GLOBALS, namespace)
+    return namespace['_formula']
 
-    return eval_expr(formula[1:])
+
+def evaluate_formula(formula, row_data):
+    """Evaluate a rulebook formula using row data.
+
+    Args:
+        formula: The formula string from the rulebook
+        row_data: Dict of field values for the current row
+
+    Returns:
+        The computed value
+    """
+    return compile_formula(formula)(row_data)
 
 
 def get_value_for_cell(field_schema, row_data, column_map, row_num):
@@ -279,83 +485,183 @@ def get_value_for_cell(field_schema, row_data, column_map, row_num):
             return value
 
 
+@lru_cache(maxsize=None)
+def _cell_styles():
+    """Build the cell styles once, on first use, and share them by every cell.
+
+    openpyxl style objects are immutable, so assigning the same instance to
+    many cells is safe.
+    """
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    thin = Side(style='thin')
+    return {
+        'border': Border(left=thin, right=thin, top=thin, bottom=thin),
+        'header_font': Font(bold=True, color='FFFFFF'),
+        'header_fill': PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid'),
+        'header_alignment': Alignment(horizontal='center', vertical='center'),
+        # Light blue background for calculated fields
+        'calculated_fill': PatternFill(start_color='DDEBF7', end_color='DDEBF7', fill_type='solid'),
+    }
+
+
 def apply_header_style(cell):
     """Apply styling to header cells."""
-    cell.font = Font(bold=True, color='FFFFFF')
-    cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    cell.alignment = Alignment(horizontal='center', vertical='center')
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    cell.border = thin_border
+    styles = _cell_styles()
+    cell.font = styles['header_font']
+    cell.fill = styles['header_fill']
+    cell.alignment = styles['header_alignment']
+    cell.border = styles['border']
 
 
-def apply_data_style(cell, is_calculated=False):
-    """Apply styling to data cells."""
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    cell.border = thin_border
+# Named styles for data cells; see ensure_data_styles()
+DATA_STYLE_NAME = 'ERB Data'
+CALCULATED_STYLE_NAME = 'ERB Calculated'
 
-    if is_calculated:
-        # Light blue background for calculated fields
-        cell.fill = PatternFill(start_color='DDEBF7', end_color='DDEBF7', fill_type='solid')
 
+def ensure_data_styles(workbook):
+    """Register the data-cell named styles on the workbook, once."""
+    from openpyxl.styles import NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    if DATA_STYLE_NAME in workbook.named_styles:
+        return
+    styles = _cell_styles()
+    workbook.add_named_style(NamedStyle(name=DATA_STYLE_NAME, font=DEFAULT_FONT, border=styles['border']))
+    # Light blue background for calculated fields
+    workbook.add_named_style(NamedStyle(
+        name=CALCULATED_STYLE_NAME, font=DEFAULT_FONT, border=styles['border'], fill=styles['calculated_fill'],
+    ))
 
-def create_worksheet_from_table(workbook, table_name, table_data):
-    """Create a worksheet from a rulebook table definition.
+
+# Raw string cell values shorter than this are interned
+_INTERN_MAX_LEN = 64
+
+
+def build_sheet_payload(table_name, table_data):
+    """Compute a worksheet's contents as plain, picklable data.
+
+    This is the openpyxl-free half of worksheet creation, so it can run in a
+    worker process; write_sheet_payload() turns the result into a worksheet.
 
     Args:
-        workbook: The openpyxl Workbook
         table_name: Name of the table (used as sheet name)
         table_data: Dict with 'schema', 'data', and optionally 'Description'
 
     Returns:
-        The created worksheet
+        Dict with 'title', 'header', 'widths', 'calculated' (per-column flags)
+        and 'rows' (cell values, with Excel formulas for calculated fields)
     """
-    ws = workbook.create_sheet(title=table_name[:31])  # Excel limits sheet names to 31 chars
-
     schema = table_data.get('schema', [])
     data = table_data.get('data', [])
 
+    payload = {
+        'title': table_name[:31],  # Excel limits sheet names to 31 chars
+        'header': [field['name'] for field in schema],
+        # Column width based on header length (minimum 12 chars)
+        'widths': [max(len(field['name']) + 2, 12) for field in schema],
+        'calculated': [field.get('type') == 'calculated' for field in schema],
+        'rows': [],
+    }
+
     if not schema:
-        return ws
+        return payload
 
     # Build column map for formula conversion
     column_map = build_column_map(schema)
 
-    # Create a map of field names to their type (raw vs calculated)
-    field_types = {f['name']: f.get('type', 'raw') for f in schema}
+    # Resolve column letters in each calculated field's formula once; only
+    # the row number changes from row to row
+    formula_templates = [
+        build_formula_template(field['formula'], column_map)
+        if field.get('type', 'raw') == 'calculated' and 'formula' in field else None
+        for field in schema
+    ]
 
-    # Write header row
-    for col_idx, field in enumerate(schema, 1):
-        cell = ws.cell(row=1, column=col_idx, value=field['name'])
-        apply_header_style(cell)
+    for row_idx, row_data in enumerate(data, 2):  # Start at row 2 (after header)
+        row = []
+        for field, template in zip(schema, formula_templates):
+            if template is not None:
+                row.append(template.format(row=row_idx))
+            else:
+                value = get_value_for_cell(field, row_data, column_map, row_idx)
+                # Repeated short strings (categories, flags) share one object
+                if isinstance(value, str) and len(value) < _INTERN_MAX_LEN:
+                    value = sys.intern(value)
+                row.append(value)
+        payload['rows'].append(row)
 
-        # Set column width based on header length (minimum 12 chars)
-        ws.column_dimensions[get_column_letter(col_idx)].width = max(len(field['name']) + 2, 12)
+    return payload
 
-    # Write data rows
-    for row_idx, row_data in enumerate(data, 2):  # Start at row 2 (after header)
-        for col_idx, field in enumerate(schema, 1):
-            value = get_value_for_cell(field, row_data, column_map, row_idx)
-            cell = ws.cell(row=row_idx, column=col_idx, value=value)
 
-            is_calculated = field.get('type') == 'calculated'
-            apply_data_style(cell, is_calculated)
+def write_sheet_payload(workbook, payload):
+    """Create a worksheet from a payload built by build_sheet_payload().
+
+    The workbook is in write-only mode, so rows are streamed in order with
+    ws.append() and sheet-level settings are applied before the first row.
+
+    Args:
+        workbook: The openpyxl Workbook (write_only=True)
+        payload: Dict returned by build_sheet_payload()
+
+    Returns:
+        The created worksheet
+    """
+    from openpyxl.cell import WriteOnlyCell
+
+    ws = workbook.create_sheet(title=payload['title'])
+
+    if not payload['header']:
+        return ws
+
+    for col_idx, width in enumerate(payload['widths'], 1):
+        ws.column_dimensions[column_letter(col_idx)].width = width
 
     # Freeze the header row
     ws.freeze_panes = 'A2'
 
+    # Write header row
+    header = []
+    for name in payload['header']:
+        cell = WriteOnlyCell(ws, value=name)
+        apply_header_style(cell)
+        header.append(cell)
+    ws.append(header)
+
+    # Data cells reference a named style registered once per workbook,
+    # instead of being given border/fill objects cell by cell
+    ensure_data_styles(workbook)
+    column_styles = [
+        CALCULATED_STYLE_NAME if is_calculated else DATA_STYLE_NAME
+        for is_calculated in payload['calculated']
+    ]
+
+    # Write data rows
+    for values in payload['rows']:
+        row = []
+        for value, style in zip(values, column_styles):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            row.append(cell)
+        ws.append(row)
+
     return ws
 
 
+def create_worksheet_from_table(workbook, table_name, table_data):
+    """Create a worksheet from a rulebook table definition.
+
+    Args:
+        workbook: The openpyxl Workbook (write_only=True)
+        table_name: Name of the table (used as sheet name)
+        table_data: Dict with 'schema', 'data', and optionally 'Description'
+
+    Returns:
+        The created worksheet
+    """
+    return write_sheet_payload(workbook, build_sheet_payload(table_name, table_data))
+
+
 def export_sheet_to_csv(xlsx_path, sheet_name, csv_path):
     """Export a specific sheet from an xlsx file to CSV.
     
@@ -375,7 +681,9 @@ def export_sheet_to_csv(xlsx_path, sheet_name, csv_path):
         return False
     
     try:
-        wb = load_workbook(xlsx_path, data_only=True)  # data_only=True reads computed values
+        # data_only=True reads computed values; read_only=True streams just the
+        # sheet that is iterated instead of loading the whole workbook
+        wb = _import_openpyxl().load_workbook(xlsx_path, data_only=True, read_only=True)
         
         # Find the sheet (case-insensitive matching)
         matching_sheet = None
@@ -393,9 +701,11 @@ def export_sheet_to_csv(xlsx_path, sheet_name, csv_path):
         
         with open(csv_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            for row in ws.iter_rows(values_only=True):
-                # Convert all values to strings, handling None
-                writer.writerow(['' if v is None else str(v) for v in row])
+            # Convert all values to strings, handling None
+            writer.writerows(
+                ['' if v is None else str(v) for v in row]
+                for row in ws.iter_rows(values_only=True)
+            )
         
         wb.close()
         return True
@@ -422,11 +732,12 @@ def compare_csv_files(csv1_path, csv2_path):
         return False
     
     try:
-        with open(csv1_path, 'r', encoding='utf-8') as f1:
-            content1 = f1.read()
-        with open(csv2_path, 'r', encoding='utf-8') as f2:
-            content2 = f2.read()
-        return content1 == content2
+        # Files of different sizes cannot match; skip reading them at all
+        if csv1_path.stat().st_size != csv2_path.stat().st_size:
+            return False
+        # Buffered byte comparison that stops at the first difference
+        # instead of reading both files into memory
+        return filecmp.cmp(csv1_path, csv2_path, shallow=False)
     except Exception as e:
         print(f"  Error comparing files: {e}")
         return False
@@ -439,6 +750,29 @@ def cleanup_file(path):
         path.unlink()
 
 
+def load_rulebook_snapshot(snapshot_path):
+    """Load the rulebook snapshot saved by the previous generation.
+
+    Returns:
+        The snapshot rulebook dict, or None if there is no readable snapshot
+    """
+    snapshot_path = Path(snapshot_path)
+    if not snapshot_path.exists():
+        return None
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"  Warning: Could not read rulebook snapshot: {e}")
+        return None
+
+
+def save_rulebook_snapshot(rulebook, snapshot_path):
+    """Save the rulebook the current xlsx was generated from."""
+    with open(snapshot_path, 'w', encoding='utf-8') as f:
+        json.dump(rulebook, f)
+
+
 def compute_table_values_to_csv(rulebook, table_name, csv_path):
     """Compute values from rulebook and write to CSV.
 
@@ -482,29 +816,23 @@ def compute_table_values_to_csv(rulebook, table_name, csv_path):
             header = [field['name'] for field in schema]
             writer.writerow(header)
 
+            # Compute column by column (structure of arrays): each calculated
+            # field's formula is compiled once and mapped over every row, then
+            # the string columns are transposed back into CSV rows
+            columns = []
+            for field in schema:
+                field_name = field['name']
+                if field.get('type', 'raw') == 'calculated' and 'formula' in field:
+                    # Compute the value using the compiled formula
+                    values = map(compile_formula(field['formula']), data)
+                else:
+                    # Raw field - use the data value
+                    values = (row_data.get(field_name) for row_data in data)
+                # Convert to string for CSV
+                columns.append(['' if value is None else str(value) for value in values])
+
             # Write data rows with computed values
-            for row_data in data:
-                row = []
-                for field in schema:
-                    field_name = field['name']
-                    field_type = field.get('type', 'raw')
-
-                    if field_type == 'calculated' and 'formula' in field:
-                        # Compute the value using Python formula evaluation
-                        value = evaluate_formula(field['formula'], row_data)
-                    else:
-                        # Raw field - use the data value
-                        value = row_data.get(field_name)
-
-                    # Convert to string for CSV
-                    if value is None:
-                        row.append('')
-                    elif isinstance(value, bool):
-                        row.append(str(value))
-                    else:
-                        row.append(str(value))
-
-                writer.writerow(row)
+            writer.writerows(zip(*columns) if columns else ([] for _ in data))
 
         return True
 
@@ -513,8 +841,16 @@ def compute_table_values_to_csv(rulebook, table_name, csv_path):
         return False
 
 
+# Building sheet payloads in worker processes only pays off once there are
+# enough tables to outweigh the cost of starting the pool
+_PARALLEL_MIN_TABLES = 4
+
+
 def generate_workbook(rulebook, table_names):
     """Generate the workbook from the rulebook.
+
+    Sheet contents are built independently per table (in parallel processes
+    for larger rulebooks) and then written to the workbook in table order.
     
     Args:
         rulebook: The loaded rulebook dict
@@ -523,9 +859,9 @@ def generate_workbook(rulebook, table_names):
     Returns:
         The generated Workbook object
     """
-    wb = Workbook()
-    default_sheet = wb.active
+    wb = _import_openpyxl().Workbook(write_only=True)
 
+    tables = []
     for table_name in table_names:
         table_data = rulebook[table_name]
 
@@ -543,10 +879,24 @@ def generate_workbook(rulebook, table_names):
         print(f"    - {len(schema)} columns ({raw_count} raw, {calc_count} calculated)")
         print(f"    - {len(data)} data rows")
 
-        create_worksheet_from_table(wb, table_name, table_data)
+        tables.append((table_name, table_data))
+
+    names = [name for name, _ in tables]
+    datas = [data for _, data in tables]
+    if len(tables) >= _PARALLEL_MIN_TABLES:
+        # openpyxl objects are built on this process only; workers return plain data
+        with ProcessPoolExecutor() as pool:
+            payloads = list(pool.map(build_sheet_payload, names, datas))
+    else:
+        payloads = [build_sheet_payload(name, data) for name, data in tables]
+
+    for payload in payloads:
+        write_sheet_payload(wb, payload)
 
-    if len(wb.sheetnames) > 1:
-        wb.remove(default_sheet)
+    # A write-only workbook starts without the default sheet; keep one so an
+    # empty rulebook still saves as a valid workbook
+    if not wb.sheetnames:
+        wb.create_sheet(title='Sheet')
 
     return wb
 
@@ -555,6 +905,7 @@ def main():
     # Define generated files for this substrate
     GENERATED_FILES = [
         'rulebook.xlsx',
+        '.rulebook.last.snapshot.json',
         'test-answers.json',
         'test-results.md',
     ]
@@ -568,10 +919,23 @@ def main():
 
     # Define paths
     output_path = Path('rulebook.xlsx')
-    backup_path = Path('rulebook.xlsx.backup')
+    new_path = Path('rulebook.xlsx.new')
     csv_before_path = Path('.language_candidates_before.csv')
     csv_after_path = Path('.language_candidates_after.csv')
+    snapshot_path = Path('.rulebook.last.snapshot.json')
     comparison_sheet = 'LanguageCandidates'  # Sheet to compare for content changes
+    force = '--force' in sys.argv
+
+    # Skip generation entirely when the xlsx is newer than both the rulebook
+    # and this generator (pass --force to regenerate anyway)
+    if not force and output_path.exists():
+        rulebook_path = get_rulebook_path()
+        if rulebook_path.exists():
+            source_mtime = max(rulebook_path.stat().st_mtime, Path(__file__).stat().st_mtime)
+            if source_mtime <= output_path.stat().st_mtime:
+                print(f"Rulebook unchanged since last generation - keeping {output_path}")
+                print("  (use --force to regenerate)")
+                return
 
     # Load the rulebook
     try:
@@ -595,69 +959,66 @@ def main():
     has_existing_xlsx = output_path.exists()
     baseline_exported = False
     
-    if has_existing_xlsx:
-        print(f"Step 1: Exporting '{comparison_sheet}' from existing xlsx to CSV...")
-        baseline_exported = export_sheet_to_csv(output_path, comparison_sheet, csv_before_path)
+    if force:
+        print(f"  --force given - regenerating without comparing content")
+    elif has_existing_xlsx:
+        # Recomputing the baseline from the rulebook the xlsx was generated
+        # from avoids parsing the whole workbook; fall back to reading the
+        # xlsx when there is no snapshot yet
+        previous_rulebook = load_rulebook_snapshot(snapshot_path)
+        if previous_rulebook is not None:
+            print(f"Step 1: Computing baseline '{comparison_sheet}' from rulebook snapshot...")
+            baseline_exported = compute_table_values_to_csv(previous_rulebook, comparison_sheet, csv_before_path)
+        else:
+            print(f"Step 1: Exporting '{comparison_sheet}' from existing xlsx to CSV...")
+            baseline_exported = export_sheet_to_csv(output_path, comparison_sheet, csv_before_path)
         
         if baseline_exported:
             print(f"  Exported baseline to: {csv_before_path}")
-            
-            # Step 2: Rename current xlsx to backup
-            print(f"Step 2: Creating backup of existing xlsx...")
-            shutil.move(str(output_path), str(backup_path))
-            print(f"  Backed up to: {backup_path}")
         else:
             print(f"  Skipping smart update (could not export baseline)")
     else:
         print(f"  No existing xlsx found - this is a fresh generation")
 
-    # Step 3: Generate the new workbook
-    print(f"\nStep 3: Generating new xlsx...")
-    wb = generate_workbook(rulebook, table_names)
-
-    # Save the new workbook
-    wb.save(output_path)
-    print(f"\nGenerated: {output_path}")
-    print(f"  - {len(wb.sheetnames)} worksheets")
-
-    # Step 4-6: Compare and decide whether to keep or rollback
-    if baseline_exported and backup_path.exists():
-        print(f"\nStep 4: Computing values for '{comparison_sheet}' to CSV...")
-        # Use Python formula evaluation since the new xlsx doesn't have cached computed values yet
+    # Step 2-3: Compare the comparison sheet's computed values before building
+    # any worksheet, so an unchanged rulebook never pays for the full workbook
+    if baseline_exported:
+        print(f"\nStep 2: Computing values for '{comparison_sheet}' to CSV...")
+        # Use Python formula evaluation; this is what the new xlsx would contain
         after_exported = compute_table_values_to_csv(rulebook, comparison_sheet, csv_after_path)
 
         if after_exported:
             print(f"  Computed values to: {csv_after_path}")
-            
-            # Step 5: Compare the CSVs
-            print(f"\nStep 5: Comparing content...")
+
+            print(f"\nStep 3: Comparing content...")
             content_changed = not compare_csv_files(csv_before_path, csv_after_path)
-            
-            if content_changed:
-                # Content actually changed - keep the new file
-                print(f"  CONTENT CHANGED - keeping new xlsx")
-                print(f"\nStep 6: Cleaning up (keeping new file)...")
-                cleanup_file(backup_path)
-                cleanup_file(csv_before_path)
-                cleanup_file(csv_after_path)
-                print(f"  Removed backup and temp CSV files")
-            else:
-                # Content is the same - rollback to avoid unnecessary file change
-                print(f"  NO CONTENT CHANGE - rolling back to preserve original file")
-                print(f"\nStep 6: Rolling back...")
-                cleanup_file(output_path)
-                shutil.move(str(backup_path), str(output_path))
-                cleanup_file(csv_before_path)
-                cleanup_file(csv_after_path)
-                print(f"  Restored original xlsx, removed temp files")
+            cleanup_file(csv_before_path)
+            cleanup_file(csv_after_path)
+
+            if not content_changed:
+                # Content is the same - skip generation to avoid an unnecessary change
+                print(f"  NO CONTENT CHANGE - keeping original xlsx, removed temp CSV files")
+                save_rulebook_snapshot(rulebook, snapshot_path)
                 print(f"\n*** XLSX NOT UPDATED (content unchanged) ***")
-                return  # Exit early since we rolled back
+                return  # Exit early since the original was kept
+
+            print(f"  CONTENT CHANGED - generating new xlsx")
         else:
-            # Couldn't export after - just keep the new file and clean up
-            print(f"  Warning: Could not export new xlsx for comparison - keeping new file")
-            cleanup_file(backup_path)
+            print(f"  Warning: Could not compute values for comparison - generating new xlsx")
             cleanup_file(csv_before_path)
 
+    # Step 4: Generate the new workbook. It is written beside the original,
+    # which is then atomically replaced so it is never left half-written.
+    print(f"\nStep 4: Generating new xlsx...")
+    wb = generate_workbook(rulebook, table_names)
+
+    wb.save(new_path)
+    os.replace(new_path, output_path)
+    print(f"\nGenerated: {output_path}")
+    print(f"  - {len(wb.sheetnames)} worksheets")
+
+    save_rulebook_snapshot(rulebook, snapshot_path)
+
     print(f"\nDone generating {candidate_name}.")
 
 
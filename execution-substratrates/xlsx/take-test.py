@@ -12,6 +12,7 @@ since newly generated xlsx files don't have cached computed values.
 import json
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 try:
@@ -20,194 +21,310 @@ except ImportError:
     print("Error: openpyxl is required. Install with: pip install openpyxl")
     sys.exit(1)
 
+# Try to import orjson for faster result serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path for shared imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+# Formula patterns, compiled once at module load
+_CELL_REF_RE = re.compile(r'^\$?([A-Z]+)\d+$')
+_CMP_RE = re.compile(r'\s*(>=|<=|>|<)\s*')
+_EQ_SPLIT_RE = re.compile(r'\s*=\s*')
+# Row number ending a cell reference ($H2, AB12): digits after a letter that
+# itself follows a letter, '$' or separator, so exponents (1.5E10) never match
+_ROW_NUMBER_RE = re.compile(r'(?<=[\s(),&=<>$A-Z][A-Z])\d+(?![^\s(),&=<>])')
+
+_CMP_OPS = {
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+}
+
+# to_snake_case() word boundaries
+_SNAKE_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_SNAKE_CAMEL_RE = re.compile('([a-z0-9])([A-Z])')
+
 
 def to_snake_case(name):
     """Convert PascalCase or camelCase to snake_case."""
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    s1 = _SNAKE_WORD_RE.sub(r'\1_\2', name)
+    return _SNAKE_CAMEL_RE.sub(r'\1_\2', s1).lower()
+
+
+def _extract_parens(s):
+    """Extract content inside parentheses."""
+    s = s.strip()
+    if not s.startswith('('):
+        return s
+    depth = 0
+    for i, c in enumerate(s):
+        if c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+            if depth == 0:
+                return s[1:i]
+    return s[1:-1] if s.endswith(')') else s
+
+
+@lru_cache(maxsize=None)
+def _separator_re(op):
+    """Pattern matching the only characters that affect splitting on op."""
+    return re.compile(r'["()]|' + re.escape(op))
+
+
+def _split_by_operator(expr, op):
+    """Split by operator, respecting parentheses and quotes.
+
+    Jumps between quotes, parentheses and occurrences of op in a single
+    regex scan and slices the parts out, rather than copying the
+    expression one character at a time.
+    """
+    parts = []
+    start = 0
+    depth = 0
+    in_string = False
+    for match in _separator_re(op).finditer(expr):
+        token = match.group()
+        if token == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth == 0:
+            parts.append(expr[start:match.start()])
+            start = match.end()
+    if start < len(expr):
+        parts.append(expr[start:])
+    return parts
 
 
-def evaluate_excel_formula_recursive(formula, cell_data, col_to_header, get_cell_value_fn):
-    """Evaluate an Excel formula with recursive formula resolution.
+def _split_args(s):
+    """Split comma-separated arguments."""
+    return _split_by_operator(s, ',')
 
-    Args:
-        formula: Excel formula string (e.g., "=$H2 = TRUE()")
-        cell_data: Dict of col_letter -> raw cell value (unused, for compatibility)
-        col_to_header: Dict mapping column letters to header names
-        get_cell_value_fn: Callback to get cell value (evaluates formulas recursively)
 
-    Returns:
-        The computed value
-    """
-    if not formula or not isinstance(formula, str) or not formula.startswith('='):
-        return formula
+def _constant(value):
+    """Compile a constant expression."""
+    return lambda get_value: value
+
+
+def _compile_string(expr, upper):
+    """Compile a string literal ("...")."""
+    if expr.endswith('"'):
+        return _constant(expr[1:-1])
+    return None
+
+
+def _compile_boolean(expr, upper):
+    """Compile TRUE/TRUE()/FALSE/FALSE()."""
+    if upper in ('TRUE', 'TRUE()'):
+        return _constant(True)
+    if upper in ('FALSE', 'FALSE()'):
+        return _constant(False)
+    return None
 
-    def get_field_value(col_letter):
-        """Get field value from column letter, evaluating formulas if needed."""
-        return get_cell_value_fn(col_letter)
 
-    def eval_expr(expr):
-        """Recursively evaluate an expression."""
-        expr = expr.strip()
+def _compile_and(expr, upper):
+    """Compile AND(...)."""
+    if not upper.startswith('AND('):
+        return None
+    compiled_args = [_compile_expr(arg) for arg in _split_args(_extract_parens(expr[3:]))]
+
+    def and_(get_value):
+        for arg in compiled_args:
+            if not arg(get_value):
+                return False
+        return True
+    return and_
+
+
+def _compile_not(expr, upper):
+    """Compile NOT(...)."""
+    if not upper.startswith('NOT('):
+        return None
+    inner = _compile_expr(_extract_parens(expr[3:]))
+
+    def not_(get_value):
+        val = inner(get_value)
+        return not val if val is not None else None
+    return not_
+
+
+def _compile_if(expr, upper):
+    """Compile IF(condition, true_value[, false_value])."""
+    if not upper.startswith('IF('):
+        return None
+    args = _split_args(_extract_parens(expr[2:]))
+    if len(args) < 2:
+        return _constant(None)
+    condition = _compile_expr(args[0])
+    true_branch = _compile_expr(args[1])
+    # When no else clause, return empty string "" (not None or False)
+    # This matches Excel behavior for string concatenation
+    false_branch = _compile_expr(args[2]) if len(args) > 2 else _constant("")
+
+    def if_(get_value):
+        cond = condition(get_value)
+        true_val = true_branch(get_value)
+        false_val = false_branch(get_value)
+        return true_val if cond else false_val
+    return if_
+
+
+# Compilers for the expression forms recognizable by their first character
+# (upper-cased); each returns None when the expression isn't its form
+_PREFIX_COMPILERS = {
+    '"': _compile_string,
+    'T': _compile_boolean,
+    'F': _compile_boolean,
+    'A': _compile_and,
+    'N': _compile_not,
+    'I': _compile_if,
+}
+
+
+@lru_cache(maxsize=4096)
+def _compile_expr(expr):
+    """Compile an expression into a function of get_value(col_letter).
+
+    The structure of an expression never depends on cell values, so it is
+    parsed once here; the returned closures only evaluate. Repeated
+    sub-expressions (TRUE(), the same cell reference, ...) share a closure.
+    """
+    expr = expr.strip()
+
+    # Handle string concatenation
+    parts = _split_by_operator(expr, ' & ')
+    if len(parts) > 1:
+        compiled_parts = [_compile_expr(p) for p in parts]
 
-        # Handle string concatenation
-        parts = split_by_operator(expr, ' & ')
-        if len(parts) > 1:
+        def concat(get_value):
             result = ''
-            for p in parts:
-                val = eval_expr(p)
+            for part in compiled_parts:
+                val = part(get_value)
                 # Treat None, False (from IF with no else), and empty as ""
                 if val is None or val is False:
                     val = ''
-                if val is not None:
-                    result += str(val)
+                result += str(val)
             # Return None if result is empty (no content)
             return result if result else None
+        return concat
+
+    # Handle string literals, TRUE/FALSE, AND(...), NOT(...) and IF(...),
+    # dispatching on the first character
+    upper = expr.upper()
+    prefix_compiler = _PREFIX_COMPILERS.get(upper[:1])
+    if prefix_compiler is not None:
+        compiled = prefix_compiler(expr, upper)
+        if compiled is not None:
+            return compiled
+
+    # Handle cell references like $B2 or B2
+    cell_match = _CELL_REF_RE.match(expr)
+    if cell_match:
+        col_letter = cell_match.group(1)
+        return lambda get_value: get_value(col_letter)
+
+    # Handle numeric literals
+    try:
+        if '.' in expr:
+            return _constant(float(expr))
+        return _constant(int(expr))
+    except ValueError:
+        pass
+
+    # Handle comparison operators (>, <, >=, <=) - check these before equality
+    if '<' in expr or '>' in expr:
+        left_expr, op, right_expr = _CMP_RE.split(expr, maxsplit=1)
+        left_fn = _compile_expr(left_expr)
+        right_fn = _compile_expr(right_expr)
+        compare = _CMP_OPS[op]
+
+        def comparison(get_value):
+            left = left_fn(get_value)
+            right = right_fn(get_value)
+            if left is not None and right is not None:
+                try:
+                    return compare(left, right)
+                except TypeError:
+                    return None
+            return None
+        return comparison
 
-        # Handle string literals
-        if expr.startswith('"') and expr.endswith('"'):
-            return expr[1:-1]
+    # Handle equality
+    if ' = ' in expr or '=' in expr:
+        parts = _EQ_SPLIT_RE.split(expr, maxsplit=1)
+        if len(parts) == 2:
+            left_fn = _compile_expr(parts[0])
+            right_fn = _compile_expr(parts[1])
+            return lambda get_value: left_fn(get_value) == right_fn(get_value)
 
-        # Handle TRUE/FALSE
-        if expr.upper() in ('TRUE', 'TRUE()'):
-            return True
-        if expr.upper() in ('FALSE', 'FALSE()'):
-            return False
+    return _constant(None)
 
-        # Handle cell references like $B2 or B2
-        cell_match = re.match(r'^\$?([A-Z]+)\d+$', expr)
-        if cell_match:
-            return get_field_value(cell_match.group(1))
-
-        # Handle numeric literals
-        try:
-            if '.' in expr:
-                return float(expr)
-            return int(expr)
-        except ValueError:
-            pass
-
-        # Handle AND(...)
-        if expr.upper().startswith('AND('):
-            inner = extract_parens(expr[3:])
-            args = split_args(inner)
-            for arg in args:
-                val = eval_expr(arg)
-                if not val:
-                    return False
-            return True
 
-        # Handle NOT(...)
-        if expr.upper().startswith('NOT('):
-            inner = extract_parens(expr[3:])
-            val = eval_expr(inner)
-            return not val if val is not None else None
-
-        # Handle IF(...)
-        if expr.upper().startswith('IF('):
-            inner = extract_parens(expr[2:])
-            args = split_args(inner)
-            if len(args) < 2:
-                return None
-            condition = eval_expr(args[0])
-            true_val = eval_expr(args[1]) if len(args) > 1 else None
-            # When no else clause, return empty string "" (not None or False)
-            # This matches Excel behavior for string concatenation
-            false_val = eval_expr(args[2]) if len(args) > 2 else ""
-            return true_val if condition else false_val
-
-        # Handle comparison operators (>, <, >=, <=) - check these before equality
-        for op, fn in [(' >= ', lambda a, b: a >= b),
-                       (' <= ', lambda a, b: a <= b),
-                       (' > ', lambda a, b: a > b),
-                       (' < ', lambda a, b: a < b),
-                       ('>=', lambda a, b: a >= b),
-                       ('<=', lambda a, b: a <= b),
-                       ('>', lambda a, b: a > b),
-                       ('<', lambda a, b: a < b)]:
-            if op in expr:
-                parts = expr.split(op, 1)
-                if len(parts) == 2:
-                    left = eval_expr(parts[0])
-                    right = eval_expr(parts[1])
-                    if left is not None and right is not None:
-                        try:
-                            return fn(left, right)
-                        except TypeError:
-                            return None
-                    return None
+# Compiled formulas keyed by formula shape (see _formula_shape)
+_COMPILED_FORMULAS = {}
 
-        # Handle equality
-        if ' = ' in expr or '=' in expr:
-            parts = re.split(r'\s*=\s*', expr, maxsplit=1)
-            if len(parts) == 2:
-                left = eval_expr(parts[0])
-                right = eval_expr(parts[1])
-                return left == right
 
-        return None
+def _formula_shape(formula):
+    """Return the formula with row numbers of cell references masked out.
+
+    Cell references only contribute their column letter, so every row of a
+    calculated column (=$H2 = TRUE(), =$H3 = TRUE(), ...) has one shape and
+    shares one compiled function. String literals are left untouched.
+    """
+    if '"' not in formula:
+        return _ROW_NUMBER_RE.sub('#', formula)
+    parts = formula.split('"')
+    parts[::2] = [_ROW_NUMBER_RE.sub('#', part) for part in parts[::2]]
+    return '"'.join(parts)
+
+
+def compile_excel_formula(formula):
+    """Compile an Excel formula (e.g. "=$H2 = TRUE()") once per shape.
 
-    def extract_parens(s):
-        """Extract content inside parentheses."""
-        s = s.strip()
-        if not s.startswith('('):
-            return s
-        depth = 0
-        for i, c in enumerate(s):
-            if c == '(':
-                depth += 1
-            elif c == ')':
-                depth -= 1
-                if depth == 0:
-                    return s[1:i]
-        return s[1:-1] if s.endswith(')') else s
-
-    def split_by_operator(expr, op):
-        """Split by operator, respecting parentheses and quotes."""
-        parts = []
-        current = ''
-        depth = 0
-        in_string = False
-        i = 0
-        while i < len(expr):
-            c = expr[i]
-            if c == '"':
-                in_string = not in_string
-                current += c
-            elif not in_string:
-                if c == '(':
-                    depth += 1
-                    current += c
-                elif c == ')':
-                    depth -= 1
-                    current += c
-                elif depth == 0 and expr[i:i+len(op)] == op:
-                    parts.append(current)
-                    current = ''
-                    i += len(op) - 1
-                else:
-                    current += c
-            else:
-                current += c
-            i += 1
-        if current:
-            parts.append(current)
-        return parts
-
-    def split_args(s):
-        """Split comma-separated arguments."""
-        return split_by_operator(s, ',')
-
-    return eval_expr(formula[1:])
+    Returns:
+        A function of get_value(col_letter) returning the computed value
+    """
+    shape = _formula_shape(formula)
+    compiled = _COMPILED_FORMULAS.get(shape)
+    if compiled is None:
+        compiled = _COMPILED_FORMULAS[shape] = _compile_expr(formula[1:])
+    return compiled
+
+
+def evaluate_excel_formula_recursive(formula, evaluator):
+    """Evaluate an Excel formula with recursive formula resolution.
+
+    Args:
+        formula: Excel formula string (e.g., "=$H2 = TRUE()")
+        evaluator: RowEvaluator for the current row (evaluates referenced
+            formulas recursively)
+
+    Returns:
+        The computed value
+    """
+    if not formula or not isinstance(formula, str) or not formula.startswith('='):
+        return formula
+
+    return compile_excel_formula(formula)(evaluator.value)
 
 
 def evaluate_excel_formula(formula, row_data, headers, col_to_header):
     """Evaluate an Excel formula using row data (non-recursive version).
 
-    Converts Excel cell references like $B2 back to field values and evaluates.
+    Converts Excel cell references like $B2 back to field values and evaluates
+    them with the same compiled formulas as evaluate_excel_formula_recursive().
 
     Args:
         formula: Excel formula string (e.g., "=$H2 = TRUE()")
@@ -228,132 +345,7 @@ def evaluate_excel_formula(formula, row_data, headers, col_to_header):
             return row_data[header]
         return None
 
-    def eval_expr(expr):
-        """Recursively evaluate an expression."""
-        expr = expr.strip()
-
-        # Handle string concatenation
-        parts = split_by_operator(expr, ' & ')
-        if len(parts) > 1:
-            result = ''
-            for p in parts:
-                val = eval_expr(p)
-                if val is not None:
-                    result += str(val)
-            return result if result else None
-
-        # Handle string literals
-        if expr.startswith('"') and expr.endswith('"'):
-            return expr[1:-1]
-
-        # Handle TRUE/FALSE
-        if expr.upper() in ('TRUE', 'TRUE()'):
-            return True
-        if expr.upper() in ('FALSE', 'FALSE()'):
-            return False
-
-        # Handle cell references like $B2 or B2
-        cell_match = re.match(r'^\$?([A-Z]+)\d+$', expr)
-        if cell_match:
-            return get_field_value(cell_match.group(1))
-
-        # Handle numeric literals
-        try:
-            if '.' in expr:
-                return float(expr)
-            return int(expr)
-        except ValueError:
-            pass
-
-        # Handle AND(...)
-        if expr.upper().startswith('AND('):
-            inner = extract_parens(expr[3:])
-            args = split_args(inner)
-            for arg in args:
-                val = eval_expr(arg)
-                if not val:
-                    return False
-            return True
-
-        # Handle NOT(...)
-        if expr.upper().startswith('NOT('):
-            inner = extract_parens(expr[3:])
-            val = eval_expr(inner)
-            return not val if val is not None else None
-
-        # Handle IF(...)
-        if expr.upper().startswith('IF('):
-            inner = extract_parens(expr[2:])
-            args = split_args(inner)
-            if len(args) < 2:
-                return None
-            condition = eval_expr(args[0])
-            true_val = eval_expr(args[1]) if len(args) > 1 else None
-            false_val = eval_expr(args[2]) if len(args) > 2 else None
-            return true_val if condition else false_val
-
-        # Handle equality
-        if ' = ' in expr or '=' in expr:
-            parts = re.split(r'\s*=\s*', expr, maxsplit=1)
-            if len(parts) == 2:
-                left = eval_expr(parts[0])
-                right = eval_expr(parts[1])
-                return left == right
-
-        return None
-
-    def extract_parens(s):
-        """Extract content inside parentheses."""
-        s = s.strip()
-        if not s.startswith('('):
-            return s
-        depth = 0
-        for i, c in enumerate(s):
-            if c == '(':
-                depth += 1
-            elif c == ')':
-                depth -= 1
-                if depth == 0:
-                    return s[1:i]
-        return s[1:-1] if s.endswith(')') else s
-
-    def split_by_operator(expr, op):
-        """Split by operator, respecting parentheses and quotes."""
-        parts = []
-        current = ''
-        depth = 0
-        in_string = False
-        i = 0
-        while i < len(expr):
-            c = expr[i]
-            if c == '"':
-                in_string = not in_string
-                current += c
-            elif not in_string:
-                if c == '(':
-                    depth += 1
-                    current += c
-                elif c == ')':
-                    depth -= 1
-                    current += c
-                elif depth == 0 and expr[i:i+len(op)] == op:
-                    parts.append(current)
-                    current = ''
-                    i += len(op) - 1
-                else:
-                    current += c
-            else:
-                current += c
-            i += 1
-        if current:
-            parts.append(current)
-        return parts
-
-    def split_args(s):
-        """Split comma-separated arguments."""
-        return split_by_operator(s, ',')
-
-    return eval_expr(formula[1:])
+    return compile_excel_formula(formula)(get_field_value)
 
 
 def convert_cell_value(value):
@@ -377,6 +369,40 @@ def convert_cell_value(value):
     return value
 
 
+class RowEvaluator:
+    """Resolves the cell values of one row at a time, with caching.
+
+    A single instance serves a whole sheet; reset() points it at the next row.
+    """
+
+    __slots__ = ('cell_data', 'cache')
+
+    def __init__(self):
+        self.cell_data = {}  # col_letter -> raw value or formula string
+        self.cache = {}      # col_letter -> evaluated value
+
+    def reset(self, cell_data):
+        """Start evaluating a new row."""
+        self.cell_data = cell_data
+        self.cache.clear()
+
+    def value(self, col_letter):
+        """Get cell value, evaluating formula if needed (with caching)."""
+        cache = self.cache
+        if col_letter in cache:
+            return cache[col_letter]
+
+        value = self.cell_data.get(col_letter)
+        if isinstance(value, str) and value.startswith('='):
+            # Recursively evaluate formula
+            value = evaluate_excel_formula_recursive(value, self)
+        else:
+            value = convert_cell_value(value)
+
+        cache[col_letter] = value
+        return value
+
+
 def fill_null_fields_from_xlsx(xlsx_path, answers_path):
     """Read test-answers.json and fill null fields from xlsx values."""
 
@@ -387,22 +413,28 @@ def fill_null_fields_from_xlsx(xlsx_path, answers_path):
         print("Error: test-answers.json is empty")
         sys.exit(1)
 
-    json_fields = list(answers[0].keys())
+    json_fields = tuple(answers[0])
     print(f"Found {len(json_fields)} fields in test answers")
 
     # Find primary key field
     pk_field = next((f for f in json_fields if f.endswith('_id')), json_fields[0])
     print(f"Primary key field: {pk_field}")
 
-    # Load workbook
-    wb = load_workbook(xlsx_path)
+    # Load workbook; read_only streams rows instead of building every sheet
+    # in memory, and formula strings are kept since data_only is not set
+    wb = load_workbook(xlsx_path, read_only=True)
 
-    # Find worksheet with primary key column
+    # Find worksheet with primary key column. Only each sheet's first row is
+    # read; the sheet named after the key's entity (language_candidate_id ->
+    # LanguageCandidates) is tried first
     pk_pascal = ''.join(word.capitalize() for word in pk_field.split('_'))
+    entity = pk_pascal[:-2].lower() if pk_pascal.endswith('Id') else pk_pascal.lower()
+    sheet_names = sorted(wb.sheetnames, key=lambda name: not name.lower().startswith(entity))
     ws = None
-    for name in wb.sheetnames:
+    for name in sheet_names:
         sheet = wb[name]
-        headers = [cell.value for cell in sheet[1] if cell.value]
+        header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        headers = [value for value in header_row if value]
         if pk_pascal in headers:
             ws = sheet
             print(f"Reading from worksheet: {name}")
@@ -412,67 +444,51 @@ def fill_null_fields_from_xlsx(xlsx_path, answers_path):
         print(f"Error: Could not find worksheet with column '{pk_pascal}'")
         sys.exit(1)
 
-    # Get headers and build column mapping
-    headers = [cell.value for cell in ws[1] if cell.value]
+    # Build column mapping from the worksheet's headers
     column_map = {}  # header -> snake_case json field
     for header in headers:
         snake = to_snake_case(header)
         if snake in json_fields:
             column_map[header] = snake
 
-    # Build column letter to header mapping for formula evaluation
+    # Column letters, computed once and indexed by 0-based column position
     from openpyxl.utils import get_column_letter
-    col_to_header = {}
-    for col_idx, header in enumerate(headers, 1):
-        col_letter = get_column_letter(col_idx)
-        col_to_header[col_letter] = header
+    col_letters = [get_column_letter(col_idx + 1) for col_idx in range(len(headers))]
 
     print(f"Found {len(headers)} columns, matched {len(column_map)} to JSON fields")
 
     # Build lookup from xlsx
     xlsx_lookup = {}
-    for row in ws.iter_rows(min_row=2):
-        if all(cell.value is None for cell in row[:len(headers)]):
+    evaluator = RowEvaluator()
+    # Rows come back as value tuples cut to the header columns; a row is empty
+    # when every value is None (False and 0 are real values)
+    for row in ws.iter_rows(min_row=2, max_col=len(headers), values_only=True):
+        if row.count(None) == len(row):
             continue
 
         # Build cell_data: col_letter -> raw value or formula string
-        cell_data = {}
-        for col_idx, cell in enumerate(row[:len(headers)]):
-            col_letter = get_column_letter(col_idx + 1)
-            cell_data[col_letter] = cell.value
-
-        # Cache for evaluated formula results
-        eval_cache = {}
-
-        def get_cell_value(col_letter):
-            """Get cell value, evaluating formula if needed (with caching)."""
-            if col_letter in eval_cache:
-                return eval_cache[col_letter]
-
-            value = cell_data.get(col_letter)
-            if isinstance(value, str) and value.startswith('='):
-                # Recursively evaluate formula
-                value = evaluate_excel_formula_recursive(value, cell_data, col_to_header, get_cell_value)
-            else:
-                value = convert_cell_value(value)
-
-            eval_cache[col_letter] = value
-            return value
+        evaluator.reset(dict(zip(col_letters, row)))
 
         # Build the row by getting each column's value
         xlsx_row = {}
         pk_value = None
-        for col_idx, header in enumerate(headers):
-            col_letter = get_column_letter(col_idx + 1)
+        for col_letter, header in zip(col_letters, headers):
             if header in column_map:
                 json_field = column_map[header]
-                value = get_cell_value(col_letter)
+                value = evaluator.value(col_letter)
                 xlsx_row[json_field] = value
                 if json_field == pk_field:
                     pk_value = value
 
         if pk_value is not None:
-            xlsx_lookup[pk_value] = xlsx_row
+            # Keep only the fields the xlsx can fill, in JSON field order
+            xlsx_lookup[pk_value] = [
+                (field, xlsx_row[field]) for field in json_fields
+                if xlsx_row.get(field) is not None
+            ]
+
+    # Read-only workbooks keep the file open until closed
+    wb.close()
 
     print(f"Loaded {len(xlsx_lookup)} rows from xlsx")
 
@@ -485,12 +501,11 @@ def fill_null_fields_from_xlsx(xlsx_path, answers_path):
         if pk_value is None or pk_value not in xlsx_lookup:
             continue
 
-        xlsx_row = xlsx_lookup[pk_value]
         record_updated = False
 
-        for field in json_fields:
-            if answer.get(field) is None and xlsx_row.get(field) is not None:
-                answer[field] = xlsx_row[field]
+        for field, value in xlsx_lookup[pk_value]:
+            if answer.get(field) is None:
+                answer[field] = value
                 fields_filled += 1
                 record_updated = True
 
@@ -499,8 +514,12 @@ def fill_null_fields_from_xlsx(xlsx_path, answers_path):
 
     print(f"Filled {fields_filled} null fields across {records_updated} records")
 
-    with open(answers_path, 'w', encoding='utf-8') as f:
-        json.dump(answers, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open(answers_path, 'wb') as f:
+            f.write(orjson.dumps(answers, option=orjson.OPT_INDENT_2))
+    else:
+        with open(answers_path, 'w', encoding='utf-8') as f:
+            json.dump(answers, f, indent=2)
 
     print(f"Updated {answers_path}")
 
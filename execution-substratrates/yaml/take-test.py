@@ -14,6 +14,7 @@ with the Python substrate.
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # Get script directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -25,13 +26,26 @@ sys.path.insert(0, python_substrate_dir)
 # Try to import yaml for schema reading (optional - for logging purposes)
 try:
     import yaml
+    # Use libyaml's C parser when PyYAML was built with it
+    _YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
     YAML_AVAILABLE = True
 except ImportError:
     YAML_AVAILABLE = False
     print("Warning: PyYAML not installed. Schema details will not be logged.")
 
+# Try to import orjson for faster result serialization (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from erb_calc import compute_all_calculated_fields
 
+# Records are independent, but spreading them over worker processes only
+# pays off once there are enough to outweigh the cost of starting the pool
+_PARALLEL_MIN_RECORDS = 256
+
 
 def load_schema(schema_path: str) -> dict:
     """Load and parse the YAML schema."""
@@ -39,7 +53,7 @@ def load_schema(schema_path: str) -> dict:
         return {}
 
     with open(schema_path, 'r') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def get_calculated_fields_from_schema(schema: dict) -> list:
@@ -96,14 +110,20 @@ def main():
     print(f"YAML substrate: Processing {len(records)} records...")
 
     # Compute all calculated fields for each record using shared library
-    computed_records = []
-    for record in records:
-        computed = compute_all_calculated_fields(record)
-        computed_records.append(computed)
+    if len(records) < _PARALLEL_MIN_RECORDS:
+        computed_records = [compute_all_calculated_fields(record) for record in records]
+    else:
+        chunksize = max(1, len(records) // ((os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor() as executor:
+            computed_records = list(executor.map(compute_all_calculated_fields, records, chunksize=chunksize))
 
     # Save results
-    with open(output_path, 'w') as f:
-        json.dump(computed_records, f, indent=2)
+    if ORJSON_AVAILABLE:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(computed_records, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(computed_records, f, indent=2)
 
     print(f"YAML substrate: Saved results to {output_path}")
 
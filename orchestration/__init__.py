@@ -0,0 +1 @@
+"""Shared code for the ERB generators: rulebook loading and the formula parser."""
@@ -11,323 +11,343 @@ Each substrate then compiles the AST to its target language:
 - Go: compile_to_go()
 - SPARQL: compile_to_sparql()
 
+Formulas can also be evaluated in-process with compile_to_bytecode() and
+run_bytecode().
+
 Extracted from: execution-substratrates/owl/inject-into-owl.py
 """
 
+import operator
 import re
 from dataclasses import dataclass
-from typing import List, Any
-from enum import Enum, auto
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any
 
 
 # =============================================================================
 # AST NODE TYPES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ASTNode:
     """Base class for AST nodes"""
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LiteralBool(ASTNode):
     value: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LiteralInt(ASTNode):
     value: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LiteralString(ASTNode):
     value: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FieldRef(ASTNode):
     name: str  # Field name without {{ }}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BinaryOp(ASTNode):
     op: str  # '=', '<>', '<', '<=', '>', '>='
     left: ASTNode
     right: ASTNode
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnaryOp(ASTNode):
     op: str  # 'NOT'
     operand: ASTNode
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FuncCall(ASTNode):
     name: str  # 'AND', 'OR', 'IF', 'LOWER', 'FIND', 'CAST'
-    args: List[ASTNode]
+    args: Tuple[ASTNode, ...]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Concat(ASTNode):
-    parts: List[ASTNode]
+    parts: Tuple[ASTNode, ...]
 
 
 # =============================================================================
 # LEXER
 # =============================================================================
 
-class TokenType(Enum):
-    STRING = auto()
-    NUMBER = auto()
-    FIELD_REF = auto()
-    FUNC_NAME = auto()
-    LPAREN = auto()
-    RPAREN = auto()
-    COMMA = auto()
-    AMPERSAND = auto()
-    EQUALS = auto()
-    NOT_EQUALS = auto()
-    LT = auto()
-    LE = auto()
-    GT = auto()
-    GE = auto()
-    EOF = auto()
-
-
-@dataclass
+# Token kinds
+(TK_STRING, TK_NUMBER, TK_FIELD_REF, TK_FUNC_NAME, TK_LPAREN, TK_RPAREN, TK_COMMA,
+ TK_AMPERSAND, TK_EQUALS, TK_NOT_EQUALS, TK_LT, TK_LE, TK_GT, TK_GE, TK_EOF) = range(1, 16)
+
+# Token kind names, for error messages and the lexer regex group names
+_TK_NAMES = {
+    TK_STRING: 'STRING',
+    TK_NUMBER: 'NUMBER',
+    TK_FIELD_REF: 'FIELD_REF',
+    TK_FUNC_NAME: 'FUNC_NAME',
+    TK_LPAREN: 'LPAREN',
+    TK_RPAREN: 'RPAREN',
+    TK_COMMA: 'COMMA',
+    TK_AMPERSAND: 'AMPERSAND',
+    TK_EQUALS: 'EQUALS',
+    TK_NOT_EQUALS: 'NOT_EQUALS',
+    TK_LT: 'LT',
+    TK_LE: 'LE',
+    TK_GT: 'GT',
+    TK_GE: 'GE',
+    TK_EOF: 'EOF',
+}
+
+
+@dataclass(slots=True, frozen=True)
 class Token:
-    type: TokenType
+    type: int  # TK_* kind
     value: Any
     pos: int
 
 
-def tokenize(formula: str) -> List[Token]:
-    """Tokenize an Excel-dialect formula."""
-    tokens = []
+# One alternative per token kind, tried in order at each position
+_TOKEN_RE = re.compile(r'''
+    (?P<WS>[ \t\n\r]+)
+  | "(?P<STRING>(?:[^"\\]|\\[\s\S])*)"      # backslash skips the next char
+  | \{\{(?P<FIELD_REF>[\s\S]*?)\}\}
+  | (?P<NUMBER>-?\d+)
+  | (?P<NOT_EQUALS><>)
+  | (?P<LE><=)
+  | (?P<GE>>=)
+  | (?P<LT><)
+  | (?P<GT>>)
+  | (?P<EQUALS>=)
+  | (?P<AMPERSAND>&)
+  | (?P<LPAREN>\()
+  | (?P<RPAREN>\))
+  | (?P<COMMA>,)
+  | (?P<FUNC_NAME>[^\W\d]\w*)
+''', re.VERBOSE)
+
+
+def _token_error(formula: str, i: int) -> SyntaxError:
+    """The error for text at position i that doesn't start a token."""
+    if formula[i] == '"':
+        return SyntaxError(f"Unterminated string at position {i}")
+    if formula[i:i+2] == '{{':
+        return SyntaxError(f"Unterminated field reference at position {i}")
+    return SyntaxError(f"Unexpected character '{formula[i]}' at position {i}")
+
+
+_TOKEN_KINDS = {name: kind for kind, name in _TK_NAMES.items()}
+
+
+def _scan_tokens(formula: str) -> Tuple[List[int], List[Any], List[int]]:
+    """Tokenize into parallel lists of token kinds, values and positions."""
+    types, values, positions = [], [], []
 
     # Remove leading = if present
     if formula.startswith('='):
         formula = formula[1:]
 
     i = 0
-    while i < len(formula):
-        c = formula[i]
-
-        # Skip whitespace
-        if c in ' \t\n\r':
-            i += 1
-            continue
+    for match in _TOKEN_RE.finditer(formula):
+        if match.start() != i:
+            raise _token_error(formula, i)
+        i = match.end()
 
-        # String literal
-        if c == '"':
-            j = i + 1
-            while j < len(formula) and formula[j] != '"':
-                if formula[j] == '\\':
-                    j += 2
-                else:
-                    j += 1
-            if j >= len(formula):
-                raise SyntaxError(f"Unterminated string at position {i}")
-            value = formula[i+1:j]
-            tokens.append(Token(TokenType.STRING, value, i))
-            i = j + 1
+        kind = match.lastgroup
+        if kind == 'WS':
             continue
+        value = match.group(kind)
+        if kind == 'NUMBER':
+            value = int(value)
+        elif kind == 'FUNC_NAME':
+            value = value.upper()
+        types.append(_TOKEN_KINDS[kind])
+        values.append(value)
+        positions.append(match.start())
 
-        # Field reference {{Name}}
-        if formula[i:i+2] == '{{':
-            j = formula.find('}}', i)
-            if j == -1:
-                raise SyntaxError(f"Unterminated field reference at position {i}")
-            field_name = formula[i+2:j]
-            tokens.append(Token(TokenType.FIELD_REF, field_name, i))
-            i = j + 2
-            continue
+    if i < len(formula):
+        raise _token_error(formula, i)
 
-        # Number
-        if c.isdigit() or (c == '-' and i + 1 < len(formula) and formula[i+1].isdigit()):
-            j = i
-            if c == '-':
-                j += 1
-            while j < len(formula) and formula[j].isdigit():
-                j += 1
-            value = int(formula[i:j])
-            tokens.append(Token(TokenType.NUMBER, value, i))
-            i = j
-            continue
+    types.append(TK_EOF)
+    values.append(None)
+    positions.append(len(formula))
+    return types, values, positions
 
-        # Operators
-        if formula[i:i+2] == '<>':
-            tokens.append(Token(TokenType.NOT_EQUALS, '<>', i))
-            i += 2
-            continue
-        if formula[i:i+2] == '<=':
-            tokens.append(Token(TokenType.LE, '<=', i))
-            i += 2
-            continue
-        if formula[i:i+2] == '>=':
-            tokens.append(Token(TokenType.GE, '>=', i))
-            i += 2
-            continue
-        if c == '<':
-            tokens.append(Token(TokenType.LT, '<', i))
-            i += 1
-            continue
-        if c == '>':
-            tokens.append(Token(TokenType.GT, '>', i))
-            i += 1
-            continue
-        if c == '=':
-            tokens.append(Token(TokenType.EQUALS, '=', i))
-            i += 1
-            continue
-        if c == '&':
-            tokens.append(Token(TokenType.AMPERSAND, '&', i))
-            i += 1
-            continue
-        if c == '(':
-            tokens.append(Token(TokenType.LPAREN, '(', i))
-            i += 1
-            continue
-        if c == ')':
-            tokens.append(Token(TokenType.RPAREN, ')', i))
-            i += 1
-            continue
-        if c == ',':
-            tokens.append(Token(TokenType.COMMA, ',', i))
-            i += 1
-            continue
 
-        # Function names / identifiers
-        if c.isalpha() or c == '_':
-            j = i
-            while j < len(formula) and (formula[j].isalnum() or formula[j] == '_'):
-                j += 1
-            name = formula[i:j].upper()
-            tokens.append(Token(TokenType.FUNC_NAME, name, i))
-            i = j
-            continue
-
-        raise SyntaxError(f"Unexpected character '{c}' at position {i}")
-
-    tokens.append(Token(TokenType.EOF, None, len(formula)))
-    return tokens
+def tokenize(formula: str) -> List[Token]:
+    """Tokenize an Excel-dialect formula."""
+    types, values, positions = _scan_tokens(formula)
+    return [Token(kind, value, pos) for kind, value, pos in zip(types, values, positions)]
 
 
 # =============================================================================
 # PARSER
 # =============================================================================
 
+# Leaf nodes are immutable, so the parser shares one instance per distinct
+# field name, string and small integer across all formulas
+_FIELD_POOL = {}
+_STR_POOL = {}
+_INT_POOL = {}
+_INT_POOL_RANGE = range(-128, 257)
+
+
+def _field_ref(name: str) -> FieldRef:
+    node = _FIELD_POOL.get(name)
+    if node is None:
+        node = _FIELD_POOL[name] = FieldRef(name=name)
+    return node
+
+
+def _literal_string(value: str) -> LiteralString:
+    node = _STR_POOL.get(value)
+    if node is None:
+        node = _STR_POOL[value] = LiteralString(value=value)
+    return node
+
+
+def _literal_int(value: int) -> LiteralInt:
+    if value not in _INT_POOL_RANGE:
+        return LiteralInt(value=value)
+    node = _INT_POOL.get(value)
+    if node is None:
+        node = _INT_POOL[value] = LiteralInt(value=value)
+    return node
+
+
+def _clear_ast_pools():
+    """Drop the shared leaf nodes (and the parse cache that references them)."""
+    _FIELD_POOL.clear()
+    _STR_POOL.clear()
+    _INT_POOL.clear()
+    parse_formula.cache_clear()
+
+
+_COMPARISON_TOKENS = {
+    TK_EQUALS: '=',
+    TK_NOT_EQUALS: '<>',
+    TK_LT: '<',
+    TK_LE: '<=',
+    TK_GT: '>',
+    TK_GE: '>=',
+}
+
+
 class Parser:
-    """Recursive descent parser for Excel-dialect formulas."""
+    """Recursive descent parser for Excel-dialect formulas.
 
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
-        self.pos = 0
+    Works directly on the parallel token lists from _scan_tokens.
+    """
 
-    def current(self) -> Token:
-        return self.tokens[self.pos]
+    def __init__(self, types: List[int], values: List[Any], positions: List[int]):
+        self.types = types
+        self.values = values
+        self.positions = positions
+        self.pos = 0
 
-    def consume(self, expected: TokenType = None) -> Token:
-        tok = self.current()
-        if expected and tok.type != expected:
-            raise SyntaxError(f"Expected {expected}, got {tok.type} at position {tok.pos}")
-        self.pos += 1
-        return tok
+    def consume(self, expected: int = 0) -> Any:
+        pos = self.pos
+        if expected and self.types[pos] != expected:
+            raise SyntaxError(
+                f"Expected {_TK_NAMES[expected]}, got {_TK_NAMES[self.types[pos]]} "
+                f"at position {self.positions[pos]}"
+            )
+        self.pos = pos + 1
+        return self.values[pos]
 
     def parse(self) -> ASTNode:
         result = self.parse_concat()
-        if self.current().type != TokenType.EOF:
-            raise SyntaxError(f"Unexpected token {self.current()} after expression")
+        pos = self.pos
+        if self.types[pos] != TK_EOF:
+            raise SyntaxError(
+                f"Unexpected token {_TK_NAMES[self.types[pos]]} {self.values[pos]!r} "
+                f"at position {self.positions[pos]} after expression"
+            )
         return result
 
     def parse_concat(self) -> ASTNode:
-        left = self.parse_comparison()
-        parts = [left]
-        while self.current().type == TokenType.AMPERSAND:
-            self.consume(TokenType.AMPERSAND)
-            right = self.parse_comparison()
-            parts.append(right)
+        types = self.types
+        parts = [self.parse_comparison()]
+        while types[self.pos] == TK_AMPERSAND:
+            self.pos += 1
+            parts.append(self.parse_comparison())
         if len(parts) == 1:
             return parts[0]
-        return Concat(parts=parts)
+        return Concat(parts=tuple(parts))
 
     def parse_comparison(self) -> ASTNode:
         left = self.parse_primary()
-        op_map = {
-            TokenType.EQUALS: '=',
-            TokenType.NOT_EQUALS: '<>',
-            TokenType.LT: '<',
-            TokenType.LE: '<=',
-            TokenType.GT: '>',
-            TokenType.GE: '>=',
-        }
-        if self.current().type in op_map:
-            op = op_map[self.current().type]
-            self.consume()
+        op = _COMPARISON_TOKENS.get(self.types[self.pos])
+        if op is not None:
+            self.pos += 1
             right = self.parse_primary()
             return BinaryOp(op=op, left=left, right=right)
         return left
 
     def parse_primary(self) -> ASTNode:
-        tok = self.current()
+        types = self.types
+        pos = self.pos
+        kind = types[pos]
 
-        if tok.type == TokenType.STRING:
-            self.consume()
-            return LiteralString(value=tok.value)
+        if kind == TK_STRING:
+            self.pos = pos + 1
+            return _literal_string(self.values[pos])
 
-        if tok.type == TokenType.NUMBER:
-            self.consume()
-            return LiteralInt(value=tok.value)
+        if kind == TK_NUMBER:
+            self.pos = pos + 1
+            return _literal_int(self.values[pos])
 
-        if tok.type == TokenType.FIELD_REF:
-            self.consume()
-            return FieldRef(name=tok.value)
+        if kind == TK_FIELD_REF:
+            self.pos = pos + 1
+            return _field_ref(self.values[pos])
 
-        if tok.type == TokenType.FUNC_NAME:
-            name = tok.value.upper()
-            self.consume()
+        if kind == TK_FUNC_NAME:
+            name = self.values[pos].upper()
+            self.pos = pos + 1
 
-            if name == 'TRUE':
-                if self.current().type == TokenType.LPAREN:
-                    self.consume(TokenType.LPAREN)
-                    self.consume(TokenType.RPAREN)
-                return LiteralBool(value=True)
+            if name == 'TRUE' or name == 'FALSE':
+                if types[self.pos] == TK_LPAREN:
+                    self.pos += 1
+                    self.consume(TK_RPAREN)
+                return LiteralBool(value=name == 'TRUE')
 
-            if name == 'FALSE':
-                if self.current().type == TokenType.LPAREN:
-                    self.consume(TokenType.LPAREN)
-                    self.consume(TokenType.RPAREN)
-                return LiteralBool(value=False)
-
-            self.consume(TokenType.LPAREN)
+            self.consume(TK_LPAREN)
             args = []
-            if self.current().type != TokenType.RPAREN:
+            if types[self.pos] != TK_RPAREN:
                 args.append(self.parse_concat())
-                while self.current().type == TokenType.COMMA:
-                    self.consume(TokenType.COMMA)
+                while types[self.pos] == TK_COMMA:
+                    self.pos += 1
                     args.append(self.parse_concat())
-            self.consume(TokenType.RPAREN)
+            self.consume(TK_RPAREN)
 
             if name == 'NOT' and len(args) == 1:
                 return UnaryOp(op='NOT', operand=args[0])
 
-            return FuncCall(name=name, args=args)
+            return FuncCall(name=name, args=tuple(args))
 
-        if tok.type == TokenType.LPAREN:
-            self.consume(TokenType.LPAREN)
+        if kind == TK_LPAREN:
+            self.pos = pos + 1
             expr = self.parse_concat()
-            self.consume(TokenType.RPAREN)
+            self.consume(TK_RPAREN)
             return expr
 
-        raise SyntaxError(f"Unexpected token {tok.type} at position {tok.pos}")
+        raise SyntaxError(f"Unexpected token {_TK_NAMES[kind]} at position {self.positions[pos]}")
 
 
+@lru_cache(maxsize=4096)
 def parse_formula(formula_text: str) -> ASTNode:
-    """Parse an Excel-dialect formula into an AST."""
-    tokens = tokenize(formula_text)
-    parser = Parser(tokens)
+    """Parse an Excel-dialect formula into an AST.
+
+    Results are cached by formula text, so repeated formulas are tokenized
+    and parsed once; callers must treat the returned AST as read-only.
+    """
+    parser = Parser(*_scan_tokens(formula_text))
     return parser.parse()
 
 
@@ -335,6 +355,11 @@ def parse_formula(formula_text: str) -> ASTNode:
 # HELPER FUNCTIONS
 # =============================================================================
 
+_SNAKE_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_SNAKE_CAMEL_RE = re.compile('([a-z0-9])([A-Z])')
+
+
+@lru_cache(maxsize=None)
 def to_snake_case(name: str) -> str:
     """Convert PascalCase/CamelCase to snake_case.
 
@@ -343,10 +368,11 @@ def to_snake_case(name: str) -> str:
         StableOntologyReference -> stable_ontology_reference
         Name -> name
     """
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    s1 = _SNAKE_WORD_RE.sub(r'\1_\2', name)
+    return _SNAKE_CAMEL_RE.sub(r'\1_\2', s1).lower()
 
 
+@lru_cache(maxsize=None)
 def to_camel_case(name: str) -> str:
     """Convert PascalCase to camelCase.
 
@@ -369,38 +395,212 @@ def to_pascal_case(snake_name: str) -> str:
     return ''.join(word.capitalize() for word in snake_name.split('_'))
 
 
+# Child nodes of each composite AST node type, in source order
+_CHILDREN = {
+    BinaryOp: lambda node: (node.left, node.right),
+    UnaryOp: lambda node: (node.operand,),
+    FuncCall: lambda node: node.args,
+    Concat: lambda node: node.parts,
+}
+
+
 def get_field_dependencies(ast: ASTNode) -> List[str]:
     """Extract all field references from an AST.
 
     Returns a list of field names (PascalCase as they appear in formulas).
     Used for DAG ordering and dependency tracking.
     """
-    deps = []
-
-    def visit(node: ASTNode):
-        if isinstance(node, FieldRef):
-            if node.name not in deps:
-                deps.append(node.name)
-        elif isinstance(node, BinaryOp):
-            visit(node.left)
-            visit(node.right)
-        elif isinstance(node, UnaryOp):
-            visit(node.operand)
-        elif isinstance(node, FuncCall):
-            for arg in node.args:
-                visit(arg)
-        elif isinstance(node, Concat):
-            for part in node.parts:
-                visit(part)
-
-    visit(ast)
-    return deps
+    deps = {}
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        node_type = type(node)
+        if node_type is FieldRef:
+            deps[node.name] = None
+        elif node_type in _CHILDREN:
+            # Reversed so children are visited left to right
+            stack.extend(reversed(_CHILDREN[node_type](node)))
+    return list(deps)
+
+
+# =============================================================================
+# AST OPTIMIZER
+# =============================================================================
+
+# Literal comparisons that fold the same way in every target language,
+# keyed by (literal type, op) so folding is a single lookup
+_FOLDABLE_COMPARISONS = {
+    **{(LiteralInt, op): fn for op, fn in (
+        ('=', operator.eq), ('<>', operator.ne), ('<', operator.lt),
+        ('<=', operator.le), ('>', operator.gt), ('>=', operator.ge))},
+    (LiteralBool, '='): operator.eq,
+    (LiteralBool, '<>'): operator.ne,
+    (LiteralString, '='): operator.eq,
+    (LiteralString, '<>'): operator.ne,
+}
+
+
+def _fold_call(name: str, args: List[ASTNode]) -> ASTNode:
+    """Fold a function call whose arguments are already optimized, or rebuild it."""
+    if name in ('AND', 'OR') and args:
+        flat = []
+        for arg in args:
+            if isinstance(arg, FuncCall) and arg.name == name and arg.args:
+                flat.extend(arg.args)
+            else:
+                flat.append(arg)
+        # AND: TRUE is neutral, FALSE absorbs; OR is the reverse
+        neutral = name == 'AND'
+        if any(isinstance(arg, LiteralBool) and arg.value is not neutral for arg in flat):
+            return LiteralBool(value=not neutral)
+        kept = [arg for arg in flat if not isinstance(arg, LiteralBool)]
+        if not kept:
+            return LiteralBool(value=neutral)
+        return FuncCall(name=name, args=tuple(kept))
+
+    if name == 'IF' and len(args) >= 2 and isinstance(args[0], LiteralBool):
+        # Without an ELSE the targets disagree on the missing value, and a bare
+        # field reference compiles differently from the same value inside IF
+        if args[0].value:
+            chosen = args[1]
+        else:
+            chosen = args[2] if len(args) > 2 else None
+        if chosen is not None and not isinstance(chosen, FieldRef):
+            return chosen
+
+    if len(args) == 1 and isinstance(args[0], LiteralString):
+        value = args[0].value
+        if name == 'LOWER' and value.isascii():
+            return LiteralString(value=value.lower())
+        if name == 'CAST':
+            return args[0]
+
+    if (name == 'FIND' and len(args) == 2
+            and isinstance(args[0], LiteralString) and isinstance(args[1], LiteralString)):
+        return LiteralBool(value=args[0].value in args[1].value)
+
+    return FuncCall(name=name, args=tuple(args))
+
+
+def optimize_ast(ast: ASTNode) -> ASTNode:
+    """Simplify an AST before code generation without changing its results.
+
+    Flattens nested AND/OR calls of the same kind into one n-ary call (and
+    nested concatenations into one Concat), so compiled expressions grow
+    linearly instead of nesting. Folds literal subexpressions: neutral and
+    absorbing literals in AND/OR, NOT and comparisons of literals, IF with a
+    literal condition, LOWER/CAST/FIND of string literals, and adjacent
+    string literals in concatenations. Folds whose result would differ
+    between the Python, JavaScript and Go targets are skipped.
+    """
+    if isinstance(ast, UnaryOp):
+        operand = optimize_ast(ast.operand)
+        if ast.op == 'NOT' and isinstance(operand, LiteralBool):
+            return LiteralBool(value=not operand.value)
+        return UnaryOp(op=ast.op, operand=operand)
+
+    if isinstance(ast, BinaryOp):
+        left = optimize_ast(ast.left)
+        right = optimize_ast(ast.right)
+        if type(left) is type(right):
+            compare = _FOLDABLE_COMPARISONS.get((type(left), ast.op))
+            if compare is not None:
+                return LiteralBool(value=compare(left.value, right.value))
+        return BinaryOp(op=ast.op, left=left, right=right)
+
+    if isinstance(ast, FuncCall):
+        return _fold_call(ast.name, [optimize_ast(arg) for arg in ast.args])
+
+    if isinstance(ast, Concat):
+        parts = []
+        for part in ast.parts:
+            part = optimize_ast(part)
+            for piece in (part.parts if isinstance(part, Concat) else (part,)):
+                if (isinstance(piece, LiteralString) and parts
+                        and isinstance(parts[-1], LiteralString)):
+                    parts[-1] = LiteralString(value=parts[-1].value + piece.value)
+                else:
+                    parts.append(piece)
+        if len(parts) == 1:
+            return parts[0]
+        return Concat(parts=tuple(parts))
+
+    return ast
+
+
+# =============================================================================
+# CODE GENERATION DRIVER
+# =============================================================================
+
+def _compiled_children(node: ASTNode) -> Tuple[ASTNode, ...]:
+    """The children a code generator compiles for node, after checking that
+    node itself can be compiled."""
+    if isinstance(node, UnaryOp):
+        if node.op != 'NOT':
+            raise ValueError(f"Unknown unary op: {node.op}")
+        return (node.operand,)
+
+    if isinstance(node, BinaryOp):
+        return (node.left, node.right)
+
+    if isinstance(node, FuncCall):
+        name, args = node.name, node.args
+        if name == 'IF':
+            if len(args) < 2:
+                raise ValueError("IF requires at least 2 arguments")
+            return args[:3]
+        if name == 'CAST':
+            if len(args) < 1:
+                raise ValueError("CAST requires at least 1 argument")
+            return args[:1]
+        if name in ('NOT', 'LOWER'):
+            if len(args) != 1:
+                raise ValueError(f"{name} requires 1 argument")
+        elif name == 'FIND':
+            if len(args) != 2:
+                raise ValueError("FIND requires 2 arguments")
+        elif name not in ('AND', 'OR'):
+            raise ValueError(f"Unknown function: {name}")
+        return args
+
+    if isinstance(node, Concat):
+        return node.parts
+
+    return ()
+
+
+def _compile_ast(root: ASTNode, handlers: dict, *context) -> str:
+    """Compile an AST bottom-up with an explicit work stack, not recursion.
+
+    handlers maps each node type to a function taking (node, the compiled
+    strings of its children, *context). Nodes are checked and handled in
+    the same order a recursive walk would visit them, so errors match too.
+    """
+    work = [(root, None)]
+    out = []
+    while work:
+        node, children = work.pop()
+        if children is None:
+            if type(node) not in handlers:
+                raise ValueError(f"Unknown AST node type: {type(node)}")
+            children = _compiled_children(node)
+            work.append((node, children))
+            work.extend((child, None) for child in reversed(children))
+        else:
+            start = len(out) - len(children)
+            args = out[start:]
+            del out[start:]
+            out.append(handlers[type(node)](node, args, *context))
+    return out[0]
 
 
 # =============================================================================
 # PYTHON CODE GENERATOR
 # =============================================================================
 
+_PY_COMPARISON_OPS = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+
 def _is_boolean_expr(ast: ASTNode) -> bool:
     """Check if an AST node produces a boolean result."""
     if isinstance(ast, LiteralBool):
@@ -409,14 +609,17 @@ def _is_boolean_expr(ast: ASTNode) -> bool:
         return True
     if isinstance(ast, BinaryOp):
         return True  # Comparisons return bool
-    if isinstance(ast, FuncCall) and ast.name in ('AND', 'OR', 'NOT'):
-        return True
+    if isinstance(ast, FuncCall):
+        if ast.name in ('AND', 'OR', 'NOT', 'FIND'):
+            return True  # FIND compiles to an 'in' test
+        if ast.name == 'IF' and len(ast.args) == 3:
+            # Without an else branch IF yields None, which is not a bool
+            return _is_boolean_expr(ast.args[1]) and _is_boolean_expr(ast.args[2])
     return False
 
 
-def _compile_and_arg(ast: ASTNode) -> str:
-    """Compile an AND/OR argument with appropriate boolean coercion."""
-    compiled = compile_to_python(ast)
+def _and_arg(ast: ASTNode, compiled: str) -> str:
+    """Coerce a compiled AND/OR argument to a boolean where needed."""
     # If it's already a boolean expression, don't wrap with 'is True'
     if _is_boolean_expr(ast):
         return compiled
@@ -424,345 +627,748 @@ def _compile_and_arg(ast: ASTNode) -> str:
     return f'({compiled} is True)'
 
 
+def _py_literal_bool(ast: LiteralBool, args: List[str]) -> str:
+    return 'True' if ast.value else 'False'
+
+
+def _py_literal_int(ast: LiteralInt, args: List[str]) -> str:
+    return str(ast.value)
+
+
+def _py_literal_string(ast: LiteralString, args: List[str]) -> str:
+    return repr(ast.value)
+
+
+def _py_field_ref(ast: FieldRef, args: List[str]) -> str:
+    return to_snake_case(ast.name)
+
+
+def _py_unary_op(ast: UnaryOp, args: List[str]) -> str:
+    operand, = args
+    # For field refs, use 'is not True' for None safety
+    if isinstance(ast.operand, FieldRef):
+        return f'({operand} is not True)'
+    # For other expressions, use regular not
+    return f'(not {operand})'
+
+
+def _py_binary_op(ast: BinaryOp, args: List[str]) -> str:
+    left, right = args
+    return f'({left} {_PY_COMPARISON_OPS[ast.op]} {right})'
+
+
+def _py_and(ast: FuncCall, args: List[str]) -> str:
+    parts = [_and_arg(arg, compiled) for arg, compiled in zip(ast.args, args)]
+    return '(' + ' and '.join(parts) + ')'
+
+
+def _py_or(ast: FuncCall, args: List[str]) -> str:
+    parts = [_and_arg(arg, compiled) for arg, compiled in zip(ast.args, args)]
+    return '(' + ' or '.join(parts) + ')'
+
+
+def _py_if(ast: FuncCall, args: List[str]) -> str:
+    cond, then_val = args[0], args[1]
+    else_val = args[2] if len(args) > 2 else 'None'
+    return f'({then_val} if {cond} else {else_val})'
+
+
+def _py_not(ast: FuncCall, args: List[str]) -> str:
+    return f'({args[0]} is not True)'
+
+
+def _py_lower(ast: FuncCall, args: List[str]) -> str:
+    return f'(({args[0]} or "").lower())'
+
+
+def _py_find(ast: FuncCall, args: List[str]) -> str:
+    needle, haystack = args
+    return f'({needle} in ({haystack} or ""))'
+
+
+def _py_cast(ast: FuncCall, args: List[str]) -> str:
+    # CAST(x AS TEXT) -> str(x) if x else ""
+    arg = args[0]
+    return f'(str({arg}) if {arg} else "")'
+
+
+_PY_FUNCTIONS = {
+    'AND': _py_and,
+    'OR': _py_or,
+    'IF': _py_if,
+    'NOT': _py_not,
+    'LOWER': _py_lower,
+    'FIND': _py_find,
+    'CAST': _py_cast,
+}
+
+
+def _py_func_call(ast: FuncCall, args: List[str]) -> str:
+    return _PY_FUNCTIONS[ast.name](ast, args)
+
+
+def _py_concat(ast: Concat, args: List[str]) -> str:
+    # Use string concatenation to avoid nested f-string issues
+    parts = []
+    for part, compiled in zip(ast.parts, args):
+        if isinstance(part, LiteralString):
+            parts.append(compiled)
+        elif isinstance(part, FieldRef):
+            parts.append(f'str({compiled} or "")')
+        else:
+            # Complex expression - wrap in str() with None handling
+            parts.append(f'str({compiled} if {compiled} is not None else "")')
+    # join builds the result once instead of one intermediate string per +
+    if len(parts) >= 3:
+        return "''.join([" + ', '.join(parts) + '])'
+    return '(' + ' + '.join(parts) + ')'
+
+
+_PY_NODES = {
+    LiteralBool: _py_literal_bool,
+    LiteralInt: _py_literal_int,
+    LiteralString: _py_literal_string,
+    FieldRef: _py_field_ref,
+    UnaryOp: _py_unary_op,
+    BinaryOp: _py_binary_op,
+    FuncCall: _py_func_call,
+    Concat: _py_concat,
+}
+
+
 def compile_to_python(ast: ASTNode) -> str:
     """Compile an AST to a Python expression.
 
     Handles None values by using 'is True' and 'is not True' patterns.
     Field references are converted to snake_case variable names.
     """
-    if isinstance(ast, LiteralBool):
-        return 'True' if ast.value else 'False'
+    return _compile_ast(ast, _PY_NODES)
 
-    if isinstance(ast, LiteralInt):
-        return str(ast.value)
 
-    if isinstance(ast, LiteralString):
-        return repr(ast.value)
+@lru_cache(maxsize=4096)
+def compile_python_str(formula_text: str) -> str:
+    """Parse and compile a formula to a Python expression, cached by formula text."""
+    return compile_to_python(optimize_ast(parse_formula(formula_text)))
 
-    if isinstance(ast, FieldRef):
-        return to_snake_case(ast.name)
 
-    if isinstance(ast, UnaryOp):
-        if ast.op == 'NOT':
-            operand = compile_to_python(ast.operand)
-            # For field refs, use 'is not True' for None safety
-            if isinstance(ast.operand, FieldRef):
-                return f'({operand} is not True)'
-            # For other expressions, use regular not
-            return f'(not {operand})'
-        raise ValueError(f"Unknown unary op: {ast.op}")
+@lru_cache(maxsize=4096)
+def compile_to_callable(formula_text: str):
+    """Compile a formula once into a Python function, cached by formula text.
 
-    if isinstance(ast, BinaryOp):
-        left = compile_to_python(ast.left)
-        right = compile_to_python(ast.right)
-        op_map = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
-        return f'({left} {op_map[ast.op]} {right})'
+    The function takes one keyword argument per referenced field, named in
+    snake_case and defaulting to None, e.g. fn(has_syntax=True).
+    """
+    ast = parse_formula(formula_text)
+    expr = compile_to_python(optimize_ast(ast))
+    params = dict.fromkeys(to_snake_case(dep) for dep in get_field_dependencies(ast))
+    signature = ', '.join(f'{param}=None' for param in params)
+    namespace = {}
+    exec(compile(f'def _formula({signature}):\n    return {expr}\n', '<formula>', 'exec'), namespace)
+    return namespace['_formula']
 
-    if isinstance(ast, FuncCall):
-        if ast.name == 'AND':
-            parts = [_compile_and_arg(arg) for arg in ast.args]
-            return '(' + ' and '.join(parts) + ')'
 
-        if ast.name == 'OR':
-            parts = [_compile_and_arg(arg) for arg in ast.args]
-            return '(' + ' or '.join(parts) + ')'
+def _batch_column(columns: dict, name: str, count: int) -> list:
+    """A column by snake_case name, or all None when the batch lacks it."""
+    column = columns.get(name)
+    return [None] * count if column is None else column
+
+
+@lru_cache(maxsize=4096)
+def compile_to_batch(formula_text: str):
+    """Compile a formula into a column-wise evaluator, cached by formula text.
+
+    The function takes a dict of equal-length lists keyed by snake_case field
+    name (one list per field, as built by from_records in the Python SDK) and
+    returns the formula's value for every row, computed in a single list
+    comprehension over the zipped columns.
+    """
+    ast = parse_formula(formula_text)
+    expr = compile_to_python(optimize_ast(ast))
+    params = list(dict.fromkeys(to_snake_case(dep) for dep in get_field_dependencies(ast)))
+    if params:
+        targets = ''.join(f'{param}, ' for param in params)
+        columns = ', '.join(f'_batch_column(_columns, {param!r}, _count)' for param in params)
+        loop = f'for ({targets}) in zip({columns})'
+    else:
+        loop = 'for _ in range(_count)'
+    src = (
+        'def _formula_batch(_columns):\n'
+        '    _count = len(next(iter(_columns.values()), ()))\n'
+        f'    return [{expr} {loop}]\n'
+    )
+    namespace = {'_batch_column': _batch_column}
+    exec(compile(src, '<formula>', 'exec'), namespace)
+    return namespace['_formula_batch']
+
+
+def compile_bundle(formulas: Dict[str, str]):
+    """Fuse several formulas into one Python function.
+
+    formulas maps field names (PascalCase, as in the rulebook) to formula
+    text. The function takes a dict of raw values keyed by snake_case field
+    name and returns the calculated fields keyed the same way. Each raw field
+    is read once into a local, and formulas referencing other formulas in the
+    bundle use the already-computed local, so they run in dependency order.
+    """
+    return _compile_bundle(tuple(sorted(formulas.items())))
+
+
+@lru_cache(maxsize=256)
+def _compile_bundle(formulas: Tuple[Tuple[str, str], ...]):
+    exprs = {}
+    deps = {}
+    for name, formula_text in formulas:
+        snake = to_snake_case(name)
+        ast = parse_formula(formula_text)
+        exprs[snake] = compile_to_python(optimize_ast(ast))
+        deps[snake] = [to_snake_case(dep) for dep in get_field_dependencies(ast)]
+
+    # Depth-first topological order over the calculated fields
+    order = []
+    state = {}
+
+    def visit(snake: str):
+        if state.get(snake) == 'done':
+            return
+        if state.get(snake) == 'visiting':
+            raise ValueError(f"Circular formula dependency at {snake}")
+        state[snake] = 'visiting'
+        for dep in deps[snake]:
+            if dep in exprs:
+                visit(dep)
+        state[snake] = 'done'
+        order.append(snake)
+
+    for snake in exprs:
+        visit(snake)
+
+    raw_fields = dict.fromkeys(dep for snake in order for dep in deps[snake] if dep not in exprs)
+    lines = ['def _bundle(_values):', '    _get = _values.get']
+    lines += [f'    {field} = _get({field!r})' for field in raw_fields]
+    lines += [f'    {snake} = {exprs[snake]}' for snake in order]
+    lines.append('    return {' + ', '.join(f'{snake!r}: {snake}' for snake in order) + '}')
+    namespace = {}
+    exec(compile('\n'.join(lines) + '\n', '<formula>', 'exec'), namespace)
+    return namespace['_bundle']
 
-        if ast.name == 'IF':
-            if len(ast.args) < 2:
+
+# =============================================================================
+# BYTECODE COMPILER AND VM
+# =============================================================================
+# A formula compiles to a flat list of ints (opcodes, each followed by its
+# argument if it has one) plus a constants list. run_bytecode evaluates it
+# with a list as the operand stack, with the same results as the code from
+# compile_to_python, including its short-circuiting.
+
+OP_PUSH_CONST = 1            # arg: const index
+OP_LOAD_FIELD = 2            # arg: const index of the snake_case field name
+OP_IS_TRUE = 3               # x is True
+OP_IS_NOT_TRUE = 4           # x is not True
+OP_NOT = 5                   # not x
+OP_COMPARE = 6               # arg: index into _BYTECODE_COMPARISONS
+OP_JUMP = 7                  # arg: target
+OP_POP_JUMP_IF_FALSE = 8     # arg: target
+OP_JUMP_IF_FALSE_OR_POP = 9  # arg: target
+OP_JUMP_IF_TRUE_OR_POP = 10  # arg: target
+OP_LOWER = 11                # (x or "").lower()
+OP_FIND = 12                 # needle in (haystack or "")
+OP_CAST = 13                 # str(x) if x else ""
+OP_STR_OR_EMPTY = 14         # str(x or "")
+OP_STR_UNLESS_NONE = 15      # str(x if x is not None else "")
+OP_CONCAT = 16               # arg: part count
+
+_BYTECODE_COMPARISONS = (
+    operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge,
+)
+_BYTECODE_COMPARISON_INDEX = {'=': 0, '<>': 1, '<': 2, '<=': 3, '>': 4, '>=': 5}
+
+
+class _BytecodeBuilder:
+    """Accumulates ops and interned constants for compile_to_bytecode."""
+
+    def __init__(self):
+        self.ops = []
+        self.consts = []
+        self.const_index = {}
+
+    def const(self, value: Any) -> int:
+        # Keyed by type too, so True and 1 get separate slots
+        key = (type(value), value)
+        index = self.const_index.get(key)
+        if index is None:
+            index = self.const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def emit(self, *ops: int):
+        self.ops.extend(ops)
+
+    def emit_jump(self, op: int) -> int:
+        """Emit a jump with a placeholder target; returns the slot to patch."""
+        self.ops.extend((op, -1))
+        return len(self.ops) - 1
+
+    def patch(self, slot: int):
+        """Point the jump at slot to the next op to be emitted."""
+        self.ops[slot] = len(self.ops)
+
+    def compile(self, ast: ASTNode):
+        node_type = type(ast)
+
+        if node_type is LiteralBool or node_type is LiteralInt or node_type is LiteralString:
+            self.emit(OP_PUSH_CONST, self.const(ast.value))
+
+        elif node_type is FieldRef:
+            self.emit(OP_LOAD_FIELD, self.const(to_snake_case(ast.name)))
+
+        elif node_type is UnaryOp:
+            if ast.op != 'NOT':
+                raise ValueError(f"Unknown unary op: {ast.op}")
+            self.compile(ast.operand)
+            self.emit(OP_IS_NOT_TRUE if isinstance(ast.operand, FieldRef) else OP_NOT)
+
+        elif node_type is BinaryOp:
+            self.compile(ast.left)
+            self.compile(ast.right)
+            self.emit(OP_COMPARE, _BYTECODE_COMPARISON_INDEX[ast.op])
+
+        elif node_type is FuncCall:
+            self.compile_call(ast)
+
+        elif node_type is Concat:
+            for part in ast.parts:
+                self.compile(part)
+                if isinstance(part, FieldRef):
+                    self.emit(OP_STR_OR_EMPTY)
+                elif not isinstance(part, LiteralString):
+                    self.emit(OP_STR_UNLESS_NONE)
+            self.emit(OP_CONCAT, len(ast.parts))
+
+        else:
+            raise ValueError(f"Unknown AST node type: {type(ast)}")
+
+    def compile_call(self, ast: FuncCall):
+        name, args = ast.name, ast.args
+
+        if name == 'AND' or name == 'OR':
+            if not args:
+                raise ValueError(f"{name} requires at least 1 argument")
+            jump_op = OP_JUMP_IF_FALSE_OR_POP if name == 'AND' else OP_JUMP_IF_TRUE_OR_POP
+            slots = []
+            for i, arg in enumerate(args):
+                self.compile(arg)
+                if not _is_boolean_expr(arg):
+                    self.emit(OP_IS_TRUE)
+                if i < len(args) - 1:
+                    slots.append(self.emit_jump(jump_op))
+            for slot in slots:
+                self.patch(slot)
+
+        elif name == 'IF':
+            if len(args) < 2:
                 raise ValueError("IF requires at least 2 arguments")
-            cond = compile_to_python(ast.args[0])
-            then_val = compile_to_python(ast.args[1])
-            else_val = compile_to_python(ast.args[2]) if len(ast.args) > 2 else 'None'
-            return f'({then_val} if {cond} else {else_val})'
+            self.compile(args[0])
+            else_slot = self.emit_jump(OP_POP_JUMP_IF_FALSE)
+            self.compile(args[1])
+            end_slot = self.emit_jump(OP_JUMP)
+            self.patch(else_slot)
+            if len(args) > 2:
+                self.compile(args[2])
+            else:
+                self.emit(OP_PUSH_CONST, self.const(None))
+            self.patch(end_slot)
 
-        if ast.name == 'NOT':
-            if len(ast.args) != 1:
+        elif name == 'NOT':
+            if len(args) != 1:
                 raise ValueError("NOT requires 1 argument")
-            operand = compile_to_python(ast.args[0])
-            return f'({operand} is not True)'
+            self.compile(args[0])
+            self.emit(OP_IS_NOT_TRUE)
 
-        if ast.name == 'LOWER':
-            if len(ast.args) != 1:
+        elif name == 'LOWER':
+            if len(args) != 1:
                 raise ValueError("LOWER requires 1 argument")
-            arg = compile_to_python(ast.args[0])
-            return f'(({arg} or "").lower())'
+            self.compile(args[0])
+            self.emit(OP_LOWER)
 
-        if ast.name == 'FIND':
-            if len(ast.args) != 2:
+        elif name == 'FIND':
+            if len(args) != 2:
                 raise ValueError("FIND requires 2 arguments")
-            needle = compile_to_python(ast.args[0])
-            haystack = compile_to_python(ast.args[1])
-            return f'({needle} in ({haystack} or ""))'
+            self.compile(args[0])
+            self.compile(args[1])
+            self.emit(OP_FIND)
 
-        if ast.name == 'CAST':
-            # CAST(x AS TEXT) -> str(x) if x else ""
-            if len(ast.args) >= 1:
-                arg = compile_to_python(ast.args[0])
-                return f'(str({arg}) if {arg} else "")'
-            raise ValueError("CAST requires at least 1 argument")
+        elif name == 'CAST':
+            if len(args) < 1:
+                raise ValueError("CAST requires at least 1 argument")
+            self.compile(args[0])
+            self.emit(OP_CAST)
 
-        raise ValueError(f"Unknown function: {ast.name}")
+        else:
+            raise ValueError(f"Unknown function: {name}")
 
-    if isinstance(ast, Concat):
-        # Use string concatenation to avoid nested f-string issues
-        parts = []
-        for part in ast.parts:
-            if isinstance(part, LiteralString):
-                parts.append(repr(part.value))
-            elif isinstance(part, FieldRef):
-                var = compile_to_python(part)
-                parts.append(f'str({var} or "")')
-            else:
-                # Complex expression - wrap in str() with None handling
-                expr = compile_to_python(part)
-                parts.append(f'str({expr} if {expr} is not None else "")')
-        return '(' + ' + '.join(parts) + ')'
 
-    raise ValueError(f"Unknown AST node type: {type(ast)}")
+def compile_to_bytecode(ast: ASTNode) -> Tuple[List[int], List[Any]]:
+    """Compile an AST to (ops, consts) for run_bytecode."""
+    builder = _BytecodeBuilder()
+    builder.compile(ast)
+    return builder.ops, builder.consts
+
+
+@lru_cache(maxsize=4096)
+def compile_bytecode_str(formula_text: str) -> Tuple[Tuple[int, ...], Tuple[Any, ...]]:
+    """Parse and compile a formula to bytecode, cached by formula text."""
+    ops, consts = compile_to_bytecode(optimize_ast(parse_formula(formula_text)))
+    return tuple(ops), tuple(consts)
+
+
+def run_bytecode(ops, consts, field_values: dict) -> Any:
+    """Evaluate compiled bytecode against field values keyed by snake_case name."""
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    i = 0
+    end = len(ops)
+    while i < end:
+        op = ops[i]
+        i += 1
+        if op == OP_PUSH_CONST:
+            push(consts[ops[i]])
+            i += 1
+        elif op == OP_LOAD_FIELD:
+            push(field_values.get(consts[ops[i]]))
+            i += 1
+        elif op == OP_IS_TRUE:
+            stack[-1] = stack[-1] is True
+        elif op == OP_IS_NOT_TRUE:
+            stack[-1] = stack[-1] is not True
+        elif op == OP_NOT:
+            stack[-1] = not stack[-1]
+        elif op == OP_COMPARE:
+            right = pop()
+            stack[-1] = _BYTECODE_COMPARISONS[ops[i]](stack[-1], right)
+            i += 1
+        elif op == OP_JUMP:
+            i = ops[i]
+        elif op == OP_POP_JUMP_IF_FALSE:
+            i = i + 1 if pop() else ops[i]
+        elif op == OP_JUMP_IF_FALSE_OR_POP:
+            if stack[-1]:
+                pop()
+                i += 1
+            else:
+                i = ops[i]
+        elif op == OP_JUMP_IF_TRUE_OR_POP:
+            if stack[-1]:
+                i = ops[i]
+            else:
+                pop()
+                i += 1
+        elif op == OP_LOWER:
+            stack[-1] = (stack[-1] or "").lower()
+        elif op == OP_FIND:
+            haystack = pop()
+            stack[-1] = stack[-1] in (haystack or "")
+        elif op == OP_CAST:
+            value = stack[-1]
+            stack[-1] = str(value) if value else ""
+        elif op == OP_STR_OR_EMPTY:
+            stack[-1] = str(stack[-1] or "")
+        elif op == OP_STR_UNLESS_NONE:
+            value = stack[-1]
+            stack[-1] = str(value if value is not None else "")
+        elif op == OP_CONCAT:
+            count = ops[i]
+            i += 1
+            parts = stack[-count:]
+            del stack[-count:]
+            push(''.join(parts))
+        else:
+            raise ValueError(f"Unknown opcode {op} at {i - 1}")
+    return stack[-1]
 
 
 # =============================================================================
 # JAVASCRIPT CODE GENERATOR
 # =============================================================================
 
+_JS_COMPARISON_OPS = {'=': '===', '<>': '!==', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+
+
+def _js_literal_bool(ast: LiteralBool, args: List[str], obj_name: str) -> str:
+    return 'true' if ast.value else 'false'
+
+
+def _js_literal_int(ast: LiteralInt, args: List[str], obj_name: str) -> str:
+    return str(ast.value)
+
+
+def _js_literal_string(ast: LiteralString, args: List[str], obj_name: str) -> str:
+    escaped = ast.value.replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _js_field_ref(ast: FieldRef, args: List[str], obj_name: str) -> str:
+    return f'{obj_name}.{to_camel_case(ast.name)}'
+
+
+def _js_unary_op(ast: UnaryOp, args: List[str], obj_name: str) -> str:
+    return f'({args[0]} !== true)'
+
+
+def _js_binary_op(ast: BinaryOp, args: List[str], obj_name: str) -> str:
+    left, right = args
+    return f'({left} {_JS_COMPARISON_OPS[ast.op]} {right})'
+
+
+def _js_and(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    parts = [f'({compiled} === true)' for compiled in args]
+    return '(' + ' && '.join(parts) + ')'
+
+
+def _js_or(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    parts = [f'({compiled} === true)' for compiled in args]
+    return '(' + ' || '.join(parts) + ')'
+
+
+def _js_if(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    cond, then_val = args[0], args[1]
+    else_val = args[2] if len(args) > 2 else 'null'
+    return f'({cond} ? {then_val} : {else_val})'
+
+
+def _js_not(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    return f'({args[0]} !== true)'
+
+
+def _js_lower(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    return f'(({args[0]} || "").toLowerCase())'
+
+
+def _js_find(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    needle, haystack = args
+    return f'(({haystack} || "").includes({needle}))'
+
+
+def _js_cast(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    arg = args[0]
+    return f'({arg} ? String({arg}) : "")'
+
+
+_JS_FUNCTIONS = {
+    'AND': _js_and,
+    'OR': _js_or,
+    'IF': _js_if,
+    'NOT': _js_not,
+    'LOWER': _js_lower,
+    'FIND': _js_find,
+    'CAST': _js_cast,
+}
+
+
+def _js_func_call(ast: FuncCall, args: List[str], obj_name: str) -> str:
+    return _JS_FUNCTIONS[ast.name](ast, args, obj_name)
+
+
+def _js_concat(ast: Concat, args: List[str], obj_name: str) -> str:
+    parts = []
+    for part, compiled in zip(ast.parts, args):
+        if isinstance(part, LiteralString):
+            escaped = part.value.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
+            parts.append(escaped)
+        else:
+            parts.append('${' + f'{compiled} || ""' + '}')
+    return '`' + ''.join(parts) + '`'
+
+
+_JS_NODES = {
+    LiteralBool: _js_literal_bool,
+    LiteralInt: _js_literal_int,
+    LiteralString: _js_literal_string,
+    FieldRef: _js_field_ref,
+    UnaryOp: _js_unary_op,
+    BinaryOp: _js_binary_op,
+    FuncCall: _js_func_call,
+    Concat: _js_concat,
+}
+
+
 def compile_to_javascript(ast: ASTNode, obj_name: str = 'candidate') -> str:
     """Compile an AST to a JavaScript expression.
 
     Uses explicit === true / !== true for proper null handling.
     Field references use camelCase with object prefix.
     """
-    if isinstance(ast, LiteralBool):
-        return 'true' if ast.value else 'false'
+    return _compile_ast(ast, _JS_NODES, obj_name)
 
-    if isinstance(ast, LiteralInt):
-        return str(ast.value)
 
-    if isinstance(ast, LiteralString):
-        escaped = ast.value.replace('\\', '\\\\').replace("'", "\\'")
-        return f"'{escaped}'"
+@lru_cache(maxsize=4096)
+def compile_javascript_str(formula_text: str, obj_name: str = 'candidate') -> str:
+    """Parse and compile a formula to a JavaScript expression, cached by formula text."""
+    return compile_to_javascript(optimize_ast(parse_formula(formula_text)), obj_name)
 
-    if isinstance(ast, FieldRef):
-        return f'{obj_name}.{to_camel_case(ast.name)}'
 
-    if isinstance(ast, UnaryOp):
-        if ast.op == 'NOT':
-            operand = compile_to_javascript(ast.operand, obj_name)
-            return f'({operand} !== true)'
-        raise ValueError(f"Unknown unary op: {ast.op}")
+# =============================================================================
+# GO CODE GENERATOR
+# =============================================================================
 
-    if isinstance(ast, BinaryOp):
-        left = compile_to_javascript(ast.left, obj_name)
-        right = compile_to_javascript(ast.right, obj_name)
-        op_map = {'=': '===', '<>': '!==', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
-        return f'({left} {op_map[ast.op]} {right})'
+_GO_COMPARISON_OPS = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
+_GO_EQUALITY_OPS = {'=': '==', '<>': '!='}
 
-    if isinstance(ast, FuncCall):
-        if ast.name == 'AND':
-            parts = [f'({compile_to_javascript(arg, obj_name)} === true)' for arg in ast.args]
-            return '(' + ' && '.join(parts) + ')'
 
-        if ast.name == 'OR':
-            parts = [f'({compile_to_javascript(arg, obj_name)} === true)' for arg in ast.args]
-            return '(' + ' || '.join(parts) + ')'
+def _go_literal_bool(ast: LiteralBool, args: List[str], struct_name: str) -> str:
+    return 'true' if ast.value else 'false'
 
-        if ast.name == 'IF':
-            if len(ast.args) < 2:
-                raise ValueError("IF requires at least 2 arguments")
-            cond = compile_to_javascript(ast.args[0], obj_name)
-            then_val = compile_to_javascript(ast.args[1], obj_name)
-            else_val = compile_to_javascript(ast.args[2], obj_name) if len(ast.args) > 2 else 'null'
-            return f'({cond} ? {then_val} : {else_val})'
 
-        if ast.name == 'NOT':
-            if len(ast.args) != 1:
-                raise ValueError("NOT requires 1 argument")
-            operand = compile_to_javascript(ast.args[0], obj_name)
-            return f'({operand} !== true)'
+def _go_literal_int(ast: LiteralInt, args: List[str], struct_name: str) -> str:
+    return str(ast.value)
 
-        if ast.name == 'LOWER':
-            if len(ast.args) != 1:
-                raise ValueError("LOWER requires 1 argument")
-            arg = compile_to_javascript(ast.args[0], obj_name)
-            return f'(({arg} || "").toLowerCase())'
 
-        if ast.name == 'FIND':
-            if len(ast.args) != 2:
-                raise ValueError("FIND requires 2 arguments")
-            needle = compile_to_javascript(ast.args[0], obj_name)
-            haystack = compile_to_javascript(ast.args[1], obj_name)
-            return f'(({haystack} || "").includes({needle}))'
+def _go_literal_string(ast: LiteralString, args: List[str], struct_name: str) -> str:
+    escaped = ast.value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
 
-        if ast.name == 'CAST':
-            if len(ast.args) >= 1:
-                arg = compile_to_javascript(ast.args[0], obj_name)
-                return f'({arg} ? String({arg}) : "")'
-            raise ValueError("CAST requires at least 1 argument")
 
-        raise ValueError(f"Unknown function: {ast.name}")
+def _go_field_ref(ast: FieldRef, args: List[str], struct_name: str) -> str:
+    # Go struct fields are PascalCase
+    field_name = ast.name  # Already PascalCase in rulebook
+    return f'{struct_name}.{field_name}'
 
-    if isinstance(ast, Concat):
-        parts = []
-        for part in ast.parts:
-            if isinstance(part, LiteralString):
-                escaped = part.value.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
-                parts.append(escaped)
-            else:
-                var = compile_to_javascript(part, obj_name)
-                parts.append('${' + f'{var} || ""' + '}')
-        return '`' + ''.join(parts) + '`'
 
-    raise ValueError(f"Unknown AST node type: {type(ast)}")
+def _go_unary_op(ast: UnaryOp, args: List[str], struct_name: str) -> str:
+    operand, = args
+    # Wrap in boolVal for nil-safe access
+    if isinstance(ast.operand, FieldRef):
+        return f'!boolVal({operand})'
+    return f'!({operand})'
 
 
-# =============================================================================
-# GO CODE GENERATOR
-# =============================================================================
+def _go_binary_op(ast: BinaryOp, args: List[str], struct_name: str) -> str:
+    left, right = args
+    # Handle comparisons involving field refs (pointer fields in Go)
+    if isinstance(ast.left, FieldRef) and isinstance(ast.right, FieldRef):
+        # Both sides are field refs - wrap both in boolVal for nil-safe comparison
+        return f'(boolVal({left}) {_GO_COMPARISON_OPS[ast.op]} boolVal({right}))'
 
-def compile_to_go(ast: ASTNode, struct_name: str = 'lc') -> str:
-    """Compile an AST to a Go expression.
+    if isinstance(ast.left, FieldRef) and isinstance(ast.right, LiteralInt):
+        # Field ref compared to integer - need nil check and dereference
+        left_field = ast.left.name
+        op_go = _GO_COMPARISON_OPS[ast.op]
+        if ast.op == '=':
+            return f'({struct_name}.{left_field} != nil && *{struct_name}.{left_field} == {right})'
+        elif ast.op == '<>':
+            return f'({struct_name}.{left_field} == nil || *{struct_name}.{left_field} != {right})'
+        else:
+            # For <, <=, >, >= - nil is treated as false (0 comparison semantics)
+            return f'({struct_name}.{left_field} != nil && *{struct_name}.{left_field} {op_go} {right})'
 
-    Uses boolVal() helper for nil-safe boolean access.
-    Field references use PascalCase struct field names.
-    """
-    if isinstance(ast, LiteralBool):
-        return 'true' if ast.value else 'false'
+    if isinstance(ast.left, FieldRef) and isinstance(ast.right, LiteralBool):
+        # Field ref compared to boolean literal - use boolVal for nil-safe access
+        return f'(boolVal({left}) {_GO_EQUALITY_OPS[ast.op]} {right})'
 
-    if isinstance(ast, LiteralInt):
-        return str(ast.value)
+    return f'({left} {_GO_COMPARISON_OPS[ast.op]} {right})'
 
-    if isinstance(ast, LiteralString):
-        escaped = ast.value.replace('\\', '\\\\').replace('"', '\\"')
-        return f'"{escaped}"'
 
-    if isinstance(ast, FieldRef):
-        # Go struct fields are PascalCase
-        field_name = ast.name  # Already PascalCase in rulebook
-        return f'{struct_name}.{field_name}'
+def _go_and(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    parts = []
+    for arg, compiled in zip(ast.args, args):
+        if isinstance(arg, FieldRef):
+            parts.append(f'boolVal({compiled})')
+        else:
+            # NOT and binary ops handle their own nil checks
+            parts.append(compiled)
+    return '(' + ' && '.join(parts) + ')'
 
-    if isinstance(ast, UnaryOp):
-        if ast.op == 'NOT':
-            operand = compile_to_go(ast.operand, struct_name)
-            # Wrap in boolVal for nil-safe access
-            if isinstance(ast.operand, FieldRef):
-                return f'!boolVal({operand})'
-            return f'!({operand})'
-        raise ValueError(f"Unknown unary op: {ast.op}")
 
-    if isinstance(ast, BinaryOp):
-        # Handle comparisons involving field refs (pointer fields in Go)
-        if isinstance(ast.left, FieldRef) and isinstance(ast.right, FieldRef):
-            # Both sides are field refs - wrap both in boolVal for nil-safe comparison
-            left = compile_to_go(ast.left, struct_name)
-            right = compile_to_go(ast.right, struct_name)
-            op_map = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
-            return f'(boolVal({left}) {op_map[ast.op]} boolVal({right}))'
-
-        if isinstance(ast.left, FieldRef) and isinstance(ast.right, LiteralInt):
-            # Field ref compared to integer - need nil check and dereference
-            left_field = ast.left.name
-            right = compile_to_go(ast.right, struct_name)
-            op_go = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}[ast.op]
-            if ast.op == '=':
-                return f'({struct_name}.{left_field} != nil && *{struct_name}.{left_field} == {right})'
-            elif ast.op == '<>':
-                return f'({struct_name}.{left_field} == nil || *{struct_name}.{left_field} != {right})'
-            else:
-                # For <, <=, >, >= - nil is treated as false (0 comparison semantics)
-                return f'({struct_name}.{left_field} != nil && *{struct_name}.{left_field} {op_go} {right})'
+def _go_or(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    parts = []
+    for arg, compiled in zip(ast.args, args):
+        if isinstance(arg, FieldRef):
+            parts.append(f'boolVal({compiled})')
+        else:
+            parts.append(compiled)
+    return '(' + ' || '.join(parts) + ')'
 
-        if isinstance(ast.left, FieldRef) and isinstance(ast.right, LiteralBool):
-            # Field ref compared to boolean literal - use boolVal for nil-safe access
-            left = compile_to_go(ast.left, struct_name)
-            right = compile_to_go(ast.right, struct_name)
-            op_map = {'=': '==', '<>': '!='}
-            return f'(boolVal({left}) {op_map[ast.op]} {right})'
 
-        left = compile_to_go(ast.left, struct_name)
-        right = compile_to_go(ast.right, struct_name)
-        op_map = {'=': '==', '<>': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>='}
-        return f'({left} {op_map[ast.op]} {right})'
+def _go_if(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    cond, then_val = args[0], args[1]
+    else_val = args[2] if len(args) > 2 else '""'
+    # Go doesn't have ternary - generate inline func
+    return f'func() string {{ if {cond} {{ return {then_val} }}; return {else_val} }}()'
 
-    if isinstance(ast, FuncCall):
-        if ast.name == 'AND':
-            parts = []
-            for arg in ast.args:
-                compiled = compile_to_go(arg, struct_name)
-                if isinstance(arg, FieldRef):
-                    parts.append(f'boolVal({compiled})')
-                elif isinstance(arg, UnaryOp) and arg.op == 'NOT':
-                    # NOT already handles boolVal
-                    parts.append(compiled)
-                elif isinstance(arg, BinaryOp):
-                    # Binary ops handle their own nil checks
-                    parts.append(compiled)
-                else:
-                    parts.append(compiled)
-            return '(' + ' && '.join(parts) + ')'
-
-        if ast.name == 'OR':
-            parts = []
-            for arg in ast.args:
-                compiled = compile_to_go(arg, struct_name)
-                if isinstance(arg, FieldRef):
-                    parts.append(f'boolVal({compiled})')
-                else:
-                    parts.append(compiled)
-            return '(' + ' || '.join(parts) + ')'
 
-        if ast.name == 'IF':
-            if len(ast.args) < 2:
-                raise ValueError("IF requires at least 2 arguments")
-            cond = compile_to_go(ast.args[0], struct_name)
-            then_val = compile_to_go(ast.args[1], struct_name)
-            else_val = compile_to_go(ast.args[2], struct_name) if len(ast.args) > 2 else '""'
-            # Go doesn't have ternary - generate inline func
-            return f'func() string {{ if {cond} {{ return {then_val} }}; return {else_val} }}()'
-
-        if ast.name == 'NOT':
-            if len(ast.args) != 1:
-                raise ValueError("NOT requires 1 argument")
-            operand = compile_to_go(ast.args[0], struct_name)
-            if isinstance(ast.args[0], FieldRef):
-                return f'!boolVal({operand})'
-            return f'!({operand})'
+def _go_not(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    operand = args[0]
+    if isinstance(ast.args[0], FieldRef):
+        return f'!boolVal({operand})'
+    return f'!({operand})'
 
-        if ast.name == 'LOWER':
-            if len(ast.args) != 1:
-                raise ValueError("LOWER requires 1 argument")
-            arg = compile_to_go(ast.args[0], struct_name)
-            return f'strings.ToLower(stringVal({arg}))'
 
-        if ast.name == 'FIND':
-            if len(ast.args) != 2:
-                raise ValueError("FIND requires 2 arguments")
-            needle = compile_to_go(ast.args[0], struct_name)
-            haystack = compile_to_go(ast.args[1], struct_name)
-            return f'strings.Contains(stringVal({haystack}), {needle})'
+def _go_lower(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    return f'strings.ToLower(stringVal({args[0]}))'
 
-        if ast.name == 'CAST':
-            if len(ast.args) >= 1:
-                arg = compile_to_go(ast.args[0], struct_name)
-                if isinstance(ast.args[0], FieldRef):
-                    return f'boolToString(boolVal({arg}))'
-                return f'fmt.Sprintf("%v", {arg})'
-            raise ValueError("CAST requires at least 1 argument")
 
-        raise ValueError(f"Unknown function: {ast.name}")
+def _go_find(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    needle, haystack = args
+    return f'strings.Contains(stringVal({haystack}), {needle})'
+
+
+def _go_cast(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    arg = args[0]
+    if isinstance(ast.args[0], FieldRef):
+        return f'boolToString(boolVal({arg}))'
+    return f'fmt.Sprintf("%v", {arg})'
+
+
+_GO_FUNCTIONS = {
+    'AND': _go_and,
+    'OR': _go_or,
+    'IF': _go_if,
+    'NOT': _go_not,
+    'LOWER': _go_lower,
+    'FIND': _go_find,
+    'CAST': _go_cast,
+}
+
+
+def _go_func_call(ast: FuncCall, args: List[str], struct_name: str) -> str:
+    return _GO_FUNCTIONS[ast.name](ast, args, struct_name)
+
+
+def _go_concat(ast: Concat, args: List[str], struct_name: str) -> str:
+    parts = []
+    for part, compiled in zip(ast.parts, args):
+        if isinstance(part, FieldRef):
+            parts.append(f'stringVal({compiled})')
+        else:
+            # String literals compile to quoted Go strings already
+            parts.append(compiled)
+    if len(parts) == 1:
+        return parts[0]
+    return ' + '.join(parts)
+
+
+_GO_NODES = {
+    LiteralBool: _go_literal_bool,
+    LiteralInt: _go_literal_int,
+    LiteralString: _go_literal_string,
+    FieldRef: _go_field_ref,
+    UnaryOp: _go_unary_op,
+    BinaryOp: _go_binary_op,
+    FuncCall: _go_func_call,
+    Concat: _go_concat,
+}
+
+
+def compile_to_go(ast: ASTNode, struct_name: str = 'lc') -> str:
+    """Compile an AST to a Go expression.
+
+    Uses boolVal() helper for nil-safe boolean access.
+    Field references use PascalCase struct field names.
+    """
+    return _compile_ast(ast, _GO_NODES, struct_name)
 
-    if isinstance(ast, Concat):
-        parts = []
-        for part in ast.parts:
-            if isinstance(part, LiteralString):
-                escaped = part.value.replace('\\', '\\\\').replace('"', '\\"')
-                parts.append(f'"{escaped}"')
-            else:
-                var = compile_to_go(part, struct_name)
-                if isinstance(part, FieldRef):
-                    parts.append(f'stringVal({var})')
-                else:
-                    parts.append(var)
-        if len(parts) == 1:
-            return parts[0]
-        return ' + '.join(parts)
 
-    raise ValueError(f"Unknown AST node type: {type(ast)}")
+@lru_cache(maxsize=4096)
+def compile_go_str(formula_text: str, struct_name: str = 'lc') -> str:
+    """Parse and compile a formula to a Go expression, cached by formula text."""
+    return compile_to_go(optimize_ast(parse_formula(formula_text)), struct_name)
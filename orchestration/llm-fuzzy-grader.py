@@ -17,6 +17,13 @@ import argparse
 from pathlib import Path
 from typing import Optional
 
+# Try to import pyarrow to read the Feather copies of the test data (optional)
+try:
+    from pyarrow import feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -39,6 +46,17 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 TESTING_DIR = os.path.join(PROJECT_ROOT, "testing")
 ANSWER_KEY_PATH = os.path.join(TESTING_DIR, "answer-key.json")
 BLANK_TEST_PATH = os.path.join(TESTING_DIR, "blank-test.json")
+ANSWER_KEY_FEATHER_PATH = os.path.join(TESTING_DIR, "answer-key.feather")
+BLANK_TEST_FEATHER_PATH = os.path.join(TESTING_DIR, "blank-test.feather")
+
+
+def load_records(json_path: str, feather_path: str) -> list:
+    """Load test records, preferring the Feather copy when it is up to date."""
+    if (PYARROW_AVAILABLE and os.path.exists(feather_path)
+            and os.path.getmtime(feather_path) >= os.path.getmtime(json_path)):
+        return feather.read_table(feather_path).to_pylist()
+    with open(json_path, 'r') as f:
+        return json.load(f)
 
 
 # =============================================================================
@@ -372,11 +390,8 @@ def grade_fuzzy(
 
     # Load test data
     print("Loading test data...")
-    with open(BLANK_TEST_PATH, 'r') as f:
-        blank_test = json.load(f)
-
-    with open(ANSWER_KEY_PATH, 'r') as f:
-        answer_key = json.load(f)
+    blank_test = load_records(BLANK_TEST_PATH, BLANK_TEST_FEATHER_PATH)
+    answer_key = load_records(ANSWER_KEY_PATH, ANSWER_KEY_FEATHER_PATH)
 
     # Index answer key by primary key
     answer_key_by_pk = {str(r[PRIMARY_KEY]): r for r in answer_key}
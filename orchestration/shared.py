@@ -5,10 +5,20 @@ All inject-into-*.py scripts use these common utilities.
 """
 
 import json
+import mmap
 import os
+import pickle
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 
+# Try to import orjson for faster rulebook parsing (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 def get_rulebook_path():
     """Get the path to the effortless-rulebook.json file.
@@ -20,14 +30,65 @@ def get_rulebook_path():
 
 
 def load_rulebook():
-    """Load and parse the effortless-rulebook.json file."""
+    """Load and parse the effortless-rulebook.json file.
+
+    The parsed rulebook is cached by resolved path, so generators that run
+    in the same process share one parse. Treat the result as read-only.
+    """
     rulebook_path = get_rulebook_path()
 
     if not rulebook_path.exists():
         raise FileNotFoundError(f"Rulebook not found at {rulebook_path}")
 
-    with open(rulebook_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return _load_rulebook_cached(rulebook_path.resolve())
+
+
+@lru_cache(maxsize=4)
+def _load_rulebook_cached(rulebook_path: Path):
+    # Opt-in on-disk cache: a pickle next to the JSON, reused while it is
+    # at least as new as the JSON
+    pickle_path = rulebook_path.with_suffix('.pkl')
+    use_pickle = os.environ.get('ERB_RULEBOOK_CACHE') == '1'
+    if use_pickle:
+        try:
+            if pickle_path.stat().st_mtime >= rulebook_path.stat().st_mtime:
+                with open(pickle_path, 'rb') as f:
+                    return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+    with open(rulebook_path, 'rb') as f:
+        raw = f.read()
+    rulebook = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+    if use_pickle:
+        # Write then rename, so parallel generators never read a partial file
+        tmp_path = pickle_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(rulebook, f, protocol=5)
+            os.replace(tmp_path, pickle_path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    return rulebook
+
+
+def load_json_file(path):
+    """Parse a JSON file such as blank-test.json or test-answers.json.
+
+    With orjson the file is memory-mapped and parsed straight from the
+    mapping, without first reading it into a bytes object.
+    """
+    with open(path, 'rb') as f:
+        if not ORJSON_AVAILABLE:
+            return json.load(f)
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return orjson.loads(f.read())
+        with mapped, memoryview(mapped) as view:
+            return orjson.loads(view)
 
 
 def ensure_output_folder():
@@ -70,8 +131,7 @@ Generated from: `effortless-rulebook/effortless-rulebook.json`
 
 """
 
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    readme_path.write_text(content, encoding='utf-8')
 
     print(f"Created {readme_path}")
     return readme_path
@@ -142,7 +202,9 @@ def handle_clean_arg(generated_files: list, description: str = None):
         print(f"=" * 60)
         print(f"CLEAN MODE: {substrate_name.upper()}")
         print(f"=" * 60)
-        clean_generated_files(generated_files, substrate_name)
+        # Also forget the orchestrator's record of the last run, so the next
+        # substrate-orchestrator.py run regenerates what was just removed
+        clean_generated_files([*generated_files, ".last_hash"], substrate_name)
         return True
 
     return False
@@ -10,25 +10,20 @@ Usage:
     python substrate-orchestrator.py                  # Run all generators
     python substrate-orchestrator.py python owl       # Run specific generators
     python substrate-orchestrator.py --list           # List available generators
+    python substrate-orchestrator.py --force python   # Rerun even if inputs are unchanged
 """
 
-import subprocess
+import hashlib
+import json
+import os
+import runpy
 import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-GENERATORS = [
-    "python",
-    "english",
-    "golang",
-    "binary",
-    "csv",
-    "uml",
-    "owl",
-    "rdf",
-    "graphql",
-    "docx",
-]
-
 
 def get_orchestration_dir():
     """Get the orchestration directory path."""
@@ -40,19 +35,65 @@ def get_project_root():
     return get_orchestration_dir().parent
 
 
-def run_generator(name):
-    """Run a single generator by name."""
-    orchestration_dir = get_orchestration_dir()
-    project_root = get_project_root()
+def find_generator_scripts():
+    """Map each generator name to its script.
+
+    Every generator lives next to its output, as
+    execution-substratrates/{name}/inject-into-{name}.py.
+    """
+    substrates_dir = get_project_root() / "execution-substratrates"
+    return {
+        path.parent.name: path
+        for path in sorted(substrates_dir.glob("*/inject-into-*.py"))
+        if path.name == f"inject-into-{path.parent.name}.py"
+    }
+
+
+GENERATOR_SCRIPTS = find_generator_scripts()
+GENERATORS = list(GENERATOR_SCRIPTS)
+
+# Written next to each generator's output after a successful run; removed
+# by --clean (see shared.handle_clean_arg)
+LAST_HASH_FILE = ".last_hash"
 
-    script_path = orchestration_dir / "injection-scripts" / f"inject-into-{name}.py"
-    if not script_path.exists():
-        print(f"Error: Generator script not found: {script_path}")
+
+def get_input_hash(script_path):
+    """Hash everything a generator reads: the rulebook, its script and the shared code.
+
+    Returns None if an input is missing, so the generator runs and reports it.
+    """
+    orchestration_dir = get_orchestration_dir()
+    inputs = [
+        get_project_root() / "effortless-rulebook" / "effortless-rulebook.json",
+        script_path,
+        orchestration_dir / "shared.py",
+        orchestration_dir / "formula_parser.py",
+    ]
+    digest = hashlib.blake2b()
+    try:
+        for path in inputs:
+            digest.update(path.read_bytes())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def run_generator(name, force=False):
+    """Run a single generator by name, unless its inputs are unchanged since its last success."""
+    script_path = GENERATOR_SCRIPTS.get(name)
+    if script_path is None:
+        print(f"Error: No generator script for: {name}")
         return False
 
-    # Create the execution-substratrates/{name} folder if it doesn't exist
-    candidate_dir = project_root / "execution-substratrates" / name
-    candidate_dir.mkdir(parents=True, exist_ok=True)
+    candidate_dir = script_path.parent
+
+    hash_path = candidate_dir / LAST_HASH_FILE
+    input_hash = get_input_hash(script_path)
+    last_run = read_last_run(hash_path)
+    if (not force and input_hash is not None and last_run.get("hash") == input_hash
+            and all((candidate_dir / output).exists() for output in last_run.get("outputs", ()))):
+        print(f"{name}: cached, skipping")
+        return True
 
     # Run the generator from the candidate directory
     print(f"\n{'='*60}")
@@ -60,13 +101,82 @@ def run_generator(name):
     print(f"Working dir: {candidate_dir}")
     print(f"{'='*60}")
 
-    result = subprocess.run(
-        [sys.executable, str(script_path)],
-        cwd=str(candidate_dir),
-        capture_output=False,
-    )
+    # Filesystem timestamps can be coarse, so allow a second of slack
+    start_time = time.time() - 1
+    success = run_script(script_path, candidate_dir, force)
+    if success and input_hash is not None:
+        # Outputs are the files this run wrote, plus earlier outputs it
+        # left untouched (generators may skip rewriting unchanged files)
+        outputs = {
+            path.name for path in candidate_dir.iterdir()
+            if path.is_file() and path.name != LAST_HASH_FILE and path.stat().st_mtime >= start_time
+        }
+        outputs.update(output for output in last_run.get("outputs", ()) if (candidate_dir / output).exists())
+        hash_path.write_text(json.dumps({"hash": input_hash, "outputs": sorted(outputs)}))
+    return success
+
+
+def run_generator_captured(name, force=False):
+    """Run a generator in a pool worker, returning (success, captured output).
+
+    Output is captured at the file descriptor level, so it includes what
+    the generator's own subprocesses print.
+    """
+    with tempfile.TemporaryFile() as log:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = os.dup(1), os.dup(2)
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        try:
+            success = run_generator(name, force)
+        except Exception:
+            traceback.print_exc()
+            success = False
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+        log.seek(0)
+        return success, log.read().decode(errors="replace")
+
+
+def read_last_run(hash_path):
+    """Read the input hash and output list recorded by a generator's last successful run."""
+    try:
+        last_run = json.loads(hash_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return last_run if isinstance(last_run, dict) else {}
+
+
+def run_script(script_path, candidate_dir, force=False):
+    """Run a generator script as __main__ from candidate_dir; returns True on success.
+
+    With force, the script also sees --force, for generators that keep
+    unchanged outputs of their own.
+    """
+    # Run in-process so generators run by the same process share one
+    # interpreter and the rulebook cache in orchestration.shared
+    saved_cwd = os.getcwd()
+    saved_argv = sys.argv
+    os.chdir(candidate_dir)
+    sys.argv = [str(script_path), "--force"] if force else [str(script_path)]
+    try:
+        runpy.run_path(str(script_path), run_name="__main__")
+    except SystemExit as e:
+        return e.code in (None, 0)
+    except Exception:
+        traceback.print_exc()
+        return False
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
 
-    return result.returncode == 0
+    return True
 
 
 def main():
@@ -76,22 +186,36 @@ def main():
             print(f"  - {name}")
         return
 
+    args = sys.argv[1:]
+    force = "--force" in args
+    args = [arg for arg in args if arg != "--force"]
+
     # Determine which generators to run
-    if len(sys.argv) > 1:
-        targets = sys.argv[1:]
-        for target in targets:
-            if target not in GENERATORS:
-                print(f"Unknown generator: {target}")
-                print(f"Available: {', '.join(GENERATORS)}")
-                sys.exit(1)
+    if args:
+        # Drop repeats so no two workers generate into the same folder
+        targets = list(dict.fromkeys(args))
+        unknown = [target for target in targets if target not in GENERATOR_SCRIPTS]
+        if unknown:
+            print(f"Unknown generator: {', '.join(unknown)}")
+            print(f"Available: {', '.join(GENERATORS)}")
+            sys.exit(1)
     else:
         targets = GENERATORS
 
-    # Run the generators
+    # Run the generators in parallel; they write to separate folders and
+    # only read the rulebook. Each worker process keeps its own cwd and its
+    # own rulebook cache, shared by the generators it runs. A generator's
+    # output is printed as one block when it finishes, not interleaved.
     results = {}
-    for name in targets:
-        success = run_generator(name)
-        results[name] = success
+    max_workers = min(len(targets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_generator_captured, name, force): name for name in targets}
+        for future in as_completed(futures):
+            success, output = future.result()
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            results[futures[future]] = success
+    results = {name: results[name] for name in targets}
 
     # Summary
     print(f"\n{'='*60}")
@@ -6,15 +6,36 @@
 # Compares field-by-field - no domain-specific logic in the evaluation.
 # =============================================================================
 
+import asyncio
+import atexit
 import json
 import os
-import subprocess
+import signal
 import sys
 import time
+from collections import Counter
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+import psycopg2.extensions
+import psycopg2.pool
+
+# Try to import orjson for faster JSON export (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import pyarrow for Feather copies of the answer key (optional)
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 # =============================================================================
 # CONFIGURATION
@@ -42,16 +63,24 @@ COMPUTED_COLUMNS = [
     "relationship_to_concept",
     "is_open_closed_world_conflicted",
 ]
+BLANK_COMPUTED_VALUES = dict.fromkeys(COMPUTED_COLUMNS)
 
-# Paths
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-TESTING_DIR = os.path.join(PROJECT_ROOT, "testing")
-SUBSTRATES_DIR = os.path.join(PROJECT_ROOT, "execution-substratrates")
+# Maximum number of substrate tests running at once (1 runs them serially)
+MAX_CONCURRENT_TESTS = int(os.environ.get("MAX_CONCURRENT_TESTS", min(8, os.cpu_count() or 1)))
 
-ANSWER_KEY_PATH = os.path.join(TESTING_DIR, "answer-key.json")
-BLANK_TEST_PATH = os.path.join(TESTING_DIR, "blank-test.json")
-SUMMARY_PATH = os.path.join(SCRIPT_DIR, "all-tests-results.md")
+# Paths
+# Resolved once at import; everything below reuses these Path objects
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+TESTING_DIR = PROJECT_ROOT / "testing"
+SUBSTRATES_DIR = PROJECT_ROOT / "execution-substratrates"
+
+ANSWER_KEY_PATH = TESTING_DIR / "answer-key.json"
+BLANK_TEST_PATH = TESTING_DIR / "blank-test.json"
+# Feather copies for Python readers; substrates keep reading the JSON files
+ANSWER_KEY_FEATHER_PATH = TESTING_DIR / "answer-key.feather"
+BLANK_TEST_FEATHER_PATH = TESTING_DIR / "blank-test.feather"
+SUMMARY_PATH = SCRIPT_DIR / "all-tests-results.md"
 
 # ANSI color codes for terminal output
 GREEN = "\033[92m"
@@ -69,6 +98,25 @@ WHITE_TEXT = "\033[97m"         # White text
 STRIKETHROUGH = "\033[9m"       # Strikethrough text
 DIM = "\033[2m"                 # Dim text
 
+# Row background and icon for a passing (True) or failing (False) column
+ROW_STYLES = {True: (GREEN_BG, "✓"), False: (RED_BG, "✗")}
+
+
+# Score colors by 10-point bucket: index 0 is below 10%, index 10 is 100%
+SCORE_COLORS = tuple(f"\033[38;5;{code}m" for code in (
+    196,  # Pure red
+    202,  # Red-orange
+    208,  # Dark orange
+    214,  # Orange
+    220,  # Orange-yellow
+    226,  # Yellow
+    190,  # Yellow-ish green
+    154,  # More yellow-green
+    118,  # Yellow-green
+    82,   # Light green
+    46,   # Bright green
+))
+
 
 def get_score_color(score: float) -> str:
     """
@@ -76,28 +124,63 @@ def get_score_color(score: float) -> str:
     0% = pure red, 50% = yellow, 100% = pure green
     Uses 256-color palette for smooth gradient.
     """
-    if score >= 100:
-        return "\033[38;5;46m"   # Bright green
-    elif score >= 90:
-        return "\033[38;5;82m"   # Light green
-    elif score >= 80:
-        return "\033[38;5;118m"  # Yellow-green
-    elif score >= 70:
-        return "\033[38;5;154m"  # More yellow-green
-    elif score >= 60:
-        return "\033[38;5;190m"  # Yellow-ish green
-    elif score >= 50:
-        return "\033[38;5;226m"  # Yellow
-    elif score >= 40:
-        return "\033[38;5;220m"  # Orange-yellow
-    elif score >= 30:
-        return "\033[38;5;214m"  # Orange
-    elif score >= 20:
-        return "\033[38;5;208m"  # Dark orange
-    elif score >= 10:
-        return "\033[38;5;202m"  # Red-orange
-    else:
-        return "\033[38;5;196m"  # Pure red
+    return SCORE_COLORS[min(10, max(0, int(score // 10)))]
+
+
+def write_json(records, path):
+    """Serialize records in memory, then write the file with a single call."""
+    if ORJSON_AVAILABLE:
+        # Datetimes go through default=str like json.dumps, not ISO 8601
+        payload = orjson.dumps(
+            records,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str,
+        )
+        path.write_bytes(payload)
+        return
+    path.write_text(json.dumps(records, indent=2, default=str))
+
+
+def write_feather(records, path):
+    """Write records to a zstd Feather file next to the JSON, if pyarrow is installed."""
+    if not PYARROW_AVAILABLE:
+        return
+    try:
+        feather.write_feather(pa.Table.from_pylist(records), path, compression="zstd")
+    except (pa.ArrowException, OSError) as e:
+        print(f"  WARNING: Skipped {path}: {e}", flush=True)
+        path.unlink(missing_ok=True)
+
+
+# NUMERIC and DATE columns come back as the text Postgres sends, which is
+# exactly what str() produced from Decimal/date for the JSON export. Rows
+# are then JSON-native and skip the per-value default=str callback.
+def _cast_as_text(value, cur):
+    return value
+
+
+for _caster in (psycopg2.extensions.DECIMAL, psycopg2.extensions.PYDATE):
+    psycopg2.extensions.register_type(
+        psycopg2.extensions.new_type(_caster.values, f"{_caster.name}_AS_TEXT", _cast_as_text)
+    )
+
+
+# Database connections are pooled for the whole run (created on first use)
+_connection_pool = None
+
+
+def get_connection():
+    """Borrow a database connection from the shared pool."""
+    global _connection_pool
+    if _connection_pool is None:
+        _connection_pool = psycopg2.pool.SimpleConnectionPool(1, 4, DB_CONNECTION)
+        atexit.register(_connection_pool.closeall)
+    return _connection_pool.getconn()
+
+
+def release_connection(conn):
+    """Return a connection to the pool; any open transaction is rolled back."""
+    _connection_pool.putconn(conn)
 
 
 # =============================================================================
@@ -109,23 +192,31 @@ def generate_answer_key():
     print(f"Step 1: Generating answer key from {VIEW_NAME}...", flush=True)
 
     try:
-        conn = psycopg2.connect(DB_CONNECTION)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        conn = get_connection()
+        # Named (server-side) cursor: rows arrive in batches of itersize
+        # instead of being buffered in full before conversion
+        cur = conn.cursor(name="answer_key_stream")
+        cur.itersize = 2000
 
         cur.execute(f"SELECT * FROM {VIEW_NAME} ORDER BY {PRIMARY_KEY}")
-        rows = cur.fetchall()
 
-        # Convert to list of dicts (RealDictCursor returns dict-like rows)
-        answer_key = [dict(row) for row in rows]
+        # Zip plain tuple rows with the column names: one dict per row,
+        # where RealDictCursor built a dict that dict(row) then copied
+        answer_key = []
+        columns = None
+        for row in cur:
+            if columns is None:
+                columns = [col.name for col in cur.description]
+            answer_key.append(dict(zip(columns, row)))
 
         # Write to file
-        with open(ANSWER_KEY_PATH, 'w') as f:
-            json.dump(answer_key, f, indent=2, default=str)
+        write_json(answer_key, ANSWER_KEY_PATH)
+        write_feather(answer_key, ANSWER_KEY_FEATHER_PATH)
 
         print(f"  -> Exported {len(answer_key)} records to {ANSWER_KEY_PATH}", flush=True)
 
         cur.close()
-        conn.close()
+        release_connection(conn)
 
         return answer_key
 
@@ -142,16 +233,13 @@ def generate_blank_test(answer_key):
     """Set computed columns to null in blank test (keeps structure, clears values)"""
     print(f"Step 2: Generating blank test (nulling {len(COMPUTED_COLUMNS)} computed columns)...", flush=True)
 
-    blank_test = []
-    for record in answer_key:
-        blank_record = dict(record)
-        # Set computed columns to null (placeholder for substrate to fill in)
-        for col in COMPUTED_COLUMNS:
-            blank_record[col] = None
-        blank_test.append(blank_record)
+    # Set computed columns to null (placeholder for substrate to fill in).
+    # Each merge copies the record once; answer_key itself is left intact
+    # because grading still needs its computed values.
+    blank_test = [record | BLANK_COMPUTED_VALUES for record in answer_key]
 
-    with open(BLANK_TEST_PATH, 'w') as f:
-        json.dump(blank_test, f, indent=2, default=str)
+    write_json(blank_test, BLANK_TEST_PATH)
+    write_feather(blank_test, BLANK_TEST_FEATHER_PATH)
 
     print(f"  -> Exported {len(blank_test)} records to {BLANK_TEST_PATH}", flush=True)
     print(f"  -> Nulled columns: {', '.join(COMPUTED_COLUMNS)}", flush=True)
@@ -165,53 +253,117 @@ def generate_blank_test(answer_key):
 
 def get_substrates():
     """Get list of substrate directories"""
-    substrates = []
-    if os.path.isdir(SUBSTRATES_DIR):
-        for name in sorted(os.listdir(SUBSTRATES_DIR)):
-            path = os.path.join(SUBSTRATES_DIR, name)
-            if os.path.isdir(path) and not name.startswith('.'):
-                substrates.append(name)
-    return substrates
+    return list(_scan_substrates())
 
 
-def run_substrate_test(substrate_name):
+@lru_cache(maxsize=1)
+def _scan_substrates():
+    # The substrate set is fixed for the run, so scan once. scandir entries
+    # answer is_dir() from the directory listing, without a stat per entry.
+    if not SUBSTRATES_DIR.is_dir():
+        return ()
+    with os.scandir(SUBSTRATES_DIR) as entries:
+        return tuple(sorted(
+            entry.name for entry in entries
+            if entry.is_dir() and not entry.name.startswith('.')
+        ))
+
+
+async def run_substrate_test(substrate_name, semaphore):
     """Run a substrate's take-test.sh and return path to test-answers.json with timing"""
-    substrate_dir = os.path.join(SUBSTRATES_DIR, substrate_name)
-    script_path = os.path.join(substrate_dir, "take-test.sh")
-    answers_path = os.path.join(substrate_dir, "test-answers.json")
+    substrate_dir = SUBSTRATES_DIR / substrate_name
+    script_path = substrate_dir / "take-test.sh"
+    answers_path = substrate_dir / "test-answers.json"
 
-    if not os.path.exists(script_path):
+    if not script_path.exists():
         return None, f"No take-test.sh found", 0.0
 
-    start_time = time.time()
-    try:
-        result = subprocess.run(
-            ["bash", script_path],
-            cwd=substrate_dir,
-            capture_output=True,
-            text=True,
-            timeout=60
+    async with semaphore:
+        start_time = time.time()
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "bash", str(script_path),
+                cwd=substrate_dir,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                # Own process group, so a timeout can stop everything the
+                # script started and not just bash itself
+                start_new_session=True,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(proc.communicate(), timeout=60)
+            except asyncio.TimeoutError:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+                elapsed = time.time() - start_time
+                return None, "Script timed out", elapsed
+            elapsed = time.time() - start_time
+
+            if proc.returncode != 0:
+                return None, f"Script failed: {stderr.decode(errors='replace')}", elapsed
+
+            if not answers_path.exists():
+                return None, f"No test-answers.json generated", elapsed
+
+            return answers_path, None, elapsed
+
+        except Exception as e:
+            elapsed = time.time() - start_time
+            return None, str(e), elapsed
+
+
+def grade_and_report_substrate(substrate_name, answer_key, answers_path, error, elapsed):
+    """Grade one substrate's answers and write its test-results.md"""
+    grades = grade_substrate(substrate_name, answer_key, answers_path)
+    if error:
+        grades["error"] = error
+    grades["elapsed_seconds"] = elapsed
+
+    generate_substrate_report(substrate_name, grades)
+    return grades
+
+
+async def _run_and_grade_substrates(answer_key, substrates):
+    # Tests run concurrently, at most MAX_CONCURRENT_TESTS at a time. Each
+    # is graded in a worker thread as soon as it finishes, so the event loop
+    # keeps starting the next scripts meanwhile. Printing stays on the event
+    # loop, so one substrate's output is never interleaved with another's.
+    semaphore = asyncio.Semaphore(max(1, MAX_CONCURRENT_TESTS))
+    all_grades = {}
+    finished = 0
+
+    async def run_and_grade(substrate):
+        nonlocal finished
+        answers_path, error, elapsed = await run_substrate_test(substrate, semaphore)
+
+        # Grade the results and generate the report file
+        grades = await asyncio.to_thread(
+            grade_and_report_substrate, substrate, answer_key, answers_path, error, elapsed
         )
-        elapsed = time.time() - start_time
+        all_grades[substrate] = grades
 
-        if result.returncode != 0:
-            return None, f"Script failed: {result.stderr}", elapsed
+        finished += 1
+        print(f"  [{finished}/{len(substrates)}] Tested {substrate}", flush=True)
 
-        if not os.path.exists(answers_path):
-            return None, f"No test-answers.json generated", elapsed
+        # Print the summary box immediately
+        print_substrate_test_summary(substrate, grades)
 
-        return answers_path, None, elapsed
+        # Add vertical spacing after each substrate for visual isolation,
+        # on a terminal only so captured logs stay compact
+        if sys.stdout.isatty():
+            print("\n" * 10, flush=True)
 
-    except subprocess.TimeoutExpired:
-        elapsed = time.time() - start_time
-        return None, "Script timed out", elapsed
-    except Exception as e:
-        elapsed = time.time() - start_time
-        return None, str(e), elapsed
+    await asyncio.gather(*(run_and_grade(substrate) for substrate in substrates))
+
+    # Report in substrate order, not finishing order
+    return {substrate: all_grades[substrate] for substrate in substrates}
 
 
 def run_and_grade_all_substrates(answer_key):
-    """Run and grade each substrate, showing results immediately after each test"""
+    """Run and grade every substrate concurrently, showing each result as it finishes"""
     print(f"Step 3: Running and grading tests for each substrate...", flush=True)
     print(flush=True)
 
@@ -219,33 +371,7 @@ def run_and_grade_all_substrates(answer_key):
     print(f"  Found {len(substrates)} substrates: {', '.join(substrates)}", flush=True)
     print(flush=True)
 
-    all_grades = {}
-
-    for i, substrate in enumerate(substrates, 1):
-        # Print substrate header (flush immediately so it appears before the test runs)
-        print(f"  [{i}/{len(substrates)}] Testing {substrate}...", flush=True)
-
-        # Run the test (now returns timing)
-        answers_path, error, elapsed = run_substrate_test(substrate)
-
-        # Grade the results
-        grades = grade_substrate(substrate, answer_key, answers_path)
-        if error:
-            grades["error"] = error
-        grades["elapsed_seconds"] = elapsed
-
-        all_grades[substrate] = grades
-
-        # Generate the report file
-        generate_substrate_report(substrate, grades)
-
-        # Print the summary box immediately
-        print_substrate_test_summary(substrate, grades)
-
-        # Add vertical spacing after each substrate for visual isolation
-        print("\n" * 10, flush=True)
-
-    return all_grades
+    return asyncio.run(_run_and_grade_substrates(answer_key, substrates))
 
 
 def grade_all_substrates(answer_key, substrate_results):
@@ -256,20 +382,16 @@ def grade_all_substrates(answer_key, substrate_results):
     all_grades = {}
 
     for substrate_name, run_result in substrate_results.items():
-        answers_path = run_result.get("answers_path")
-
-        grades = grade_substrate(substrate_name, answer_key, answers_path)
-
-        if run_result.get("error"):
-            grades["error"] = run_result["error"]
-
         # Include timing if provided
-        grades["elapsed_seconds"] = run_result.get("elapsed_seconds", 0.0)
-
+        grades = grade_and_report_substrate(
+            substrate_name,
+            answer_key,
+            run_result.get("answers_path"),
+            run_result.get("error"),
+            run_result.get("elapsed_seconds", 0.0),
+        )
         all_grades[substrate_name] = grades
 
-        generate_substrate_report(substrate_name, grades)
-
         # Print detailed test summary for this substrate
         print_substrate_test_summary(substrate_name, grades)
 
@@ -283,14 +405,30 @@ def grade_all_substrates(answer_key, substrate_results):
 def load_json(path):
     """Load JSON file, return empty list if error"""
     try:
-        with open(path, 'r') as f:
-            return json.load(f)
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # Stricter than json (no NaN, 64-bit ints), so let json decide
+                pass
+        return json.loads(raw)
     except:
         return []
 
 
+# Types whose == agrees exactly with comparing their str() forms
+_STR_EXACT_TYPES = frozenset((str, int, bool, type(None)))
+
+
 def compare_values(expected, actual):
     """Compare two values, handling type differences"""
+    # Same simple type: == gives the string comparison's answer without
+    # building two strings
+    value_type = type(expected)
+    if value_type is type(actual) and value_type in _STR_EXACT_TYPES:
+        return expected == actual
     # Convert both to strings for comparison (handles int vs str, etc.)
     return str(expected) == str(actual)
 
@@ -310,51 +448,77 @@ def grade_substrate(substrate_name, answer_key, answers_path):
         "fields_passed": 0,
         "fields_failed": 0,
         "failures": [],
+        "failures_by_field": {},
         "error": None,
         "elapsed_seconds": 0.0  # Will be set by caller
     }
 
+    # Without answers nothing was computed: mark the execution as failed so
+    # the reports show no-data rows without looking at any fields
     if not answers_path:
         results["error"] = "No answers file"
+        results["execution_failed"] = True
         return results
 
     test_answers = load_json(answers_path)
 
     if not test_answers:
         results["error"] = "Could not load answers or empty file"
+        results["execution_failed"] = True
         return results
 
-    # Index test answers by primary key for lookup
+    # Index test answers by primary key for lookup. Keys are compared as
+    # strings (so 7 matches "7"); keys that already are strings are used as is.
     answers_by_pk = {}
     for record in test_answers:
         pk = record.get(PRIMARY_KEY)
         if pk is not None:
-            answers_by_pk[str(pk)] = record
+            answers_by_pk[pk if type(pk) is str else str(pk)] = record
 
-    # Compare each record, field by field
-    for expected_record in answer_key:
-        pk = str(expected_record.get(PRIMARY_KEY))
-        actual_record = answers_by_pk.get(pk, {})
+    # Join the answers onto the answer key by primary key, then compare one
+    # column at a time over the aligned rows
+    pks = [
+        pk if type(pk) is str else str(pk)
+        for pk in (record.get(PRIMARY_KEY) for record in answer_key)
+    ]
+    actual_records = [answers_by_pk.get(pk, {}) for pk in pks]
+    failed_cells = []
+    for col_idx, field in enumerate(COMPUTED_COLUMNS):
+        expected_col = [record.get(field) for record in answer_key]
+        actual_col = [record.get(field) for record in actual_records]
+        matches = list(map(compare_values, expected_col, actual_col))
+        if not all(matches):
+            failed_cells.extend(
+                (row, col_idx) for row, matched in enumerate(matches) if not matched
+            )
+
+    # Report failures record by record, in answer key order
+    failed_cells.sort()
+    failures = results["failures"]
+    for row, col_idx in failed_cells:
+        field = COMPUTED_COLUMNS[col_idx]
+        failures.append({
+            PRIMARY_KEY: pks[row],
+            "field": field,
+            "expected": answer_key[row].get(field),
+            "actual": actual_records[row].get(field)
+        })
+    results["failures_by_field"] = Counter(failure["field"] for failure in failures)
+
+    tested = len(answer_key) * len(COMPUTED_COLUMNS)
+    results["total_fields_tested"] = tested
+    results["fields_passed"] = tested - len(failed_cells)
+    results["fields_failed"] = len(failed_cells)
 
-        # Only check computed columns (those are what substrates must produce)
-        for field in COMPUTED_COLUMNS:
-            results["total_fields_tested"] += 1
+    return results
 
-            expected_val = expected_record.get(field)
-            actual_val = actual_record.get(field)
 
-            if compare_values(expected_val, actual_val):
-                results["fields_passed"] += 1
-            else:
-                results["fields_failed"] += 1
-                results["failures"].append({
-                    PRIMARY_KEY: pk,
-                    "field": field,
-                    "expected": expected_val,
-                    "actual": actual_val
-                })
-
-    return results
+def get_failures_by_field(grades):
+    """Failure count per computed column, recounted from the failure list for grades that lack it"""
+    failures_by_field = grades.get("failures_by_field")
+    if failures_by_field is None:
+        failures_by_field = Counter(failure["field"] for failure in grades.get("failures", ()))
+    return failures_by_field
 
 
 def format_duration(seconds):
@@ -371,8 +535,7 @@ def format_duration(seconds):
 
 def generate_substrate_report(substrate_name, results):
     """Generate test-results.md for a substrate"""
-    substrate_dir = os.path.join(SUBSTRATES_DIR, substrate_name)
-    report_path = os.path.join(substrate_dir, "test-results.md")
+    report_path = SUBSTRATES_DIR / substrate_name / "test-results.md"
 
     total = results["total_fields_tested"]
     passed = results["fields_passed"]
@@ -380,54 +543,48 @@ def generate_substrate_report(substrate_name, results):
     score = (passed / total * 100) if total > 0 else 0
     elapsed = results.get("elapsed_seconds", 0.0)
 
-    lines = [
-        f"# Test Results: {substrate_name}",
-        "",
-        "## Summary",
-        "",
-        f"| Metric | Value |",
-        f"|--------|-------|",
-        f"| Total Fields Tested | {total} |",
-        f"| Passed | {passed} |",
-        f"| Failed | {failed} |",
-        f"| Score | {score:.1f}% |",
-        f"| Duration | {format_duration(elapsed)} |",
-        "",
-    ]
-
-    if results.get("error"):
-        lines.extend([
-            "## Error",
-            "",
-            f"```",
-            results["error"],
-            f"```",
-            "",
-        ])
-
-    if results["failures"]:
-        lines.extend([
-            "## Failures",
-            "",
-            f"| {PRIMARY_KEY} | Field | Expected | Actual |",
-            f"|---------------|-------|----------|--------|",
-        ])
-
-        # Show first 50 failures to keep report manageable
-        for failure in results["failures"][:50]:
-            pk = failure[PRIMARY_KEY]
-            field = failure["field"]
-            expected = str(failure["expected"])[:40]
-            actual = str(failure["actual"])[:40]
-            lines.append(f"| {pk} | {field} | {expected} | {actual} |")
-
-        if len(results["failures"]) > 50:
-            lines.append(f"| ... | ... | ({len(results['failures']) - 50} more failures) | ... |")
-
-        lines.append("")
-
-    with open(report_path, 'w') as f:
-        f.write('\n'.join(lines))
+    # Stream the report straight to the file; each section opens with the
+    # blank line that separates it from the one before
+    with open(report_path, 'w', buffering=1 << 16) as f:
+        w = f.write
+        w(f"# Test Results: {substrate_name}\n"
+          "\n"
+          "## Summary\n"
+          "\n"
+          "| Metric | Value |\n"
+          "|--------|-------|\n"
+          f"| Total Fields Tested | {total} |\n"
+          f"| Passed | {passed} |\n"
+          f"| Failed | {failed} |\n"
+          f"| Score | {score:.1f}% |\n"
+          f"| Duration | {format_duration(elapsed)} |\n")
+
+        if results.get("error"):
+            w("\n"
+              "## Error\n"
+              "\n"
+              "```\n"
+              f"{results['error']}\n"
+              "```\n")
+
+        failures = results["failures"]
+        if failures:
+            w("\n"
+              "## Failures\n"
+              "\n"
+              f"| {PRIMARY_KEY} | Field | Expected | Actual |\n"
+              "|---------------|-------|----------|--------|\n")
+
+            # Show first 50 failures to keep report manageable
+            for failure in failures[:50]:
+                pk = failure[PRIMARY_KEY]
+                field = failure["field"]
+                expected = str(failure["expected"])[:40]
+                actual = str(failure["actual"])[:40]
+                w(f"| {pk} | {field} | {expected} | {actual} |\n")
+
+            if len(failures) > 50:
+                w(f"| ... | ... | ({len(failures) - 50} more failures) | ... |\n")
 
     return report_path
 
@@ -463,62 +620,56 @@ def print_substrate_test_summary(substrate_name, grades):
         header_bg = SKY_BLUE_BG
         header_text = DARK_TEXT
 
-    print(f"  {header_bg}{header_text}┌{'─' * box_width}┐{RESET}", flush=True)
-    print(f"  {header_bg}{header_text}│{BOLD} {substrate_name.upper():^{box_width - 2}} {RESET}{header_bg}{header_text}│{RESET}", flush=True)
+    # Collect the box and write it in one go
+    out = [
+        f"  {header_bg}{header_text}┌{'─' * box_width}┐{RESET}",
+        f"  {header_bg}{header_text}│{BOLD} {substrate_name.upper():^{box_width - 2}} {RESET}{header_bg}{header_text}│{RESET}",
+    ]
 
     # Score line with timing
     duration_str = format_duration(elapsed)
     if execution_failed:
         score_text = f"Score: --/-- (--%) - {status_plain}"
-        print(f"  {header_bg}{header_text}│ {RED}{BOLD}{score_text:^{box_width - 2}}{RESET}{header_bg}{header_text} │{RESET}", flush=True)
+        out.append(f"  {header_bg}{header_text}│ {RED}{BOLD}{score_text:^{box_width - 2}}{RESET}{header_bg}{header_text} │{RESET}")
     else:
         score_text = f"Score: {passed}/{total} ({score:.1f}%) - {status_plain}"
-        print(f"  {header_bg}{header_text}│ {score_color}{BOLD}{score_text:^{box_width - 2}}{RESET}{header_bg}{header_text} │{RESET}", flush=True)
+        out.append(f"  {header_bg}{header_text}│ {score_color}{BOLD}{score_text:^{box_width - 2}}{RESET}{header_bg}{header_text} │{RESET}")
     # Duration line
     duration_text = f"Duration: {duration_str}"
-    print(f"  {header_bg}{header_text}│ {duration_text:^{box_width - 2}} │{RESET}", flush=True)
-    print(f"  {header_bg}{header_text}├{'─' * box_width}┤{RESET}", flush=True)
-
-    # Group failures by field
-    failures_by_field = {}
-    for failure in grades.get("failures", []):
-        field = failure.get("field")
-        if field not in failures_by_field:
-            failures_by_field[field] = 0
-        failures_by_field[field] += 1
-
-    # Print per-test results with colored row backgrounds
+    out.append(f"  {header_bg}{header_text}│ {duration_text:^{box_width - 2}} │{RESET}")
+    out.append(f"  {header_bg}{header_text}├{'─' * box_width}┤{RESET}")
+
+    # Execution failures have no per-field data to count
+    failures_by_field = {} if execution_failed else get_failures_by_field(grades)
+
+    # Print per-test results with colored row backgrounds, looked up by
+    # pass/fail instead of branching per row
+    has_error = bool(grades.get("error"))
+    col_total = grades["total_records"]
+    rows = []
     for col in COMPUTED_COLUMNS:
         col_failures = failures_by_field.get(col, 0)
-        col_total = grades["total_records"]
+        col_passed = not execution_failed and not has_error and col_failures == 0
+        row_bg, icon = ROW_STYLES[col_passed]
 
         if execution_failed:
-            # Execution failed - show -- for all
-            row_bg = RED_BG
-            icon = "✗"
             result_padded = "-- (NO DATA)"
-            text_color = RED
-        elif col_failures == 0 and not grades.get("error"):
-            # Passing test - green background
-            row_bg = GREEN_BG
-            icon = "✓"
+        elif col_passed:
             result_padded = "PASS"
-            text_color = GREEN
         else:
-            # Failing test - red background
-            row_bg = RED_BG
-            icon = "✗"
             result_padded = f"FAIL ({col_failures}/{col_total})"
-            text_color = RED
 
         # Truncate column name if too long
         col_display = col[:30] if len(col) > 30 else col
         # Render the entire row with colored background
         row_content = f"  {icon} {col_display:<32} {result_padded:>12} "
-        print(f"  {row_bg}{WHITE_TEXT}│{row_content}│{RESET}", flush=True)
+        rows.append(f"  {row_bg}{WHITE_TEXT}│{row_content}│{RESET}")
+    out.extend(rows)
 
-    print(f"  {header_bg}{header_text}└{'─' * box_width}┘{RESET}", flush=True)
-    print(flush=True)
+    out.append(f"  {header_bg}{header_text}└{'─' * box_width}┘{RESET}")
+    out.append("")
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 # =============================================================================
@@ -529,138 +680,119 @@ def generate_summary_report(all_grades):
     """Generate all-tests-results.md with summary of all substrates"""
     print(f"Step 4: Generating summary report...", flush=True)
 
-    lines = [
-        "# Test Orchestrator Results",
-        "",
-        "## Configuration",
-        "",
-        f"- **View:** `{VIEW_NAME}`",
-        f"- **Primary Key:** `{PRIMARY_KEY}`",
-        f"- **Computed Columns:** {len(COMPUTED_COLUMNS)}",
-        "",
-        "## Summary by Substrate",
-        "",
-        "| Substrate | Passed | Failed | Total | Score | Duration | Status |",
-        "|-----------|--------|--------|-------|-------|----------|--------|",
-    ]
-
     total_passed = 0
     total_failed = 0
     total_tests = 0
     total_time = 0.0
 
-    for substrate_name in sorted(all_grades.keys()):
-        grades = all_grades[substrate_name]
-
-        passed = grades["fields_passed"]
-        failed = grades["fields_failed"]
-        total = grades["total_fields_tested"]
-        score = (passed / total * 100) if total > 0 else 0
-        elapsed = grades.get("elapsed_seconds", 0.0)
-
-        total_passed += passed
-        total_failed += failed
-        total_tests += total
-        total_time += elapsed
-
-        if grades.get("error"):
-            status = f"ERROR: {grades['error'][:30]}"
-        elif failed == 0:
-            status = "PASS"
-        else:
-            status = "FAIL"
-
-        lines.append(f"| {substrate_name} | {passed} | {failed} | {total} | {score:.1f}% | {format_duration(elapsed)} | {status} |")
-
-    overall_score = (total_passed / total_tests * 100) if total_tests > 0 else 0
-
-    lines.extend([
-        "",
-        "## Overall Statistics",
-        "",
-        f"| Metric | Value |",
-        f"|--------|-------|",
-        f"| Total Substrates | {len(all_grades)} |",
-        f"| Total Fields Tested | {total_tests} |",
-        f"| Total Passed | {total_passed} |",
-        f"| Total Failed | {total_failed} |",
-        f"| Overall Score | {overall_score:.1f}% |",
-        f"| Total Duration | {format_duration(total_time)} |",
-        "",
-    ])
-
-    # Summary by Test (computed column)
-    lines.extend([
-        "## Summary by Test",
-        "",
-        "| Test (Computed Column) | Substrates Passing | Substrates Failing | Pass Rate |",
-        "|------------------------|--------------------|--------------------|-----------|",
-    ])
-
-    # Calculate per-test statistics
-    for col in COMPUTED_COLUMNS:
-        passing_substrates = []
-        failing_substrates = []
+    # Passing/failing substrates per test, collected in the substrate pass
+    # and used by both per-test sections
+    passing_by_col = {col: [] for col in COMPUTED_COLUMNS}
+    failing_by_col = {col: [] for col in COMPUTED_COLUMNS}
+
+    # Stream the report straight to the file
+    with open(SUMMARY_PATH, 'w', buffering=1 << 16) as f:
+        w = f.write
+        w("# Test Orchestrator Results\n"
+          "\n"
+          "## Configuration\n"
+          "\n"
+          f"- **View:** `{VIEW_NAME}`\n"
+          f"- **Primary Key:** `{PRIMARY_KEY}`\n"
+          f"- **Computed Columns:** {len(COMPUTED_COLUMNS)}\n"
+          "\n"
+          "## Summary by Substrate\n"
+          "\n"
+          "| Substrate | Passed | Failed | Total | Score | Duration | Status |\n"
+          "|-----------|--------|--------|-------|-------|----------|--------|\n")
 
         for substrate_name in sorted(all_grades.keys()):
             grades = all_grades[substrate_name]
-            # Count failures for this specific column
-            col_failures = [f for f in grades.get("failures", []) if f.get("field") == col]
 
-            if len(col_failures) == 0 and not grades.get("error"):
-                passing_substrates.append(substrate_name)
+            passed = grades["fields_passed"]
+            failed = grades["fields_failed"]
+            total = grades["total_fields_tested"]
+            score = (passed / total * 100) if total > 0 else 0
+            elapsed = grades.get("elapsed_seconds", 0.0)
+
+            total_passed += passed
+            total_failed += failed
+            total_tests += total
+            total_time += elapsed
+
+            if grades.get("error"):
+                status = f"ERROR: {grades['error'][:30]}"
+            elif failed == 0:
+                status = "PASS"
             else:
-                failing_substrates.append(substrate_name)
-
+                status = "FAIL"
+
+            w(f"| {substrate_name} | {passed} | {failed} | {total} | {score:.1f}% | {format_duration(elapsed)} | {status} |\n")
+
+            failures_by_field = get_failures_by_field(grades)
+            has_error = bool(grades.get("error"))
+            for col in COMPUTED_COLUMNS:
+                if failures_by_field.get(col, 0) == 0 and not has_error:
+                    passing_by_col[col].append(substrate_name)
+                else:
+                    failing_by_col[col].append(substrate_name)
+
+        overall_score = (total_passed / total_tests * 100) if total_tests > 0 else 0
+
+        w("\n"
+          "## Overall Statistics\n"
+          "\n"
+          "| Metric | Value |\n"
+          "|--------|-------|\n"
+          f"| Total Substrates | {len(all_grades)} |\n"
+          f"| Total Fields Tested | {total_tests} |\n"
+          f"| Total Passed | {total_passed} |\n"
+          f"| Total Failed | {total_failed} |\n"
+          f"| Overall Score | {overall_score:.1f}% |\n"
+          f"| Total Duration | {format_duration(total_time)} |\n"
+          "\n")
+
+        # Summary by Test (computed column)
+        w("## Summary by Test\n"
+          "\n"
+          "| Test (Computed Column) | Substrates Passing | Substrates Failing | Pass Rate |\n"
+          "|------------------------|--------------------|--------------------|-----------|\n")
+
+        # Calculate per-test statistics
         total_substrates = len(all_grades)
-        pass_rate = (len(passing_substrates) / total_substrates * 100) if total_substrates > 0 else 0
-
-        lines.append(f"| `{col}` | {len(passing_substrates)} | {len(failing_substrates)} | {pass_rate:.1f}% |")
-
-    lines.extend([
-        "",
-        "### Test Details",
-        "",
-    ])
+        for col in COMPUTED_COLUMNS:
+            passing_count = len(passing_by_col[col])
+            failing_count = len(failing_by_col[col])
+            pass_rate = (passing_count / total_substrates * 100) if total_substrates > 0 else 0
 
-    # Detailed breakdown for each test
-    for col in COMPUTED_COLUMNS:
-        passing_substrates = []
-        failing_substrates = []
+            w(f"| `{col}` | {passing_count} | {failing_count} | {pass_rate:.1f}% |\n")
 
-        for substrate_name in sorted(all_grades.keys()):
-            grades = all_grades[substrate_name]
-            col_failures = [f for f in grades.get("failures", []) if f.get("field") == col]
+        w("\n"
+          "### Test Details\n"
+          "\n")
 
-            if len(col_failures) == 0 and not grades.get("error"):
-                passing_substrates.append(substrate_name)
-            else:
-                failing_substrates.append(substrate_name)
+        # Detailed breakdown for each test
+        for col in COMPUTED_COLUMNS:
+            passing_substrates = passing_by_col[col]
+            failing_substrates = failing_by_col[col]
 
-        lines.append(f"**`{col}`**")
-        if passing_substrates:
-            lines.append(f"- Passing: {', '.join(passing_substrates)}")
-        if failing_substrates:
-            lines.append(f"- Failing: {', '.join(failing_substrates)}")
-        lines.append("")
+            w(f"**`{col}`**\n")
+            if passing_substrates:
+                w(f"- Passing: {', '.join(passing_substrates)}\n")
+            if failing_substrates:
+                w(f"- Failing: {', '.join(failing_substrates)}\n")
+            w("\n")
 
-    lines.extend([
-        "## Computed Columns Being Tested",
-        "",
-    ])
+        w("## Computed Columns Being Tested\n"
+          "\n")
 
-    for col in COMPUTED_COLUMNS:
-        lines.append(f"- `{col}`")
-
-    lines.extend([
-        "",
-        "---",
-        "",
-        "*Generated by test-orchestrator.py*",
-    ])
+        for col in COMPUTED_COLUMNS:
+            w(f"- `{col}`\n")
 
-    with open(SUMMARY_PATH, 'w') as f:
-        f.write('\n'.join(lines))
+        w("\n"
+          "---\n"
+          "\n"
+          "*Generated by test-orchestrator.py*")
 
     print(f"  -> Summary written to {SUMMARY_PATH}", flush=True)
     print(f"  -> Overall: {total_passed}/{total_tests} ({overall_score:.1f}%)", flush=True)
@@ -680,13 +812,47 @@ def split_column_name(name, max_lines=3):
     return parts[-max_lines:]  # Return only the last max_lines
 
 
+@lru_cache(maxsize=4)
+def _final_table_header(columns, substrate_width, test_width, duration_width, status_width):
+    """Header lines of the final summary table, built once per layout.
+
+    Returns the three column-name lines followed by the separator line.
+    """
+    # Each column name is split over 3 lines, each part centered in its cell
+    col_name_parts = [split_column_name(col, max_lines=3) for col in columns]
+    name_rows = [
+        [f"{parts[line_idx]:^{test_width}}" for parts in col_name_parts]
+        for line_idx in range(3)
+    ]
+
+    # Middle line includes the "Substrate" label and Total/Score/Duration/Status
+    blank_label = f"{'':<{substrate_width}}"
+    blank_tail = f"{'':^8} │ {'':^7} │ {'':^{duration_width}} │ {'':^{status_width}}"
+    header_lines = (
+        " │ ".join([blank_label, *name_rows[0], blank_tail]),
+        " │ ".join([
+            f"{'Substrate':<{substrate_width}}",
+            *name_rows[1],
+            f"{'Total':^8} │ {'Score':^7} │ {'Duration':^{duration_width}} │ {'Status':^{status_width}}",
+        ]),
+        " │ ".join([blank_label, *name_rows[2], blank_tail]),
+    )
+
+    # Calculate header width for separator
+    header_width = substrate_width + (len(columns) * (test_width + 3)) + 8 + 3 + 7 + 3 + duration_width + 3 + status_width + 3
+    return header_lines + ("─" * header_width,)
+
+
 def print_final_summary_table(all_grades):
     """Print a final summary table to console showing all substrates"""
-    print(flush=True)
-    print("=" * 70, flush=True)
-    print(f"{BOLD}FINAL RESULTS SUMMARY{RESET}", flush=True)
-    print("=" * 70, flush=True)
-    print(flush=True)
+    # Collect the whole table and write it in one go
+    out = [
+        "",
+        "=" * 70,
+        f"{BOLD}FINAL RESULTS SUMMARY{RESET}",
+        "=" * 70,
+        "",
+    ]
 
     # Calculate column widths
     substrate_width = 15
@@ -694,36 +860,14 @@ def print_final_summary_table(all_grades):
     duration_width = 10  # For duration column
     status_width = 18  # Wide enough for "FAILED TO COMPUTE"
 
-    # Build multi-line header (3 lines for column names)
-    header_lines = [[], [], []]
-    col_name_parts = []
+    # Module globals bound to locals for the per-substrate loops
+    columns = COMPUTED_COLUMNS
+    num_columns = len(columns)
 
-    for col in COMPUTED_COLUMNS:
-        parts = split_column_name(col, max_lines=3)
-        col_name_parts.append(parts)
-
-    # Print 3-line header
-    for line_idx in range(3):
-        if line_idx == 1:
-            # Middle line includes "Substrate" label
-            line = f"{'Substrate':<{substrate_width}}"
-        else:
-            line = f"{'':<{substrate_width}}"
-
-        for parts in col_name_parts:
-            line += f" │ {parts[line_idx]:^{test_width}}"
-
-        # Add Total/Score/Duration/Status on middle line only
-        if line_idx == 1:
-            line += f" │ {'Total':^8} │ {'Score':^7} │ {'Duration':^{duration_width}} │ {'Status':^{status_width}}"
-        else:
-            line += f" │ {'':^8} │ {'':^7} │ {'':^{duration_width}} │ {'':^{status_width}}"
-
-        print(line, flush=True)
-
-    # Calculate header width for separator
-    header_width = substrate_width + (len(COMPUTED_COLUMNS) * (test_width + 3)) + 8 + 3 + 7 + 3 + duration_width + 3 + status_width + 3
-    print("─" * header_width, flush=True)
+    # 3-line column header plus separator, reused for the closing separator
+    header = _final_table_header(tuple(columns), substrate_width, test_width, duration_width, status_width)
+    out.extend(header)
+    separator = header[-1]
 
     # Data rows
     total_passed = 0
@@ -731,6 +875,13 @@ def print_final_summary_table(all_grades):
     total_time = 0.0
     failed_substrates = []
 
+    # Cells that look the same in every row, built once: a centered
+    # checkmark for passing tests, -- for execution failures (no data)
+    padding = (test_width - 1) // 2
+    check_cell = f"{' ' * padding}{GREEN}✓{RESET}{' ' * (test_width - padding - 1)}"
+    padding = (test_width - 2) // 2
+    dash_cell = f"{' ' * padding}{RED}{DIM}--{RESET}{' ' * (test_width - padding - 2)}"
+
     # Sort substrates by score (highest to lowest)
     def get_substrate_score(name):
         grades = all_grades[name]
@@ -749,49 +900,31 @@ def print_final_summary_table(all_grades):
         if execution_failed:
             failed_substrates.append(substrate_name)
 
-        # Group failures by field
-        failures_by_field = {}
-        for failure in grades.get("failures", []):
-            field = failure.get("field")
-            if field not in failures_by_field:
-                failures_by_field[field] = 0
-            failures_by_field[field] += 1
-
-        # Print substrate name (with strikethrough if execution failed)
+        # First cell is the substrate name (with strikethrough if execution failed)
         if execution_failed:
-            print(f"{RED}{STRIKETHROUGH}{substrate_name:<{substrate_width}}{RESET}", end="", flush=True)
+            # No data: every test shows --, and nothing counts towards totals
+            cells = [f"{RED}{STRIKETHROUGH}{substrate_name:<{substrate_width}}{RESET}"]
+            cells.extend([dash_cell] * num_columns)
         else:
-            print(f"{substrate_name:<{substrate_width}}", end="", flush=True)
-
-        substrate_passed = 0
-        substrate_total = 0
-
-        for col in COMPUTED_COLUMNS:
-            col_failures = failures_by_field.get(col, 0)
-            col_total = grades["total_records"]
-
-            substrate_passed += (col_total - col_failures)
-            substrate_total += col_total
-
-            if execution_failed:
-                # Show -- for execution failures (we have no data)
-                cell_str = "--"
-                padding = (test_width - len(cell_str)) // 2
-                print(f" │ {' ' * padding}{RED}{DIM}{cell_str}{RESET}{' ' * (test_width - padding - len(cell_str))}", end="", flush=True)
-            elif col_failures == 0:
-                # Center the checkmark with padding
-                padding = (test_width - 1) // 2
-                print(f" │ {' ' * padding}{GREEN}✓{RESET}{' ' * (test_width - padding - 1)}", end="", flush=True)
-            else:
-                # Center the failure count with padding
-                cell_str = str(col_failures)
-                padding = (test_width - len(cell_str)) // 2
-                print(f" │ {' ' * padding}{RED}{cell_str}{RESET}{' ' * (test_width - padding - len(cell_str))}", end="", flush=True)
-
-        # For execution failures, don't count towards totals
-        if not execution_failed:
-            total_passed += substrate_passed
-            total_failed += (substrate_total - substrate_passed)
+            cells = [f"{substrate_name:<{substrate_width}}"]
+            failures_by_field = get_failures_by_field(grades)
+            substrate_failed = 0
+
+            for col in columns:
+                col_failures = failures_by_field.get(col, 0)
+                substrate_failed += col_failures
+
+                if col_failures == 0:
+                    cells.append(check_cell)
+                else:
+                    # Center the failure count with padding
+                    cell_str = str(col_failures)
+                    padding = (test_width - len(cell_str)) // 2
+                    cells.append(f"{' ' * padding}{RED}{cell_str}{RESET}{' ' * (test_width - padding - len(cell_str))}")
+
+            substrate_total = grades["total_records"] * num_columns
+            total_passed += substrate_total - substrate_failed
+            total_failed += substrate_failed
 
         passed = grades["fields_passed"]
         total = grades["total_fields_tested"]
@@ -805,35 +938,40 @@ def print_final_summary_table(all_grades):
         if execution_failed:
             status_text = "FAILED TO COMPUTE"
             # Show --/-- for total since we have no data
-            print(f" │ {'--':>3}/{'--':<3} │ {RED}{DIM}{'--':>5}%{RESET} │ {duration_str:>{duration_width}} │ {RED}{BOLD}{status_text:^{status_width}}{RESET}", flush=True)
+            cells.append(f"{'--':>3}/{'--':<3} │ {RED}{DIM}{'--':>5}%{RESET} │ {duration_str:>{duration_width}} │ {RED}{BOLD}{status_text:^{status_width}}{RESET}")
         elif grades["fields_failed"] == 0:
             status_text = "PASS"
-            print(f" │ {passed:>3}/{total:<3} │ {score_color}{score:>5.1f}%{RESET} │ {duration_str:>{duration_width}} │ {GREEN}{status_text:^{status_width}}{RESET}", flush=True)
+            cells.append(f"{passed:>3}/{total:<3} │ {score_color}{score:>5.1f}%{RESET} │ {duration_str:>{duration_width}} │ {GREEN}{status_text:^{status_width}}{RESET}")
         else:
             status_text = "PARTIAL"
-            print(f" │ {passed:>3}/{total:<3} │ {score_color}{score:>5.1f}%{RESET} │ {duration_str:>{duration_width}} │ {YELLOW}{status_text:^{status_width}}{RESET}", flush=True)
+            cells.append(f"{passed:>3}/{total:<3} │ {score_color}{score:>5.1f}%{RESET} │ {duration_str:>{duration_width}} │ {YELLOW}{status_text:^{status_width}}{RESET}")
+
+        out.append(" │ ".join(cells))
 
-    print("─" * header_width, flush=True)
+    out.append(separator)
 
     # Overall totals
     overall_total = total_passed + total_failed
     overall_score = (total_passed / overall_total * 100) if overall_total > 0 else 0
     total_duration_str = format_duration(total_time)
-    print(f"{BOLD}{'OVERALL':<{substrate_width}}{RESET}", end="", flush=True)
-    for _ in COMPUTED_COLUMNS:
-        print(f" │ {'':^{test_width}}", end="", flush=True)
-    print(f" │ {total_passed:>3}/{overall_total:<3} │ {BOLD}{overall_score:>5.1f}%{RESET} │ {BOLD}{total_duration_str:>{duration_width}}{RESET} │ {' ':^{status_width}}", flush=True)
-    print(flush=True)
+    cells = [f"{BOLD}{'OVERALL':<{substrate_width}}{RESET}"]
+    cells.extend([" " * test_width] * num_columns)
+    cells.append(f"{total_passed:>3}/{overall_total:<3} │ {BOLD}{overall_score:>5.1f}%{RESET} │ {BOLD}{total_duration_str:>{duration_width}}{RESET} │ {' ':^{status_width}}")
+    out.append(" │ ".join(cells))
+    out.append("")
 
     # Print failed substrates summary if any
     if failed_substrates:
-        print(f"{RED}{'─' * 70}{RESET}", flush=True)
-        print(f"{RED}{BOLD}⚠️  FAILED TO EXECUTE ({len(failed_substrates)} substrates):{RESET}", flush=True)
-        print(flush=True)
+        out.append(f"{RED}{'─' * 70}{RESET}")
+        out.append(f"{RED}{BOLD}⚠️  FAILED TO EXECUTE ({len(failed_substrates)} substrates):{RESET}")
+        out.append("")
         for substrate_name in failed_substrates:
             error_msg = all_grades[substrate_name].get("error", "Unknown error")
-            print(f"  {RED}✗{RESET} {BOLD}{substrate_name}{RESET}: {DIM}{error_msg}{RESET}", flush=True)
-        print(flush=True)
+            out.append(f"  {RED}✗{RESET} {BOLD}{substrate_name}{RESET}: {DIM}{error_msg}{RESET}")
+        out.append("")
+
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 # =============================================================================
@@ -859,8 +997,9 @@ def main():
     print(flush=True)
 
     # Step 4: Generate summary report
-    # Breathing room before summary
-    print("\n" * 5, flush=True)
+    # Breathing room before summary (terminal only)
+    if sys.stdout.isatty():
+        print("\n" * 5, flush=True)
     generate_summary_report(all_grades)
     print(flush=True)
 